@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.services.analytics_service import GradeAnalyticsService
+from app.utils.http_cache import conditional_get
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    dependencies=[Depends(conditional_get("enrollments", "courses"))],
+)
+
+@router.get("/grades", response_model=dict)
+def grade_analytics(
+    group_by: str = Query("course", pattern="^(course|department|year)$", description="Agrupar por course, department ou year"),
+    bins: int = Query(10, ge=1, le=100, description="Número de faixas do histograma"),
+    db: Session = Depends(get_db)
+):
+    return GradeAnalyticsService(db).grade_stats(group_by, bins)
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_database import get_async_db
+from app.repositories.async_department_repository import AsyncDepartmentRepository
+from app.db.models.department import Department
+from app.services.count_service import AsyncCountService
+from typing import List
+from app.api.schemas.department_schema import DepartmentRead
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.cache import cached_entity
+from app.utils.http_cache import async_conditional_get
+from http import HTTPStatus
+
+router = APIRouter(
+    prefix="/departments",
+    tags=["Departments"],
+    # Mesmas tabelas do ETag do router síncrono: as rotas substituídas continuam respondendo 304
+    dependencies=[Depends(async_conditional_get("departments", "professors"))],
+)
+
+@router.get("/count", response_model=dict)
+async def count_departments(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Mesmas regras de CountService (contador em table_versions, estimativa ou COUNT exato com recalibração)
+    return await AsyncCountService(db).count(Department, exact, approximate)
+
+@router.get("/paged", response_model=List[DepartmentRead])
+async def paged_departments(
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página"),
+    limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    departments, next_cursor = await AsyncDepartmentRepository(db).list_page(limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return departments
+
+@router.get("/{department_id}", response_model=DepartmentRead)
+async def get_department(department_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Mesmo cache de entidades da rota síncrona: um acerto dispensa a consulta
+    department = await cached_entity("departments", department_id, lambda: AsyncDepartmentRepository(db).get_by_id(department_id), DepartmentRead)
+    if department is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Departamento com id {department_id} não encontrado."
+        )
+    return department
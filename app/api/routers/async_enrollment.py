@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_database import get_async_db
+from app.repositories.async_enrollment_repository import AsyncEnrollmentRepository
+from app.db.models.enrollment import Enrollment
+from app.services.count_service import AsyncCountService
+from typing import List
+from app.api.schemas.enrollment_schema import EnrollmentRead
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.cache import cached_entity
+from app.utils.http_cache import async_conditional_get
+from http import HTTPStatus
+
+router = APIRouter(
+    prefix="/enrollments",
+    tags=["Enrollments"],
+    # Mesmas tabelas do ETag do router síncrono: as rotas substituídas continuam respondendo 304
+    dependencies=[Depends(async_conditional_get("enrollments", "students", "courses"))],
+)
+
+@router.get("/count", response_model=dict)
+async def count_enrollments(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Mesmas regras de CountService (contador em table_versions, estimativa ou COUNT exato com recalibração)
+    return await AsyncCountService(db).count(Enrollment, exact, approximate)
+
+@router.get("/paged", response_model=List[EnrollmentRead])
+async def paged_enrollments(
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página"),
+    limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    enrollments, next_cursor = await AsyncEnrollmentRepository(db).list_page(limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return enrollments
+
+@router.get("/{enrollment_id}", response_model=EnrollmentRead)
+async def get_enrollment(enrollment_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Mesmo cache de entidades da rota síncrona: um acerto dispensa a consulta
+    enrollment = await cached_entity("enrollments", enrollment_id, lambda: AsyncEnrollmentRepository(db).get_by_id(enrollment_id), EnrollmentRead)
+    if enrollment is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Matrícula com id {enrollment_id} não encontrada."
+        )
+    return enrollment
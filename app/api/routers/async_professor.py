@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_database import get_async_db
+from app.repositories.async_professor_repository import AsyncProfessorRepository
+from app.db.models.professor import Professor
+from app.services.count_service import AsyncCountService
+from typing import List
+from app.api.schemas.professor_schema import ProfessorRead
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.cache import cached_entity
+from app.utils.http_cache import async_conditional_get
+from http import HTTPStatus
+
+router = APIRouter(
+    prefix="/professors",
+    tags=["Professors"],
+    # Mesmas tabelas do ETag do router síncrono: as rotas substituídas continuam respondendo 304
+    dependencies=[Depends(async_conditional_get("professors", "departments"))],
+)
+
+@router.get("/count", response_model=dict)
+async def count_professors(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Mesmas regras de CountService (contador em table_versions, estimativa ou COUNT exato com recalibração)
+    return await AsyncCountService(db).count(Professor, exact, approximate)
+
+@router.get("/paged", response_model=List[ProfessorRead])
+async def paged_professors(
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página"),
+    limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    professors, next_cursor = await AsyncProfessorRepository(db).list_page(limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return professors
+
+@router.get("/{professor_id}", response_model=ProfessorRead)
+async def get_professor(professor_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Mesmo cache de entidades da rota síncrona: um acerto dispensa a consulta
+    professor = await cached_entity("professors", professor_id, lambda: AsyncProfessorRepository(db).get_by_id(professor_id), ProfessorRead)
+    if professor is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Professor com id {professor_id} não encontrado."
+        )
+    return professor
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_database import get_async_db
+from app.repositories.async_student_repository import AsyncStudentRepository
+from app.db.models.student import Student
+from app.services.count_service import AsyncCountService
+from typing import List
+from app.api.schemas.student_schema import StudentRead
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.cache import cached_entity
+from app.utils.http_cache import async_conditional_get
+from http import HTTPStatus
+
+router = APIRouter(
+    prefix="/students",
+    tags=["Students"],
+    # Mesmas tabelas do ETag do router síncrono: as rotas substituídas continuam respondendo 304
+    dependencies=[Depends(async_conditional_get("students"))],
+)
+
+@router.get("/count", response_model=dict)
+async def count_students(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Mesmas regras de CountService (contador em table_versions, estimativa ou COUNT exato com recalibração)
+    return await AsyncCountService(db).count(Student, exact, approximate)
+
+@router.get("/paged", response_model=List[StudentRead])
+async def paged_students(
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página"),
+    limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    students, next_cursor = await AsyncStudentRepository(db).list_page(limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return students
+
+@router.get("/{student_id}", response_model=StudentRead)
+async def get_student(student_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Mesmo cache de entidades da rota síncrona: um acerto dispensa a consulta
+    student = await cached_entity("students", student_id, lambda: AsyncStudentRepository(db).get_by_id(student_id), StudentRead)
+    if student is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Estudante com id {student_id} não encontrado."
+        )
+    return student
@@ -1,46 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from app.db.database import get_db
 from app.db.models.course import Course
+from app.db.models.department import Department
 from app.repositories.course_repository import CourseRepository
+from app.repositories.course_enrollment_stats_repository import CourseEnrollmentStatsRepository
 from app.services.course_service import CourseService
 from typing import List
-from app.api.schemas.course_schema import CourseRead, CourseCreate
+from app.api.schemas.course_schema import CourseRead, CourseCreate, CourseSearchResult
+from app.services.count_service import CountService
+from app.services.prerequisite_service import PrerequisiteService, PrerequisiteCycleError
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.utils.pagination import paginate, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response, wants_stream
+from app.utils.http_cache import conditional_get
+from app.utils.serialization import model_list_response, multi_get_response
+from app.utils.batch_loader import BatchLoaders, get_loaders, parse_ids
+from app.utils.projection import parse_fields, project, projection_response, row_to_dict
 from http import HTTPStatus
 from datetime import date
 
-router = APIRouter(prefix="/courses", tags=["Courses"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(
+    prefix="/courses",
+    tags=["Courses"],
+    dependencies=[Depends(conditional_get("courses", "departments"))],
+)
+# O resumo de matrículas muda a cada matrícula; fica em router próprio para não invalidar o ETag do catálogo
+stats_router = APIRouter(
+    prefix="/courses",
+    tags=["Courses"],
+    dependencies=[Depends(conditional_get("courses", "enrollments", "course_enrollment_stats"))],
+)
 
 @router.get("/count", response_model=dict)
-def count_courses(db: Session = Depends(get_db)):
-    quantidade = db.query(Course).count()
-    return {"quantidade": quantidade}
+def count_courses(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: Session = Depends(get_db)
+):
+    return CountService(db).count(Course, exact, approximate)
 
 @router.get("/paged", response_model=List[CourseRead])
 def paged_courses(
+    response: Response,
     page: int = Query(1, ge=1, description="Número da página"),
     limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
-    courses = db.query(Course).offset(offset).limit(limit).all()
-    return [CourseService(CourseRepository(db))._to_dict(c) for c in courses]
+    courses, next_cursor = paginate(db.query(Course), Course.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return model_list_response(CourseRead, courses, response)
 
 @router.get("/filter", response_model=List[CourseRead])
 def filter_courses(
+    response: Response,
     code: str = Query(None, description="Filtrar por código"),
     title: str = Query(None, description="Filtrar por título"),
     department_id: int = Query(None, description="Filtrar por departamento"),
     year: int = Query(None, description="Filtrar por ano"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,title)"),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(CourseRead, fields)
     query = db.query(Course)
     if code:
         query = query.filter(Course.code.ilike(f"%{code}%"))
@@ -50,53 +74,122 @@ def filter_courses(
         query = query.filter(Course.department_id == department_id)
     if year:
         query = query.filter(Course.year == year)
+    if names:
+        return projection_response(project(query, Course, names), response)
     courses = query.all()
-    return [CourseService(CourseRepository(db))._to_dict(c) for c in courses]
+    return model_list_response(CourseRead, courses, response)
 
-@router.get("/search", response_model=List[CourseRead])
-def search_courses(q: str = Query(..., description="Busca textual parcial no título ou descrição do curso"), db: Session = Depends(get_db)):
-    query = db.query(Course).filter(
-        (Course.title.ilike(f"%{q}%")) | (Course.description.ilike(f"%{q}%"))
-    )
-    courses = query.all()
-    return [CourseService(CourseRepository(db))._to_dict(c) for c in courses]
+@router.get("/search", response_model=List[CourseSearchResult])
+def search_courses(
+    q: str = Query(..., description="Busca textual parcial no título ou descrição do curso"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Número máximo de resultados"),
+    db: Session = Depends(get_db)
+):
+    service = CourseService(CourseRepository(db))
+    return [{**service._to_dict(c), "score": score} for c, score in SearchService(db).search(Course, q, limit)]
 
 @router.get("/by-department/{department_id}", response_model=List[CourseRead])
-def courses_by_department(department_id: int, db: Session = Depends(get_db)):
+def courses_by_department(department_id: int, response: Response, db: Session = Depends(get_db)):
     courses = db.query(Course).filter(Course.department_id == department_id).all()
-    return [CourseService(CourseRepository(db))._to_dict(c) for c in courses]
+    return model_list_response(CourseRead, courses, response)
 
 @router.get("/ordered", response_model=List[CourseRead])
 def ordered_courses(
+    request: Request,
+    response: Response,
     order_by: str = Query("title", description="Campo para ordenar (title, year, credits)"),
     desc: bool = Query(False, description="Ordem decrescente?"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,title)"),
     db: Session = Depends(get_db)
 ):
-    field = getattr(Course, order_by, Course.title)
-    if desc:
-        field = field.desc()
-    courses = db.query(Course).order_by(field).all()
-    return [CourseService(CourseRepository(db))._to_dict(c) for c in courses]
+    names = parse_fields(CourseRead, fields)
+    column = getattr(Course, order_by, Course.title)
+    field = column.desc() if desc else column
+    tiebreak = Course.id.desc() if desc else Course.id
+    service = CourseService(CourseRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Course).order_by(field), Course, names), row_to_dict, Course.id, column, desc)
+        return ndjson_response(lambda s: s.query(Course).order_by(field), service._to_dict, Course.id, column, desc)
+    if names:
+        return projection_response(project(db.query(Course).order_by(field, tiebreak), Course, names), response)
+    courses = db.query(Course).order_by(field, tiebreak).all()
+    return model_list_response(CourseRead, courses, response)
 
 @router.get("/count-by-department/{department_id}", response_model=dict)
 def count_courses_by_department(department_id: int, db: Session = Depends(get_db)):
-    count = db.query(Course).filter(Course.department_id == department_id).count()
+    count = db.query(func.count(Course.id)).filter(Course.department_id == department_id).scalar()
     return {"department_id": department_id, "quantidade": count}
 
+def _with_department(session: Session):
+    # Carrega o departamento no mesmo SELECT (JOIN), apenas com as colunas usadas na resposta
+    return session.query(Course).options(joinedload(Course.department).load_only(Department.id, Department.name))
+
+@router.get("/stats/by-department", response_model=List[dict])
+def course_stats_by_department(db: Session = Depends(get_db)):
+    rows = (
+        db.query(
+            Course.department_id.label("department_id"),
+            func.count(Course.id).label("quantidade"),
+            func.sum(Course.max_enrollment).label("vagas"),
+            func.avg(Course.credits).label("media_creditos"),
+        )
+        .group_by(Course.department_id)
+        .order_by(Course.department_id)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
 @router.get("/with-department", response_model=List[dict])
-def courses_with_department(db: Session = Depends(get_db)):
-    courses = db.query(Course).all()
-    result = []
-    for course in courses:
-        course_dict = CourseService(CourseRepository(db))._to_dict(course)
+def courses_with_department(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página (usado com limit)"),
+    limit: int = Query(None, ge=1, le=1000, description="Limite de itens por página (sem paginação quando omitido)"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    db: Session = Depends(get_db)
+):
+    service = CourseService(CourseRepository(db))
+
+    def to_dict(course: Course) -> dict:
+        course_dict = service._to_dict(course)
         dep = getattr(course, "department", None)
         course_dict["department"] = {"id": dep.id, "name": dep.name} if dep else None
-        result.append(course_dict)
-    return result
+        return course_dict
+
+    if wants_stream(request, stream):
+        return ndjson_response(_with_department, to_dict, Course.id)
+    if limit is None:
+        return [to_dict(course) for course in _with_department(db).all()]
+    courses, next_cursor = paginate(_with_department(db), Course.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [to_dict(course) for course in courses]
 
 @router.get("/", response_model=List[CourseRead])
-def list_courses(db: Session = Depends(get_db)):
-    return CourseService(CourseRepository(db)).list_all()
+def list_courses(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,title)"),
+    ids: str = Query(None, description="Ids separados por vírgula (ex.: 1,2,3); ids inexistentes retornam {\"id\": x, \"not_found\": true}"),
+    db: Session = Depends(get_db),
+    loaders: BatchLoaders = Depends(get_loaders)
+):
+    names = parse_fields(CourseRead, fields)
+    requested = parse_ids(ids)
+    if requested is not None:
+        return multi_get_response(CourseRead, requested, loaders[Course].load_many(requested), response, names)
+    service = CourseService(CourseRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Course), Course, names), row_to_dict, Course.id)
+        return ndjson_response(lambda s: s.query(Course), service._to_dict, Course.id)
+    if names:
+        return projection_response(project(db.query(Course), Course, names), response)
+    return model_list_response(CourseRead, service.repository.list_all(), response)
 
 @router.post("/", response_model=CourseRead, status_code=status.HTTP_201_CREATED)
 def create_course(course: CourseCreate, db: Session = Depends(get_db)):
@@ -110,6 +203,16 @@ def create_course(course: CourseCreate, db: Session = Depends(get_db)):
 
 @router.post("/batch", response_model=List[CourseRead], status_code=status.HTTP_201_CREATED)
 def create_courses_batch(courses: List[CourseCreate] = Body(...), db: Session = Depends(get_db)):
+    try:
+        return CourseService(CourseRepository(db)).create_many([c.dict() for c in courses])["created"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Erro ao criar cursos em lote: {str(e)}. Verifique se os dados enviados são válidos."
+        )
+
+@router.post("/batch/report", response_model=dict, status_code=status.HTTP_201_CREATED)
+def create_courses_batch_report(courses: List[CourseCreate] = Body(...), db: Session = Depends(get_db)):
     try:
         return CourseService(CourseRepository(db)).create_many([c.dict() for c in courses])
     except Exception as e:
@@ -118,6 +221,36 @@ def create_courses_batch(courses: List[CourseCreate] = Body(...), db: Session =
             detail=f"Erro ao criar cursos em lote: {str(e)}. Verifique se os dados enviados são válidos."
         )
 
+@stats_router.get("/{course_id}/stats", response_model=dict)
+def course_enrollment_stats(course_id: int, db: Session = Depends(get_db)):
+    row = CourseEnrollmentStatsRepository(db).get(course_id)
+    if row is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Curso com id {course_id} não encontrado."
+        )
+    enrolled = row.enrolled_count or 0
+    return {
+        "course_id": row.course_id,
+        "max_enrollment": row.max_enrollment,
+        "enrolled_count": enrolled,
+        "completed_count": row.completed_count or 0,
+        "avg_grade": row.grade_sum / row.graded_count if row.graded_count else None,
+        "remaining_seats": max(row.max_enrollment - enrolled, 0),
+    }
+
+@router.get("/{course_id}/prerequisite-chain", response_model=List[CourseRead])
+def course_prerequisite_chain(
+    course_id: int, response: Response, db: Session = Depends(get_db), loaders: BatchLoaders = Depends(get_loaders)
+):
+    chain = PrerequisiteService(db).chain(course_id)
+    if chain is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Curso com id {course_id} não encontrado."
+        )
+    return model_list_response(CourseRead, loaders[Course].load_many(chain), response)
+
 @router.get("/{course_id}", response_model=CourseRead)
 def get_course(course_id: int, db: Session = Depends(get_db)):
     try:
@@ -132,6 +265,8 @@ def get_course(course_id: int, db: Session = Depends(get_db)):
 def update_course(course_id: int, course: CourseCreate, db: Session = Depends(get_db)):
     try:
         return CourseService(CourseRepository(db)).update(course_id, course.dict())
+    except PrerequisiteCycleError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"{str(e)}.")
     except Exception:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
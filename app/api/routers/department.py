@@ -1,45 +1,61 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query, Body
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Body, Response, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from app.db.database import get_db
 from app.repositories.department_repository import DepartmentRepository
 from app.services.department_service import DepartmentService
-from app.api.schemas.department_schema import DepartmentRead, DepartmentCreate
+from app.api.schemas.department_schema import DepartmentRead, DepartmentCreate, DepartmentSearchResult
 from app.db.models.department import Department
+from app.db.models.professor import Professor
 from typing import List
+from app.services.count_service import CountService
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.utils.pagination import paginate, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response, wants_stream
+from app.utils.http_cache import conditional_get
+from app.utils.serialization import model_list_response, multi_get_response
+from app.utils.batch_loader import BatchLoaders, get_loaders, parse_ids
+from app.utils.projection import parse_fields, project, projection_response, row_to_dict
 from http import HTTPStatus
 from datetime import date
 
-router = APIRouter(prefix="/departments", tags=["Departments"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(
+    prefix="/departments",
+    tags=["Departments"],
+    dependencies=[Depends(conditional_get("departments", "professors"))],
+)
 
 @router.get("/count", response_model=dict)
-def count_departments(db: Session = Depends(get_db)):
-    quantidade = db.query(Department).count()
-    return {"quantidade": quantidade}
+def count_departments(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: Session = Depends(get_db)
+):
+    return CountService(db).count(Department, exact, approximate)
 
 @router.get("/paged", response_model=List[DepartmentRead])
 def paged_departments(
+    response: Response,
     page: int = Query(1, ge=1, description="Número da página"),
     limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
-    deps = db.query(Department).offset(offset).limit(limit).all()
-    return [DepartmentService(DepartmentRepository(db))._to_dict(d) for d in deps]
+    deps, next_cursor = paginate(db.query(Department), Department.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return model_list_response(DepartmentRead, deps, response)
 
 @router.get("/filter", response_model=List[DepartmentRead])
 def filter_departments(
+    response: Response,
     name: str = Query(None, description="Filtrar por nome"),
     description: str = Query(None, description="Filtrar por descrição"),
     contact_email: str = Query(None, description="Filtrar por e-mail de contato"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,name)"),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(DepartmentRead, fields)
     query = db.query(Department)
     if name:
         query = query.filter(Department.name.ilike(f"%{name}%"))
@@ -47,64 +63,131 @@ def filter_departments(
         query = query.filter(Department.description.ilike(f"%{description}%"))
     if contact_email:
         query = query.filter(Department.contact_email.ilike(f"%{contact_email}%"))
+    if names:
+        return projection_response(project(query, Department, names), response)
     deps = query.all()
-    return [DepartmentService(DepartmentRepository(db))._to_dict(d) for d in deps]
+    return model_list_response(DepartmentRead, deps, response)
 
-@router.get("/search", response_model=List[DepartmentRead])
+@router.get("/search", response_model=List[DepartmentSearchResult])
 def search_departments(
     q: str = Query(..., description="Busca textual parcial no nome ou descrição do departamento"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Número máximo de resultados"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Department).filter(
-        (Department.name.ilike(f"%{q}%")) | (Department.description.ilike(f"%{q}%"))
-    )
-    deps = query.all()
-    return [DepartmentService(DepartmentRepository(db))._to_dict(d) for d in deps]
+    service = DepartmentService(DepartmentRepository(db))
+    return [{**service._to_dict(d), "score": score} for d, score in SearchService(db).search(Department, q, limit)]
 
 @router.get("/by-year", response_model=List[DepartmentRead])
 def departments_by_year(
+    response: Response,
     year: int = Query(..., description="Ano de fundação do departamento"),
     db: Session = Depends(get_db)
 ):
     deps = db.query(Department).filter(Department.established_year == year).all()
-    return [DepartmentService(DepartmentRepository(db))._to_dict(d) for d in deps]
+    return model_list_response(DepartmentRead, deps, response)
 
 @router.get("/count-by-year", response_model=dict)
 def count_departments_by_year(
     year: int = Query(..., description="Ano de fundação do departamento"),
     db: Session = Depends(get_db)
 ):
-    count = db.query(Department).filter(Department.established_year == year).count()
+    count = db.query(func.count(Department.id)).filter(Department.established_year == year).scalar()
     return {"ano": year, "quantidade": count}
 
+@router.get("/stats/by-year", response_model=List[dict])
+def department_stats_by_year(db: Session = Depends(get_db)):
+    rows = (
+        db.query(
+            Department.established_year.label("ano"),
+            func.count(Department.id).label("quantidade"),
+        )
+        .group_by(Department.established_year)
+        .order_by(Department.established_year)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
 @router.get("/ordered", response_model=List[DepartmentRead])
 def ordered_departments(
+    request: Request,
+    response: Response,
     order_by: str = Query("name", description="Campo para ordenar (name, established_year)"),
     desc: bool = Query(False, description="Ordem decrescente?"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,name)"),
     db: Session = Depends(get_db)
 ):
-    field = getattr(Department, order_by, Department.name)
-    if desc:
-        field = field.desc()
-    deps = db.query(Department).order_by(field).all()
-    return [DepartmentService(DepartmentRepository(db))._to_dict(d) for d in deps]
+    names = parse_fields(DepartmentRead, fields)
+    column = getattr(Department, order_by, Department.name)
+    field = column.desc() if desc else column
+    tiebreak = Department.id.desc() if desc else Department.id
+    service = DepartmentService(DepartmentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Department).order_by(field), Department, names), row_to_dict, Department.id, column, desc)
+        return ndjson_response(lambda s: s.query(Department).order_by(field), service._to_dict, Department.id, column, desc)
+    if names:
+        return projection_response(project(db.query(Department).order_by(field, tiebreak), Department, names), response)
+    deps = db.query(Department).order_by(field, tiebreak).all()
+    return model_list_response(DepartmentRead, deps, response)
+
+def _with_professors(session: Session):
+    # Professores de todos os departamentos da página em um único SELECT ... WHERE department_id IN (...)
+    return session.query(Department).options(
+        selectinload(Department.professors).load_only(Professor.id, Professor.first_name, Professor.last_name, Professor.email)
+    )
 
 @router.get("/with-professors", response_model=List[dict])
-def departments_with_professors(db: Session = Depends(get_db)):
-    deps = db.query(Department).all()
-    result = []
-    for dep in deps:
-        dep_dict = DepartmentService(DepartmentRepository(db))._to_dict(dep)
+def departments_with_professors(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página (usado com limit)"),
+    limit: int = Query(None, ge=1, le=1000, description="Limite de itens por página (sem paginação quando omitido)"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    db: Session = Depends(get_db)
+):
+    service = DepartmentService(DepartmentRepository(db))
+
+    def to_dict(dep: Department) -> dict:
+        dep_dict = service._to_dict(dep)
         dep_dict["professors"] = [
             {"id": p.id, "first_name": p.first_name, "last_name": p.last_name, "email": p.email}
             for p in getattr(dep, "professors", [])
         ]
-        result.append(dep_dict)
-    return result
+        return dep_dict
+
+    if wants_stream(request, stream):
+        return ndjson_response(_with_professors, to_dict, Department.id)
+    if limit is None:
+        return [to_dict(dep) for dep in _with_professors(db).all()]
+    deps, next_cursor = paginate(_with_professors(db), Department.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [to_dict(dep) for dep in deps]
 
 @router.get("/", response_model=List[DepartmentRead])
-def list_departments(db: Session = Depends(get_db)):
-    return DepartmentService(DepartmentRepository(db)).list_all()
+def list_departments(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,name)"),
+    ids: str = Query(None, description="Ids separados por vírgula (ex.: 1,2,3); ids inexistentes retornam {\"id\": x, \"not_found\": true}"),
+    db: Session = Depends(get_db),
+    loaders: BatchLoaders = Depends(get_loaders)
+):
+    names = parse_fields(DepartmentRead, fields)
+    requested = parse_ids(ids)
+    if requested is not None:
+        return multi_get_response(DepartmentRead, requested, loaders[Department].load_many(requested), response, names)
+    service = DepartmentService(DepartmentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Department), Department, names), row_to_dict, Department.id)
+        return ndjson_response(lambda s: s.query(Department), service._to_dict, Department.id)
+    if names:
+        return projection_response(project(db.query(Department), Department, names), response)
+    return model_list_response(DepartmentRead, service.repository.list_all(), response)
 
 @router.post("/", response_model=DepartmentRead, status_code=status.HTTP_201_CREATED)
 def create_department(department: DepartmentCreate, db: Session = Depends(get_db)):
@@ -118,6 +201,16 @@ def create_department(department: DepartmentCreate, db: Session = Depends(get_db
 
 @router.post("/batch", response_model=List[DepartmentRead], status_code=status.HTTP_201_CREATED)
 def create_departments_batch(departments: List[DepartmentCreate] = Body(...), db: Session = Depends(get_db)):
+    try:
+        return DepartmentService(DepartmentRepository(db)).create_many([d.dict() for d in departments])["created"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Erro ao criar departamentos em lote: {str(e)}. Verifique se os dados enviados são válidos."
+        )
+
+@router.post("/batch/report", response_model=dict, status_code=status.HTTP_201_CREATED)
+def create_departments_batch_report(departments: List[DepartmentCreate] = Body(...), db: Session = Depends(get_db)):
     try:
         return DepartmentService(DepartmentRepository(db)).create_many([d.dict() for d in departments])
     except Exception as e:
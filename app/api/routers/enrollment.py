@@ -1,54 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from app.db.database import get_db
 from app.db.models.enrollment import Enrollment
+from app.db.models.student import Student
+from app.db.models.course import Course
 from app.repositories.enrollment_repository import EnrollmentRepository
-from app.services.enrollment_service import EnrollmentService
+from app.services.enrollment_service import EnrollmentService, CourseFullError
+from app.services.count_service import CountService
 from typing import List
 from app.api.schemas.enrollment_schema import EnrollmentRead, EnrollmentCreate
+from app.utils.pagination import paginate, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response, wants_stream
+from app.utils.http_cache import conditional_get
+from app.utils.serialization import model_list_response, multi_get_response
+from app.utils.batch_loader import BatchLoaders, get_loaders, parse_ids
+from app.utils.projection import parse_fields, project, projection_response, row_to_dict
 from http import HTTPStatus
 from datetime import date
 
-router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(
+    prefix="/enrollments",
+    tags=["Enrollments"],
+    dependencies=[Depends(conditional_get("enrollments", "students", "courses"))],
+)
 
 @router.get("/count", response_model=dict)
-def count_enrollments(db: Session = Depends(get_db)):
-    quantidade = db.query(Enrollment).count()
-    return {"quantidade": quantidade}
+def count_enrollments(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: Session = Depends(get_db)
+):
+    return CountService(db).count(Enrollment, exact, approximate)
 
 @router.get("/paged", response_model=List[EnrollmentRead])
 def paged_enrollments(
+    response: Response,
     page: int = Query(1, ge=1, description="Número da página"),
     limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
-    enrollments = db.query(Enrollment).offset(offset).limit(limit).all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    enrollments, next_cursor = paginate(db.query(Enrollment), Enrollment.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/filter", response_model=List[EnrollmentRead])
 def filter_enrollments(
+    response: Response,
     student_id: int = Query(None, description="Filtrar por estudante"),
     course_id: int = Query(None, description="Filtrar por curso"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,grade)"),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(EnrollmentRead, fields)
     query = db.query(Enrollment)
     if student_id:
         query = query.filter(Enrollment.student_id == student_id)
     if course_id:
         query = query.filter(Enrollment.course_id == course_id)
+    if names:
+        return projection_response(project(query, Enrollment, names), response)
     enrollments = query.all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/search", response_model=List[EnrollmentRead])
 def search_enrollments(
+    response: Response,
     q: str = Query(..., description="Busca textual parcial por id do estudante ou curso"),
     db: Session = Depends(get_db)
 ):
@@ -56,56 +75,135 @@ def search_enrollments(
         (Enrollment.student_id == q) | (Enrollment.course_id == q)
     )
     enrollments = query.all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/by-student/{student_id}", response_model=List[EnrollmentRead])
-def enrollments_by_student(student_id: int, db: Session = Depends(get_db)):
+def enrollments_by_student(student_id: int, response: Response, db: Session = Depends(get_db)):
     enrollments = db.query(Enrollment).filter(Enrollment.student_id == student_id).all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/by-course/{course_id}", response_model=List[EnrollmentRead])
-def enrollments_by_course(course_id: int, db: Session = Depends(get_db)):
+def enrollments_by_course(course_id: int, response: Response, db: Session = Depends(get_db)):
     enrollments = db.query(Enrollment).filter(Enrollment.course_id == course_id).all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/ordered", response_model=List[EnrollmentRead])
 def ordered_enrollments(
+    request: Request,
+    response: Response,
     order_by: str = Query("enrollment_date", description="Campo para ordenar (enrollment_date, grade)"),
     desc: bool = Query(False, description="Ordem decrescente?"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,grade)"),
     db: Session = Depends(get_db)
 ):
-    field = getattr(Enrollment, order_by, Enrollment.enrollment_date)
-    if desc:
-        field = field.desc()
-    enrollments = db.query(Enrollment).order_by(field).all()
-    return [EnrollmentService(EnrollmentRepository(db))._to_dict(e) for e in enrollments]
+    names = parse_fields(EnrollmentRead, fields)
+    column = getattr(Enrollment, order_by, Enrollment.enrollment_date)
+    field = column.desc() if desc else column
+    tiebreak = Enrollment.id.desc() if desc else Enrollment.id
+    service = EnrollmentService(EnrollmentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Enrollment).order_by(field), Enrollment, names), row_to_dict, Enrollment.id, column, desc)
+        return ndjson_response(lambda s: s.query(Enrollment).order_by(field), service._to_dict, Enrollment.id, column, desc)
+    if names:
+        return projection_response(project(db.query(Enrollment).order_by(field, tiebreak), Enrollment, names), response)
+    enrollments = db.query(Enrollment).order_by(field, tiebreak).all()
+    return model_list_response(EnrollmentRead, enrollments, response)
 
 @router.get("/count-by-course/{course_id}", response_model=dict)
 def count_enrollments_by_course(course_id: int, db: Session = Depends(get_db)):
-    count = db.query(Enrollment).filter(Enrollment.course_id == course_id).count()
+    count = db.query(func.count(Enrollment.id)).filter(Enrollment.course_id == course_id).scalar()
     return {"course_id": course_id, "quantidade": count}
 
+def _with_student_course(session: Session):
+    # Carrega estudante e curso no mesmo SELECT (JOIN), apenas com as colunas usadas na resposta
+    return session.query(Enrollment).options(
+        joinedload(Enrollment.student).load_only(Student.id, Student.first_name, Student.last_name),
+        joinedload(Enrollment.course).load_only(Course.id, Course.title),
+    )
+
+@router.get("/stats/by-course", response_model=List[dict])
+def enrollment_stats_by_course(db: Session = Depends(get_db)):
+    # Uma única consulta agrupada para todos os cursos (inclusive os sem matrículas)
+    quantidade = func.count(Enrollment.id)
+    rows = (
+        db.query(
+            Course.id.label("course_id"),
+            quantidade.label("quantidade"),
+            func.avg(Enrollment.grade).label("media_nota"),
+            Course.max_enrollment.label("max_enrollment"),
+            (quantidade * 1.0 / func.nullif(Course.max_enrollment, 0)).label("taxa_ocupacao"),
+            func.min(Enrollment.enrollment_date).label("primeira_matricula"),
+            func.max(Enrollment.enrollment_date).label("ultima_matricula"),
+        )
+        .outerjoin(Enrollment, Enrollment.course_id == Course.id)
+        # max_enrollment depende funcionalmente da chave primária: agrupar só por id deixa o índice
+        # atender GROUP BY e ORDER BY sem ordenação extra
+        .group_by(Course.id)
+        .order_by(Course.id)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
 @router.get("/with-student-course", response_model=List[dict])
-def enrollments_with_student_course(db: Session = Depends(get_db)):
-    enrollments = db.query(Enrollment).all()
-    result = []
-    for enr in enrollments:
-        enr_dict = EnrollmentService(EnrollmentRepository(db))._to_dict(enr)
+def enrollments_with_student_course(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página (usado com limit)"),
+    limit: int = Query(None, ge=1, le=1000, description="Limite de itens por página (sem paginação quando omitido)"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    db: Session = Depends(get_db)
+):
+    service = EnrollmentService(EnrollmentRepository(db))
+
+    def to_dict(enr: Enrollment) -> dict:
+        enr_dict = service._to_dict(enr)
         stu = getattr(enr, "student", None)
         course = getattr(enr, "course", None)
         enr_dict["student"] = {"id": stu.id, "first_name": stu.first_name, "last_name": stu.last_name} if stu else None
         enr_dict["course"] = {"id": course.id, "title": course.title} if course else None
-        result.append(enr_dict)
-    return result
+        return enr_dict
+
+    if wants_stream(request, stream):
+        return ndjson_response(_with_student_course, to_dict, Enrollment.id)
+    if limit is None:
+        return [to_dict(enr) for enr in _with_student_course(db).all()]
+    enrs, next_cursor = paginate(_with_student_course(db), Enrollment.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [to_dict(enr) for enr in enrs]
 
 @router.get("/", response_model=List[EnrollmentRead])
-def list_enrollments(db: Session = Depends(get_db)):
-    return EnrollmentService(EnrollmentRepository(db)).list_all()
+def list_enrollments(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,grade)"),
+    ids: str = Query(None, description="Ids separados por vírgula (ex.: 1,2,3); ids inexistentes retornam {\"id\": x, \"not_found\": true}"),
+    db: Session = Depends(get_db),
+    loaders: BatchLoaders = Depends(get_loaders)
+):
+    names = parse_fields(EnrollmentRead, fields)
+    requested = parse_ids(ids)
+    if requested is not None:
+        return multi_get_response(EnrollmentRead, requested, loaders[Enrollment].load_many(requested), response, names)
+    service = EnrollmentService(EnrollmentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Enrollment), Enrollment, names), row_to_dict, Enrollment.id)
+        return ndjson_response(lambda s: s.query(Enrollment), service._to_dict, Enrollment.id)
+    if names:
+        return projection_response(project(db.query(Enrollment), Enrollment, names), response)
+    return model_list_response(EnrollmentRead, service.repository.list_all(), response)
 
 @router.post("/", response_model=EnrollmentRead, status_code=status.HTTP_201_CREATED)
 def create_enrollment(enrollment: EnrollmentCreate, db: Session = Depends(get_db)):
     try:
         return EnrollmentService(EnrollmentRepository(db)).create(enrollment.dict())
+    except CourseFullError as e:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=f"{str(e)}.")
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
@@ -114,6 +212,16 @@ def create_enrollment(enrollment: EnrollmentCreate, db: Session = Depends(get_db
 
 @router.post("/batch", response_model=List[EnrollmentRead], status_code=status.HTTP_201_CREATED)
 def create_enrollments_batch(enrollments: List[EnrollmentCreate] = Body(...), db: Session = Depends(get_db)):
+    try:
+        return EnrollmentService(EnrollmentRepository(db)).create_many([e.dict() for e in enrollments])["created"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Erro ao criar matrículas em lote: {str(e)}. Verifique se os dados enviados são válidos."
+        )
+
+@router.post("/batch/report", response_model=dict, status_code=status.HTTP_201_CREATED)
+def create_enrollments_batch_report(enrollments: List[EnrollmentCreate] = Body(...), db: Session = Depends(get_db)):
     try:
         return EnrollmentService(EnrollmentRepository(db)).create_many([e.dict() for e in enrollments])
     except Exception as e:
@@ -136,6 +244,8 @@ def get_enrollment(enrollment_id: int, db: Session = Depends(get_db)):
 def update_enrollment(enrollment_id: int, enrollment: EnrollmentCreate, db: Session = Depends(get_db)):
     try:
         return EnrollmentService(EnrollmentRepository(db)).update(enrollment_id, enrollment.dict())
+    except CourseFullError as e:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=f"{str(e)}.")
     except Exception:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
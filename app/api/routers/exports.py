@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from app.db.database import SessionLocal
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES, require_pyarrow
+from app.utils.http_cache import conditional_get
+from http import HTTPStatus
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    dependencies=[Depends(conditional_get("enrollments", "students", "courses"))],
+)
+
+@router.get("/enrollments")
+def export_enrollments(
+    response: Response,
+    file_format: str = Query("csv", alias="format", pattern="^(csv|parquet)$", description="csv ou parquet (requer pyarrow)"),
+    student_id: int = Query(None, description="Filtrar por estudante"),
+    course_id: int = Query(None, description="Filtrar por curso"),
+):
+    if file_format == "parquet":
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            raise HTTPException(status_code=HTTPStatus.NOT_IMPLEMENTED, detail=str(e))
+
+    def generate():
+        # Sessão própria: a resposta é enviada depois que as dependências da requisição terminam
+        db = SessionLocal()
+        try:
+            yield from ExportService(db).export_enrollments(file_format, student_id=student_id, course_id=course_id)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={**response.headers, "Content-Disposition": f'attachment; filename="enrollments.{file_format}"'},
+    )
@@ -0,0 +1,41 @@
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.services.import_service import ImportService, IMPORT_ENTITIES, iter_records, text_lines
+from http import HTTPStatus
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+# Corpo acima deste tamanho é mantido em arquivo temporário, não em memória
+SPOOL_MAX_BYTES = 1024 * 1024
+
+def request_format(request: Request, file_format: str) -> str:
+    if file_format:
+        return file_format
+    return "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+@router.post("/{entity}", response_model=dict)
+async def import_records(
+    entity: str,
+    request: Request,
+    file_format: str = Query(None, alias="format", pattern="^(csv|ndjson)$", description="csv ou ndjson (padrão: pelo Content-Type)"),
+    db: Session = Depends(get_db)
+):
+    if entity not in IMPORT_ENTITIES:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Importação não suportada para '{entity}'. Disponíveis: {', '.join(IMPORT_ENTITIES)}."
+        )
+    file_format = request_format(request, file_format)
+    # O corpo é lido em blocos para um arquivo temporário e processado linha a linha, sem carregá-lo inteiro
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        async for block in request.stream():
+            spool.write(block)
+        spool.seek(0)
+        lines = text_lines(spool)
+        try:
+            return await run_in_threadpool(ImportService(db).run, entity, iter_records(lines, file_format))
+        finally:
+            lines.detach()
@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from app.db.database import engine
+from app.db.pool_metrics import pool_metrics
+from app.utils.cache import entity_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/db-pool", response_model=dict)
+def db_pool_metrics():
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    status.update({
+        "timeouts": pool_metrics.timeouts,
+        "wait_ms": pool_metrics.wait_ms.snapshot(),
+        "checked_out_histogram": pool_metrics.checked_out.snapshot(),
+        "overflow_histogram": pool_metrics.overflow.snapshot(),
+    })
+    return status
+
+@router.get("/cache", response_model=dict)
+def cache_metrics():
+    return entity_cache.snapshot()
@@ -1,26 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from app.db.database import get_db
 from app.db.models.professor import Professor
+from app.db.models.department import Department
 from app.repositories.professor_repository import ProfessorRepository
 from app.services.professor_service import ProfessorService
 from typing import List
-from app.api.schemas.professor_schema import ProfessorRead, ProfessorCreate
+from app.api.schemas.professor_schema import ProfessorRead, ProfessorCreate, ProfessorSearchResult
+from app.services.count_service import CountService
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.utils.pagination import paginate, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response, wants_stream
+from app.utils.http_cache import conditional_get
+from app.utils.serialization import model_list_response, multi_get_response
+from app.utils.batch_loader import BatchLoaders, get_loaders, parse_ids
+from app.utils.projection import parse_fields, project, projection_response, row_to_dict
 from http import HTTPStatus
 from datetime import date
 
-router = APIRouter(prefix="/professors", tags=["Professors"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(
+    prefix="/professors",
+    tags=["Professors"],
+    dependencies=[Depends(conditional_get("professors", "departments"))],
+)
 
 @router.get("/", response_model=List[ProfessorRead])
-def list_professors(db: Session = Depends(get_db)):
-    return ProfessorService(ProfessorRepository(db)).list_all()
+def list_professors(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,last_name)"),
+    ids: str = Query(None, description="Ids separados por vírgula (ex.: 1,2,3); ids inexistentes retornam {\"id\": x, \"not_found\": true}"),
+    db: Session = Depends(get_db),
+    loaders: BatchLoaders = Depends(get_loaders)
+):
+    names = parse_fields(ProfessorRead, fields)
+    requested = parse_ids(ids)
+    if requested is not None:
+        return multi_get_response(ProfessorRead, requested, loaders[Professor].load_many(requested), response, names)
+    service = ProfessorService(ProfessorRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Professor), Professor, names), row_to_dict, Professor.id)
+        return ndjson_response(lambda s: s.query(Professor), service._to_dict, Professor.id)
+    if names:
+        return projection_response(project(db.query(Professor), Professor, names), response)
+    return model_list_response(ProfessorRead, service.repository.list_all(), response)
 
 @router.post("/", response_model=ProfessorRead, status_code=status.HTTP_201_CREATED)
 def create_professor(professor: ProfessorCreate, db: Session = Depends(get_db)):
@@ -34,6 +60,16 @@ def create_professor(professor: ProfessorCreate, db: Session = Depends(get_db)):
 
 @router.post("/batch", response_model=List[ProfessorRead], status_code=status.HTTP_201_CREATED)
 def create_professors_batch(professors: List[ProfessorCreate] = Body(...), db: Session = Depends(get_db)):
+    try:
+        return ProfessorService(ProfessorRepository(db)).create_many([p.dict() for p in professors])["created"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Erro ao criar professores em lote: {str(e)}. Verifique se os dados enviados são válidos."
+        )
+
+@router.post("/batch/report", response_model=dict, status_code=status.HTTP_201_CREATED)
+def create_professors_batch_report(professors: List[ProfessorCreate] = Body(...), db: Session = Depends(get_db)):
     try:
         return ProfessorService(ProfessorRepository(db)).create_many([p.dict() for p in professors])
     except Exception as e:
@@ -43,28 +79,37 @@ def create_professors_batch(professors: List[ProfessorCreate] = Body(...), db: S
         )
 
 @router.get("/count", response_model=dict)
-def count_professors(db: Session = Depends(get_db)):
-    quantidade = db.query(Professor).count()
-    return {"quantidade": quantidade}
+def count_professors(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: Session = Depends(get_db)
+):
+    return CountService(db).count(Professor, exact, approximate)
 
 @router.get("/paged", response_model=List[ProfessorRead])
 def paged_professors(
+    response: Response,
     page: int = Query(1, ge=1, description="Número da página"),
     limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
-    profs = db.query(Professor).offset(offset).limit(limit).all()
-    return [ProfessorService(ProfessorRepository(db))._to_dict(p) for p in profs]
+    profs, next_cursor = paginate(db.query(Professor), Professor.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return model_list_response(ProfessorRead, profs, response)
 
 @router.get("/filter", response_model=List[ProfessorRead])
 def filter_professors(
+    response: Response,
     first_name: str = Query(None, description="Filtrar por nome"),
     last_name: str = Query(None, description="Filtrar por sobrenome"),
     email: str = Query(None, description="Filtrar por e-mail"),
     title: str = Query(None, description="Filtrar por título"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,last_name)"),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(ProfessorRead, fields)
     query = db.query(Professor)
     if first_name:
         query = query.filter(Professor.first_name.ilike(f"%{first_name}%"))
@@ -74,54 +119,99 @@ def filter_professors(
         query = query.filter(Professor.email.ilike(f"%{email}%"))
     if title:
         query = query.filter(Professor.title.ilike(f"%{title}%"))
+    if names:
+        return projection_response(project(query, Professor, names), response)
     profs = query.all()
-    return [ProfessorService(ProfessorRepository(db))._to_dict(p) for p in profs]
+    return model_list_response(ProfessorRead, profs, response)
 
-@router.get("/search", response_model=List[ProfessorRead])
+@router.get("/search", response_model=List[ProfessorSearchResult])
 def search_professors(
     q: str = Query(..., description="Busca textual parcial no nome, sobrenome ou título"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Número máximo de resultados"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Professor).filter(
-        (Professor.first_name.ilike(f"%{q}%")) |
-        (Professor.last_name.ilike(f"%{q}%")) |
-        (Professor.title.ilike(f"%{q}%"))
-    )
-    profs = query.all()
-    return [ProfessorService(ProfessorRepository(db))._to_dict(p) for p in profs]
+    service = ProfessorService(ProfessorRepository(db))
+    return [{**service._to_dict(p), "score": score} for p, score in SearchService(db).search(Professor, q, limit)]
 
 @router.get("/by-department/{department_id}", response_model=List[ProfessorRead])
-def professors_by_department(department_id: int, db: Session = Depends(get_db)):
+def professors_by_department(department_id: int, response: Response, db: Session = Depends(get_db)):
     profs = db.query(Professor).filter(Professor.department_id == department_id).all()
-    return [ProfessorService(ProfessorRepository(db))._to_dict(p) for p in profs]
+    return model_list_response(ProfessorRead, profs, response)
 
 @router.get("/ordered", response_model=List[ProfessorRead])
 def ordered_professors(
+    request: Request,
+    response: Response,
     order_by: str = Query("last_name", description="Campo para ordenar (first_name, last_name, hire_date)"),
     desc: bool = Query(False, description="Ordem decrescente?"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,last_name)"),
     db: Session = Depends(get_db)
 ):
-    field = getattr(Professor, order_by, Professor.last_name)
-    if desc:
-        field = field.desc()
-    profs = db.query(Professor).order_by(field).all()
-    return [ProfessorService(ProfessorRepository(db))._to_dict(p) for p in profs]
+    names = parse_fields(ProfessorRead, fields)
+    column = getattr(Professor, order_by, Professor.last_name)
+    field = column.desc() if desc else column
+    tiebreak = Professor.id.desc() if desc else Professor.id
+    service = ProfessorService(ProfessorRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Professor).order_by(field), Professor, names), row_to_dict, Professor.id, column, desc)
+        return ndjson_response(lambda s: s.query(Professor).order_by(field), service._to_dict, Professor.id, column, desc)
+    if names:
+        return projection_response(project(db.query(Professor).order_by(field, tiebreak), Professor, names), response)
+    profs = db.query(Professor).order_by(field, tiebreak).all()
+    return model_list_response(ProfessorRead, profs, response)
 
 @router.get("/count-by-department/{department_id}", response_model=dict)
 def count_professors_by_department(department_id: int, db: Session = Depends(get_db)):
-    count = db.query(Professor).filter(Professor.department_id == department_id).count()
+    count = db.query(func.count(Professor.id)).filter(Professor.department_id == department_id).scalar()
     return {"department_id": department_id, "quantidade": count}
 
+def _with_department(session: Session):
+    # Carrega o departamento no mesmo SELECT (JOIN), apenas com as colunas usadas na resposta
+    return session.query(Professor).options(joinedload(Professor.department).load_only(Department.id, Department.name))
+
+@router.get("/stats/by-department", response_model=List[dict])
+def professor_stats_by_department(db: Session = Depends(get_db)):
+    rows = (
+        db.query(
+            Professor.department_id.label("department_id"),
+            func.count(Professor.id).label("quantidade"),
+            func.min(Professor.hire_date).label("primeira_contratacao"),
+            func.max(Professor.hire_date).label("ultima_contratacao"),
+        )
+        .group_by(Professor.department_id)
+        .order_by(Professor.department_id)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
 @router.get("/with-department", response_model=List[dict])
-def professors_with_department(db: Session = Depends(get_db)):
-    profs = db.query(Professor).all()
-    result = []
-    for prof in profs:
-        prof_dict = ProfessorService(ProfessorRepository(db))._to_dict(prof)
+def professors_with_department(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Número da página (usado com limit)"),
+    limit: int = Query(None, ge=1, le=1000, description="Limite de itens por página (sem paginação quando omitido)"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    db: Session = Depends(get_db)
+):
+    service = ProfessorService(ProfessorRepository(db))
+
+    def to_dict(prof: Professor) -> dict:
+        prof_dict = service._to_dict(prof)
         dep = getattr(prof, "department", None)
         prof_dict["department"] = {"id": dep.id, "name": dep.name} if dep else None
-        result.append(prof_dict)
-    return result
+        return prof_dict
+
+    if wants_stream(request, stream):
+        return ndjson_response(_with_department, to_dict, Professor.id)
+    if limit is None:
+        return [to_dict(prof) for prof in _with_department(db).all()]
+    profs, next_cursor = paginate(_with_department(db), Professor.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [to_dict(prof) for prof in profs]
 
 @router.get("/{professor_id}", response_model=ProfessorRead)
 def get_professor(professor_id: int, db: Session = Depends(get_db)):
@@ -1,46 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response, Request
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db
 from app.db.models.student import Student
+from app.db.models.course import Course
 from app.repositories.student_repository import StudentRepository
 from app.services.student_service import StudentService
 from typing import List
-from app.api.schemas.student_schema import StudentRead, StudentCreate
+from app.api.schemas.student_schema import StudentRead, StudentCreate, StudentSearchResult
+from app.api.schemas.course_schema import CourseRead
+from app.services.count_service import CountService
+from app.services.prerequisite_service import PrerequisiteService
+from app.services.transcript_service import TranscriptService
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.utils.pagination import paginate, NEXT_CURSOR_HEADER
+from app.utils.streaming import ndjson_response, wants_stream
+from app.utils.http_cache import conditional_get
+from app.utils.serialization import model_list_response, multi_get_response
+from app.utils.batch_loader import BatchLoaders, get_loaders, parse_ids
+from app.utils.projection import parse_fields, project, projection_response, row_to_dict
 from http import HTTPStatus
 from datetime import date
 
-router = APIRouter(prefix="/students", tags=["Students"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(
+    prefix="/students",
+    tags=["Students"],
+    dependencies=[Depends(conditional_get("students"))],
+)
+# Elegibilidade e histórico dependem das matrículas e do catálogo de cursos; router próprio com o ETag dessas tabelas
+academic_router = APIRouter(
+    prefix="/students",
+    tags=["Students"],
+    dependencies=[Depends(conditional_get("students", "courses", "enrollments"))],
+)
 
 @router.get("/count", response_model=dict)
-def count_students(db: Session = Depends(get_db)):
-    quantidade = db.query(Student).count()
-    return {"quantidade": quantidade}
+def count_students(
+    exact: bool = Query(False, description="Contagem exata (COUNT) que também recalibra o contador mantido"),
+    approximate: bool = Query(False, description="Estimativa a partir das estatísticas da tabela (information_schema no MySQL)"),
+    db: Session = Depends(get_db)
+):
+    return CountService(db).count(Student, exact, approximate)
 
 @router.get("/paged", response_model=List[StudentRead])
 def paged_students(
+    response: Response,
     page: int = Query(1, ge=1, description="Número da página"),
     limit: int = Query(10, ge=1, le=100, description="Limite de itens por página"),
+    after: str = Query(None, description="Cursor retornado no cabeçalho X-Next-Cursor (ignora page quando informado)"),
     db: Session = Depends(get_db)
 ):
-    offset = (page - 1) * limit
-    students = db.query(Student).offset(offset).limit(limit).all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    students, next_cursor = paginate(db.query(Student), Student.id, limit, page, after)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return model_list_response(StudentRead, students, response)
 
 @router.get("/filter", response_model=List[StudentRead])
 def filter_students(
+    response: Response,
     first_name: str = Query(None, description="Filtrar por nome"),
     last_name: str = Query(None, description="Filtrar por sobrenome"),
     email: str = Query(None, description="Filtrar por e-mail"),
     major: str = Query(None, description="Filtrar por curso/área"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,first_name)"),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(StudentRead, fields)
     query = db.query(Student)
     if first_name:
         query = query.filter(Student.first_name.ilike(f"%{first_name}%"))
@@ -50,64 +75,114 @@ def filter_students(
         query = query.filter(Student.email.ilike(f"%{email}%"))
     if major:
         query = query.filter(Student.major.ilike(f"%{major}%"))
+    if names:
+        return projection_response(project(query, Student, names), response)
     students = query.all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    return model_list_response(StudentRead, students, response)
 
-@router.get("/search", response_model=List[StudentRead])
+@router.get("/search", response_model=List[StudentSearchResult])
 def search_students(
     q: str = Query(..., description="Busca textual parcial no nome, sobrenome, email ou major"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Número máximo de resultados"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Student).filter(
-        (Student.first_name.ilike(f"%{q}%")) |
-        (Student.last_name.ilike(f"%{q}%")) |
-        (Student.email.ilike(f"%{q}%")) |
-        (Student.major.ilike(f"%{q}%"))
-    )
-    students = query.all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    service = StudentService(StudentRepository(db))
+    return [{**service._to_dict(s), "score": score} for s, score in SearchService(db).search(Student, q, limit)]
 
 @router.get("/by-major/{major}", response_model=List[StudentRead])
-def students_by_major(major: str, db: Session = Depends(get_db)):
+def students_by_major(major: str, response: Response, db: Session = Depends(get_db)):
     students = db.query(Student).filter(Student.major.ilike(f"%{major}%")).all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    return model_list_response(StudentRead, students, response)
 
 @router.get("/ordered", response_model=List[StudentRead])
 def ordered_students(
+    request: Request,
+    response: Response,
     order_by: str = Query("last_name", description="Campo para ordenar (first_name, last_name, enrollment_date)"),
     desc: bool = Query(False, description="Ordem decrescente?"),
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,first_name)"),
     db: Session = Depends(get_db)
 ):
-    field = getattr(Student, order_by, Student.last_name)
-    if desc:
-        field = field.desc()
-    students = db.query(Student).order_by(field).all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    names = parse_fields(StudentRead, fields)
+    column = getattr(Student, order_by, Student.last_name)
+    field = column.desc() if desc else column
+    tiebreak = Student.id.desc() if desc else Student.id
+    service = StudentService(StudentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Student).order_by(field), Student, names), row_to_dict, Student.id, column, desc)
+        return ndjson_response(lambda s: s.query(Student).order_by(field), service._to_dict, Student.id, column, desc)
+    if names:
+        return projection_response(project(db.query(Student).order_by(field, tiebreak), Student, names), response)
+    students = db.query(Student).order_by(field, tiebreak).all()
+    return model_list_response(StudentRead, students, response)
 
 @router.get("/count-by-major/{major}", response_model=dict)
 def count_students_by_major(major: str, db: Session = Depends(get_db)):
-    count = db.query(Student).filter(Student.major.ilike(f"%{major}%")).count()
+    count = db.query(func.count(Student.id)).filter(Student.major.ilike(f"%{major}%")).scalar()
     return {"major": major, "quantidade": count}
 
+@router.get("/stats/by-major", response_model=List[dict])
+def student_stats_by_major(db: Session = Depends(get_db)):
+    rows = (
+        db.query(
+            Student.major.label("major"),
+            func.count(Student.id).label("quantidade"),
+            func.min(Student.enrollment_date).label("primeira_matricula"),
+            func.max(Student.enrollment_date).label("ultima_matricula"),
+        )
+        .group_by(Student.major)
+        .order_by(Student.major)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
 @router.get("/by-enrollment-year/{year}", response_model=List[StudentRead])
-def students_by_enrollment_year(year: int, db: Session = Depends(get_db)):
+def students_by_enrollment_year(year: int, response: Response, db: Session = Depends(get_db)):
     students = db.query(Student).filter(Student.enrollment_date.between(f"{year}-01-01", f"{year}-12-31")).all()
-    return [StudentService(StudentRepository(db))._to_dict(s) for s in students]
+    return model_list_response(StudentRead, students, response)
 
 @router.get("/with-department", response_model=List[dict])
-def students_with_department(db: Session = Depends(get_db)):
-    students = db.query(Student).all()
-    result = []
-    for stu in students:
-        stu_dict = StudentService(StudentRepository(db))._to_dict(stu)
+def students_with_department(
+    request: Request,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    db: Session = Depends(get_db)
+):
+    service = StudentService(StudentRepository(db))
+
+    def to_dict(stu: Student) -> dict:
+        stu_dict = service._to_dict(stu)
         dep = getattr(stu, "department", None)
         stu_dict["department"] = {"id": dep.id, "name": dep.name} if dep else None
-        result.append(stu_dict)
-    return result
+        return stu_dict
+
+    if wants_stream(request, stream):
+        return ndjson_response(lambda s: s.query(Student), to_dict, Student.id)
+    return [to_dict(stu) for stu in db.query(Student).all()]
 
 @router.get("/", response_model=List[StudentRead])
-def list_students(db: Session = Depends(get_db)):
-    return StudentService(StudentRepository(db)).list_all()
+def list_students(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Retornar em streaming NDJSON"),
+    fields: str = Query(None, description="Campos retornados, separados por vírgula (ex.: id,first_name)"),
+    ids: str = Query(None, description="Ids separados por vírgula (ex.: 1,2,3); ids inexistentes retornam {\"id\": x, \"not_found\": true}"),
+    db: Session = Depends(get_db),
+    loaders: BatchLoaders = Depends(get_loaders)
+):
+    names = parse_fields(StudentRead, fields)
+    requested = parse_ids(ids)
+    if requested is not None:
+        return multi_get_response(StudentRead, requested, loaders[Student].load_many(requested), response, names)
+    service = StudentService(StudentRepository(db))
+    if wants_stream(request, stream):
+        if names:
+            return ndjson_response(lambda s: project(s.query(Student), Student, names), row_to_dict, Student.id)
+        return ndjson_response(lambda s: s.query(Student), service._to_dict, Student.id)
+    if names:
+        return projection_response(project(db.query(Student), Student, names), response)
+    return model_list_response(StudentRead, service.repository.list_all(), response)
 
 @router.post("/", response_model=StudentRead, status_code=status.HTTP_201_CREATED)
 def create_student(student: StudentCreate, db: Session = Depends(get_db)):
@@ -121,6 +196,16 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
 
 @router.post("/batch", response_model=List[StudentRead], status_code=status.HTTP_201_CREATED)
 def create_students_batch(students: List[StudentCreate] = Body(...), db: Session = Depends(get_db)):
+    try:
+        return StudentService(StudentRepository(db)).create_many([s.dict() for s in students])["created"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Erro ao criar estudantes em lote: {str(e)}. Verifique se os dados enviados são válidos."
+        )
+
+@router.post("/batch/report", response_model=dict, status_code=status.HTTP_201_CREATED)
+def create_students_batch_report(students: List[StudentCreate] = Body(...), db: Session = Depends(get_db)):
     try:
         return StudentService(StudentRepository(db)).create_many([s.dict() for s in students])
     except Exception as e:
@@ -129,6 +214,32 @@ def create_students_batch(students: List[StudentCreate] = Body(...), db: Session
             detail=f"Erro ao criar estudantes em lote: {str(e)}. Verifique se os dados enviados são válidos."
         )
 
+@academic_router.get("/{student_id}/eligible-courses", response_model=List[CourseRead])
+def student_eligible_courses(
+    student_id: int, response: Response, db: Session = Depends(get_db), loaders: BatchLoaders = Depends(get_loaders)
+):
+    if loaders[Student].load(student_id) is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Estudante com id {student_id} não encontrado."
+        )
+    course_ids = PrerequisiteService(db).eligible_course_ids(student_id)
+    return model_list_response(CourseRead, loaders[Course].load_many(sorted(course_ids)), response)
+
+@academic_router.get("/transcripts/by-enrollment-year/{year}", response_model=List[dict])
+def cohort_transcripts(year: int, db: Session = Depends(get_db)):
+    # Históricos de todos os estudantes ingressantes no ano, calculados numa única agregação
+    return TranscriptService(db).cohort(year)
+
+@academic_router.get("/{student_id}/transcript", response_model=dict)
+def student_transcript(student_id: int, db: Session = Depends(get_db), loaders: BatchLoaders = Depends(get_loaders)):
+    if loaders[Student].load(student_id) is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Estudante com id {student_id} não encontrado."
+        )
+    return TranscriptService(db).transcript(student_id)
+
 @router.get("/{student_id}", response_model=StudentRead)
 def get_student(student_id: int, db: Session = Depends(get_db)):
     try:
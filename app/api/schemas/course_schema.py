@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class CourseBase(BaseModel):
@@ -17,5 +17,7 @@ class CourseCreate(CourseBase):
 
 class CourseRead(CourseBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class CourseSearchResult(CourseRead):
+    score: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date
 
@@ -16,5 +16,7 @@ class StudentCreate(StudentBase):
 
 class StudentRead(StudentBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class StudentSearchResult(StudentRead):
+    score: float
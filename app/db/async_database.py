@@ -0,0 +1,36 @@
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.database import database_url, pool_options
+from app.db.query_logging import install_slow_query_log
+
+# Drivers assíncronos usados quando ASYNC_DATABASE_URL não é informada
+ASYNC_DRIVERS = {
+    "mysql": "mysql+asyncmy",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    explicit_url = os.getenv("ASYNC_DATABASE_URL")
+    if explicit_url:
+        return explicit_url
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+async_url = async_database_url(database_url)
+# O engine assíncrono usa o AsyncAdaptedQueuePool padrão com os mesmos limites do pool síncrono
+async_pool_options = {key: value for key, value in pool_options(async_url).items() if key != "poolclass"}
+async_engine = create_async_engine(async_url, **async_pool_options)
+install_slow_query_log(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+async def get_async_db():
+    # Mesma unidade de trabalho de get_db: /count?exact=true recalibra o contador em table_versions
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -0,0 +1,48 @@
+from typing import List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.retry import is_retryable
+
+BULK_CHUNK_SIZE = 1000
+
+
+def _insert_rows(db: Session, model, rows: List[dict]) -> List[int]:
+    table = model.__table__
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+    # Sem RETURNING (MySQL): um único INSERT multi-linha. LAST_INSERT_ID() é o id da primeira linha
+    # e o InnoDB reserva ids consecutivos para inserções simples (assume auto_increment_increment = 1)
+    result = db.execute(insert(table).values(rows))
+    first_id = result.lastrowid
+    return list(range(first_id, first_id + len(rows)))
+
+
+def bulk_create(db: Session, model, rows: List[dict], chunk_size: int = BULK_CHUNK_SIZE) -> Tuple[List, List[dict]]:
+    # Cada lote (e cada linha reinserida) roda em um savepoint da transação da requisição:
+    # uma falha desfaz só o próprio lote, e o commit continua sendo feito por quem controla a transação
+    created, errors = [], []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            with db.begin_nested():
+                ids = _insert_rows(db, model, chunk)
+            created.extend(model(id=new_id, **row) for new_id, row in zip(ids, chunk))
+        except Exception as e:
+            if isinstance(e, DBAPIError) and is_retryable(e):
+                # Deadlock desfaz a transação inteira no InnoDB: propaga para with_deadlock_retry
+                raise
+            # Lote rejeitado: reinsere linha a linha para isolar as inválidas e manter as demais
+            for offset, row in enumerate(chunk):
+                try:
+                    with db.begin_nested():
+                        new_id = _insert_rows(db, model, [row])[0]
+                    created.append(model(id=new_id, **row))
+                except Exception as e:
+                    if isinstance(e, DBAPIError) and is_retryable(e):
+                        raise
+                    errors.append({"index": start + offset, "error": str(getattr(e, "orig", e))})
+    return created, errors
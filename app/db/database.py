@@ -1,19 +1,55 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import logging
+from app.db.pool_metrics import InstrumentedQueuePool
+from app.db.query_logging import SQL_ECHO, install_slow_query_log
 
 # Carrega variáveis do .env
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
 
-# Configurar o logger 
-logging.basicConfig() 
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+# Echo de SQL apenas sob demanda (SQL_ECHO=true); formatar cada instrução tem custo por requisição
+if SQL_ECHO:
+    logging.basicConfig()
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
-# Configuração do banco de dados 
+# Configuração do banco de dados
 database_url = os.getenv("DATABASE_URL")
 if not database_url:
     raise RuntimeError("DATABASE_URL environment variable is not set")
-engine = create_engine(database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Configuração do pool de conexões (SQLite em memória mantém o pool padrão)
+def pool_options(url: str) -> dict:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # Recicla antes do wait_timeout do MySQL para não reaproveitar conexões já encerradas pelo servidor
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+engine = create_engine(database_url, **pool_options(database_url))
+install_slow_query_log(engine)
+# A sessão termina logo após o commit: expirar os objetos só causaria novos SELECTs
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Dependência do FastAPI: uma sessão e uma transação por requisição (unit of work).
+# Repositórios e services apenas fazem flush; o commit único acontece aqui ao fim da rota e
+# qualquer exceção (inclusive HTTPException) desfaz todas as escritas da requisição
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -4,3 +4,5 @@ from .professor import Professor
 from .course import Course
 from .student import Student
 from .enrollment import Enrollment
+from .table_version import TableVersion
+from .course_enrollment_stats import CourseEnrollmentStats
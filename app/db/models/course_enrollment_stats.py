@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey  # Importa tipos de coluna e chaves estrangeiras
+from .base import Base  # Importa a classe base para os models ORM
+
+class CourseEnrollmentStats(Base):  # Resumo materializado das matrículas de cada curso
+    __tablename__ = 'course_enrollment_stats'  # Nome da tabela no banco de dados
+    course_id = Column(Integer, ForeignKey('courses.id', ondelete='CASCADE'), primary_key=True)  # Curso resumido
+    enrolled_count = Column(Integer, nullable=False, default=0)  # Total de matrículas no curso
+    completed_count = Column(Integer, nullable=False, default=0)  # Matrículas com data de conclusão
+    graded_count = Column(Integer, nullable=False, default=0)  # Matrículas com nota lançada
+    grade_sum = Column(Float, nullable=False, default=0.0)  # Soma das notas (média = grade_sum / graded_count)
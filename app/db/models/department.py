@@ -1,13 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey  # Importa tipos de coluna e chaves estrangeiras
+from sqlalchemy import Column, Integer, String, ForeignKey, Index  # Importa tipos de coluna e chaves estrangeiras
 from sqlalchemy.orm import relationship  # Importa função para criar relacionamentos
 from .base import Base  # Importa a classe base para os models ORM
 
 class Department(Base):  # Define a classe de departamento herdando de Base
     __tablename__ = 'departments'  # Nome da tabela no banco de dados
+    __table_args__ = (
+        Index('ix_departments_fulltext', 'name', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),  # Índice FULLTEXT usado por /search (apenas MySQL)
+    )
     id = Column(Integer, primary_key=True, index=True)  # Chave primária do departamento
     name = Column(String(100), nullable=False)  # Nome do departamento (obrigatório)
     head_id = Column(Integer, ForeignKey('professors.id'), nullable=True, unique=True)  # FK para o chefe do departamento (professor)
-    established_year = Column(Integer, nullable=True)  # Ano de fundação (opcional)
+    established_year = Column(Integer, nullable=True, index=True)  # Ano de fundação (opcional)
     description = Column(String(255), nullable=True)  # Descrição do departamento (opcional)
     contact_email = Column(String(100), nullable=True)  # E-mail de contato (opcional)
     phone_number = Column(String(20), nullable=True)  # Telefone de contato (opcional)
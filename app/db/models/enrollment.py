@@ -1,13 +1,17 @@
-from sqlalchemy import Column, Integer, Float, Date, ForeignKey  # Importa os tipos de coluna e chaves estrangeiras do SQLAlchemy
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index, UniqueConstraint  # Importa os tipos de coluna e chaves estrangeiras do SQLAlchemy
 from sqlalchemy.orm import relationship  # Importa a função para criar relacionamentos entre tabelas
 from .base import Base  # Importa a classe base para os models ORM
 
 class Enrollment(Base):  # Define a classe de matrícula herdando de Base
     __tablename__ = 'enrollments'  # Nome da tabela no banco de dados
+    __table_args__ = (
+        UniqueConstraint('student_id', 'course_id', name='uq_enrollments_student_course'),  # Um estudante se matricula uma vez por curso
+        Index('ix_enrollments_course_id_enrollment_date', 'course_id', 'enrollment_date'),  # Matrículas por curso ordenadas por data
+    )
     id = Column(Integer, primary_key=True, index=True)  # Chave primária da matrícula
     student_id = Column(Integer, ForeignKey('students.id'))  # Chave estrangeira para o aluno
     course_id = Column(Integer, ForeignKey('courses.id'))  # Chave estrangeira para o curso
-    enrollment_date = Column(Date, nullable=False)  # Data da matrícula (obrigatória)
+    enrollment_date = Column(Date, nullable=False, index=True)  # Data da matrícula (obrigatória)
     grade = Column(Float, nullable=True)  # Nota final (opcional)
     completion_date = Column(Date, nullable=True)  # Data de conclusão (opcional)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table  # Importa tipos de coluna e chaves estrangeiras
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, Index  # Importa tipos de coluna e chaves estrangeiras
 from sqlalchemy.orm import relationship  # Importa função para criar relacionamentos
 from .base import Base  # Importa a classe base para os models ORM
 
@@ -11,12 +11,15 @@ professor_course = Table(
 
 class Professor(Base):  # Define a classe de professor herdando de Base
     __tablename__ = 'professors'  # Nome da tabela no banco de dados
+    __table_args__ = (
+        Index('ix_professors_fulltext', 'first_name', 'last_name', 'title', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),  # Índice FULLTEXT usado por /search (apenas MySQL)
+    )
     id = Column(Integer, primary_key=True, index=True)  # Chave primária do professor
     first_name = Column(String(50), nullable=False)  # Primeiro nome (obrigatório)
-    last_name = Column(String(50), nullable=False)  # Sobrenome (obrigatório)
+    last_name = Column(String(50), nullable=False, index=True)  # Sobrenome (obrigatório)
     email = Column(String(100), nullable=False, unique=True)  # E-mail (obrigatório e único)
-    hire_date = Column(Date, nullable=False)  # Data de contratação (obrigatória)
-    department_id = Column(Integer, ForeignKey('departments.id'))  # FK para departamento
+    hire_date = Column(Date, nullable=False, index=True)  # Data de contratação (obrigatória)
+    department_id = Column(Integer, ForeignKey('departments.id'), index=True)  # FK para departamento
     title = Column(String(50), nullable=True)  # Título do professor (opcional)
 
     department = relationship('Department', back_populates='professors', foreign_keys=[department_id])  # Relacionamento com departamento
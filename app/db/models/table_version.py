@@ -0,0 +1,8 @@
+from sqlalchemy import Column, BigInteger, String  # Importa tipos de coluna
+from .base import Base  # Importa a classe base para os models ORM
+
+class TableVersion(Base):  # Contador de versão por tabela, usado nos ETags das rotas de leitura
+    __tablename__ = 'table_versions'  # Nome da tabela no banco de dados
+    table_name = Column(String(64), primary_key=True)  # Nome da tabela versionada
+    version = Column(BigInteger, nullable=False, default=0)  # Incrementado a cada escrita feita pelos services
+    row_count = Column(BigInteger, nullable=True)  # Contagem mantida pelos services (NULL até o primeiro COUNT exato)
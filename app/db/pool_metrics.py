@@ -0,0 +1,68 @@
+import threading
+import time
+from typing import List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+COUNT_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100]
+
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+            self.samples += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            counts, total, samples = list(self.counts), self.total, self.samples
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "buckets": dict(zip(labels, counts)),
+            "count": samples,
+            "sum": round(total, 3),
+            "avg": round(total / samples, 3) if samples else 0.0,
+        }
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.checked_out = Histogram(COUNT_BUCKETS)
+        self.overflow = Histogram(COUNT_BUCKETS)
+        self.timeouts = 0
+        self.lock = threading.Lock()
+
+    def record_timeout(self) -> None:
+        with self.lock:
+            self.timeouts += 1
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Mede o tempo de espera por uma conexão e amostra a ocupação do pool a cada checkout
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+        pool_metrics.checked_out.observe(self.checkedout())
+        pool_metrics.overflow.observe(max(self.overflow(), 0))
+        return connection
@@ -0,0 +1,25 @@
+import os
+import random
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.logger import logger
+
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+# Log de consultas lentas desligado por padrão; SLOW_QUERY_MS ativa, SLOW_QUERY_SAMPLE_RATE amostra (0 a 1)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+
+def install_slow_query_log(engine: Engine) -> None:
+    if SLOW_QUERY_MS <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context.query_start_time) * 1000
+        if elapsed_ms >= SLOW_QUERY_MS and random.random() < SLOW_QUERY_SAMPLE_RATE:
+            logger.warning("Consulta lenta (%.1f ms): %s", elapsed_ms, statement)
@@ -0,0 +1,43 @@
+import os
+import random
+import time
+from typing import Callable, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.unit_of_work import has_writes
+from app.utils.logger import logger
+
+T = TypeVar("T")
+
+DEADLOCK_RETRIES = int(os.getenv("DB_DEADLOCK_RETRIES", "3"))
+DEADLOCK_BACKOFF_MS = float(os.getenv("DB_DEADLOCK_BACKOFF_MS", "20"))
+
+# 1213: deadlock detectado pelo InnoDB; 1205: tempo de espera por lock esgotado
+RETRYABLE_MYSQL_ERRORS = {1205, 1213}
+
+
+def is_retryable(exc: DBAPIError) -> bool:
+    if getattr(exc.orig, "errno", None) in RETRYABLE_MYSQL_ERRORS:
+        return True
+    message = str(exc.orig).lower()
+    return "deadlock" in message or "database is locked" in message
+
+
+def with_deadlock_retry(db: Session, operation: Callable[[], T], retries: int = DEADLOCK_RETRIES) -> T:
+    # A transação inteira é desfeita e repetida; espera exponencial com jitter entre as tentativas.
+    # O rollback descarta toda a unidade de trabalho da requisição (get_db): se ela já escreveu algo antes
+    # desta operação, repetir só a operação confirmaria um trabalho parcial. Nesse caso não há nova
+    # tentativa: o erro sobe e get_db desfaz a requisição inteira
+    if has_writes(db):
+        return operation()
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except DBAPIError as e:
+            db.rollback()
+            if attempt == retries or not is_retryable(e):
+                raise
+            logger.warning("Conflito de lock no banco (tentativa %s de %s): %s", attempt + 1, retries, e.orig)
+            time.sleep(DEADLOCK_BACKOFF_MS * (2 ** attempt) * random.uniform(0.5, 1.5) / 1000)
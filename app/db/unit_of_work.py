@@ -0,0 +1,62 @@
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+# Ações adiadas até o commit da transação da requisição (ex.: invalidar o cache): executadas só se a
+# transação externa for confirmada e descartadas no rollback. Ficam presas à transação mais interna
+# (savepoint) em que foram registradas: o release de um savepoint as repassa à transação pai e o
+# rollback de um savepoint descarta apenas as dele
+PENDING_KEY = "on_commit"
+# Marca da transação externa que já escreveu no banco (flush ou INSERT/UPDATE/DELETE direto)
+WRITES_KEY = "has_writes"
+
+
+def _current_transaction(session: Session) -> Optional[SessionTransaction]:
+    return session.get_nested_transaction() or session.get_transaction()
+
+
+def on_commit(db: Session, callback: Callable, *args) -> None:
+    transaction = _current_transaction(db) or db.begin()
+    db.info.setdefault(PENDING_KEY, {}).setdefault(transaction, []).append((callback, args))
+
+
+def has_writes(db: Session) -> bool:
+    # Escritas da transação corrente, já enviadas ao banco ou ainda pendentes na sessão
+    return bool(db.info.get(WRITES_KEY) or db.new or db.dirty or db.deleted)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:
+    session.info[WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending(session: Session) -> None:
+    # Disparado também no release de savepoints: só a transação externa executa as ações
+    pending = session.info.get(PENDING_KEY)
+    transaction = _current_transaction(session)
+    if not pending or transaction not in pending:
+        return
+    callbacks = pending.pop(transaction)
+    if transaction.parent is not None:
+        pending.setdefault(transaction.parent, []).extend(callbacks)
+        return
+    for callback, args in callbacks:
+        callback(*args)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction: SessionTransaction) -> None:
+    # O que sobrou ao fim de uma transação não foi confirmado (rollback do savepoint ou da requisição)
+    pending = session.info.get(PENDING_KEY)
+    if pending:
+        pending.pop(transaction, None)
+    if transaction.parent is None:
+        session.info.pop(WRITES_KEY, None)
@@ -1,15 +1,71 @@
+import os
 import app.db.models  # Garante que todos os models são importados
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.api.routers import professor, department, student
 from app.api.routers import course, enrollment
+from app.api.routers import analytics, exports, imports, metrics
+from app.utils.logger import RequestIdMiddleware
 
-app = FastAPI()
+# "sync" (padrão) ou "async": no modo async as rotas de leitura por id, contagem e paginação
+# usam AsyncSession; as demais continuam nas rotas síncronas
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+# "orjson" troca o json.dumps padrão pelo encoder compilado do orjson (requer o pacote orjson)
+JSON_RESPONSE = os.getenv("JSON_RESPONSE", "standard").lower()
+# Compressão gzip das respostas acima de GZIP_MINIMUM_SIZE bytes ("none" desliga)
+COMPRESSION = os.getenv("COMPRESSION", "gzip").lower()
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "5"))
 
-app.include_router(professor.router)
-app.include_router(department.router)
-app.include_router(student.router)
-app.include_router(course.router)
-app.include_router(enrollment.router)
+def default_response_class():
+    if JSON_RESPONSE != "orjson":
+        return JSONResponse
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        raise RuntimeError("JSON_RESPONSE=orjson requer o pacote 'orjson' instalado")
+    return ORJSONResponse
 
-# Outros endpoints podem ser adicionados aqui futuramente
+app = FastAPI(default_response_class=default_response_class())
+app.add_middleware(RequestIdMiddleware)
+if COMPRESSION == "gzip":
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
+def include_entity_router(sync_router: APIRouter, async_router: APIRouter = None):
+    if async_router is None:
+        app.include_router(sync_router)
+        return
+    # As rotas síncronas substituídas saem da tabela; as assíncronas entram depois das rotas estáticas
+    # para que "/{id}" não capture caminhos como "/filter"
+    overridden = {(route.path, method) for route in async_router.routes for method in route.methods}
+    remaining = APIRouter()
+    remaining.routes = [
+        route for route in sync_router.routes
+        if not any((route.path, method) in overridden for method in route.methods)
+    ]
+    app.include_router(remaining)
+    app.include_router(async_router)
 
+if DB_MODE == "async":
+    from app.api.routers import async_professor, async_department, async_student
+    from app.api.routers import async_course, async_enrollment
+    include_entity_router(professor.router, async_professor.router)
+    include_entity_router(department.router, async_department.router)
+    include_entity_router(student.router, async_student.router)
+    include_entity_router(course.router, async_course.router)
+    include_entity_router(enrollment.router, async_enrollment.router)
+else:
+    include_entity_router(professor.router)
+    include_entity_router(department.router)
+    include_entity_router(student.router)
+    include_entity_router(course.router)
+    include_entity_router(enrollment.router)
+app.include_router(course.stats_router)
+app.include_router(student.academic_router)
+app.include_router(analytics.router)
+app.include_router(imports.router)
+app.include_router(exports.router)
+app.include_router(metrics.router)
+
+# Outros endpoints podem ser adicionados aqui futuramente
@@ -0,0 +1,16 @@
+from app.db.models.course import Course
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.utils.pagination import apply_page, next_cursor_for
+
+class AsyncCourseRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, course_id: int) -> Optional[Course]:
+        return await self.db.get(Course, course_id)
+
+    async def list_page(self, limit: int, page: int = 1, after: Optional[str] = None) -> Tuple[List[Course], Optional[str]]:
+        rows = list(await self.db.scalars(apply_page(select(Course), Course.id, limit, page, after)))
+        return rows, next_cursor_for(rows, limit)
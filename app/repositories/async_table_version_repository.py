@@ -0,0 +1,33 @@
+from app.db.models.table_version import TableVersion
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import ScalarSelect
+from typing import Dict, Iterable, Optional
+
+class AsyncTableVersionRepository:
+    # Leituras e recontagem de TableVersionRepository para as rotas do modo async (os bumps ficam nos services)
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_versions(self, table_names: Iterable[str]) -> Dict[str, int]:
+        rows = await self.db.execute(
+            select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(list(table_names)))
+        )
+        return {name: version for name, version in rows}
+
+    async def get_row_count(self, table_name: str) -> Optional[int]:
+        return await self.db.scalar(select(TableVersion.row_count).where(TableVersion.table_name == table_name))
+
+    async def recount(self, table_name: str, count: ScalarSelect) -> int:
+        # Mesma instrução única de TableVersionRepository.recount: nenhum bump concorrente é sobrescrito
+        result = await self.db.execute(
+            update(TableVersion).where(TableVersion.table_name == table_name).values(row_count=count)
+        )
+        if result.rowcount == 0:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(TableVersion).values(table_name=table_name, version=0, row_count=count))
+            except IntegrityError:
+                return await self.recount(table_name, count)
+        return await self.get_row_count(table_name)
@@ -0,0 +1,192 @@
+from app.db.models.course import Course
+from app.db.models.course_enrollment_stats import CourseEnrollmentStats
+from app.db.models.enrollment import Enrollment
+from app.repositories.table_version_repository import TableVersionRepository
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Iterable, Optional
+
+class CourseEnrollmentStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.versions = TableVersionRepository(db)
+
+    def get(self, course_id: int) -> Optional[tuple]:
+        row = self._get(course_id)
+        if row is not None and row.enrolled_count is None:
+            # Curso sem resumo (ex.: criado após o último rebuild e ainda sem matrículas): materializa agora
+            self.recompute([course_id])
+            row = self._get(course_id)
+        return row
+
+    def _get(self, course_id: int) -> Optional[tuple]:
+        # Uma única linha: o resumo do curso junto com o limite de vagas
+        return (
+            self.db.query(
+                Course.id.label("course_id"),
+                Course.max_enrollment,
+                CourseEnrollmentStats.enrolled_count,
+                CourseEnrollmentStats.completed_count,
+                CourseEnrollmentStats.graded_count,
+                CourseEnrollmentStats.grade_sum,
+            )
+            .outerjoin(CourseEnrollmentStats, CourseEnrollmentStats.course_id == Course.id)
+            .filter(Course.id == course_id)
+            .first()
+        )
+
+    def reserve(self, enrollment) -> bool:
+        # Reserva atômica de vaga: o UPDATE só incrementa enquanto enrolled_count < max_enrollment,
+        # sem janela entre a verificação e a escrita (a linha fica travada até o commit da matrícula)
+        course_id, values = self._contribution(enrollment, 1)
+        if course_id is None:
+            return True
+        max_enrollment = select(Course.max_enrollment).where(Course.id == course_id).scalar_subquery()
+        reserve = (
+            update(CourseEnrollmentStats)
+            .where(CourseEnrollmentStats.course_id == course_id, CourseEnrollmentStats.enrolled_count < max_enrollment)
+            .values(**self._increments(values))
+        )
+        if self.db.execute(reserve).rowcount == 1:
+            return True
+        if not self._ensure_row(course_id):
+            # Curso inexistente: a chave estrangeira da matrícula rejeita a inserção
+            return True
+        return self.db.execute(reserve).rowcount == 1
+
+    def reserve_many(self, course_id: int, requested: int) -> int:
+        # Lote: trava a linha do curso (SELECT ... FOR UPDATE) e concede as vagas ainda disponíveis
+        if not self._ensure_row(course_id):
+            return requested
+        # UPDATE sem alteração trava a linha antes da leitura também nos bancos que ignoram FOR UPDATE (SQLite):
+        # dois lotes nunca leem a mesma contagem e concedem as mesmas vagas
+        self.apply(course_id)
+        enrolled, max_enrollment = (
+            self.db.query(CourseEnrollmentStats.enrolled_count, Course.max_enrollment)
+            .join(Course, Course.id == CourseEnrollmentStats.course_id)
+            .filter(CourseEnrollmentStats.course_id == course_id)
+            .with_for_update(of=CourseEnrollmentStats)
+            .one()
+        )
+        granted = max(0, min(requested, max_enrollment - enrolled))
+        if granted:
+            self.apply(course_id, enrolled=granted)
+        return granted
+
+    def add(self, enrollment, enrolled: int = 1) -> None:
+        course_id, values = self._contribution(enrollment, 1)
+        self.apply(course_id, **dict(values, enrolled=enrolled))
+
+    def remove(self, enrollment) -> None:
+        course_id, values = self._contribution(enrollment, -1)
+        self.apply(course_id, **values)
+
+    def settle_reserved(self, created: Iterable, released: Iterable[dict]) -> None:
+        # Lote com vagas já reservadas: soma conclusões/notas das matrículas criadas e devolve as vagas das
+        # linhas que falharam, com um único UPDATE por curso (em ordem de id, como as reservas)
+        totals = defaultdict(lambda: {"enrolled": 0, "completed": 0, "graded": 0, "grade_sum": 0.0})
+        for enrollment in created:
+            course_id, values = self._contribution(enrollment, 1)
+            totals[course_id]["completed"] += values["completed"]
+            totals[course_id]["graded"] += values["graded"]
+            totals[course_id]["grade_sum"] += values["grade_sum"]
+        for data in released:
+            totals[data["course_id"]]["enrolled"] -= 1
+        for course_id in sorted(course_id for course_id in totals if course_id is not None):
+            if any(totals[course_id].values()):
+                self.apply(course_id, **totals[course_id])
+
+    def _contribution(self, enrollment, sign: int) -> tuple:
+        # Aceita tanto a entidade quanto o dicionário de criação/atualização
+        get = enrollment.get if isinstance(enrollment, dict) else lambda key: getattr(enrollment, key)
+        grade = get("grade")
+        return get("course_id"), {
+            "enrolled": sign,
+            "completed": sign if get("completion_date") is not None else 0,
+            "graded": sign if grade is not None else 0,
+            "grade_sum": sign * grade if grade is not None else 0.0,
+        }
+
+    def _increments(self, values: dict) -> dict:
+        return {
+            "enrolled_count": CourseEnrollmentStats.enrolled_count + values.get("enrolled", 0),
+            "completed_count": CourseEnrollmentStats.completed_count + values.get("completed", 0),
+            "graded_count": CourseEnrollmentStats.graded_count + values.get("graded", 0),
+            "grade_sum": CourseEnrollmentStats.grade_sum + values.get("grade_sum", 0.0),
+        }
+
+    def apply(self, course_id: int, enrolled: int = 0, completed: int = 0, graded: int = 0, grade_sum: float = 0.0) -> None:
+        # Atualização incremental na transação corrente; deve ser chamada antes de gravar a matrícula
+        if course_id is None:
+            return
+        values = {"enrolled": enrolled, "completed": completed, "graded": graded, "grade_sum": grade_sum}
+        increment = (
+            update(CourseEnrollmentStats)
+            .where(CourseEnrollmentStats.course_id == course_id)
+            .values(**self._increments(values))
+        )
+        if self.db.execute(increment).rowcount == 0 and self._ensure_row(course_id):
+            self.db.execute(increment)
+
+    def create_empty(self, course_ids: Iterable[int]) -> None:
+        # Curso novo nasce com o resumo zerado: a primeira matrícula já encontra a linha para travar
+        rows = [
+            {"course_id": course_id, "enrolled_count": 0, "completed_count": 0, "graded_count": 0, "grade_sum": 0.0}
+            for course_id in sorted(set(course_ids))
+        ]
+        if rows:
+            self.db.execute(insert(CourseEnrollmentStats), rows)
+
+    def _ensure_row(self, course_id: int) -> bool:
+        # Curso ainda sem resumo (anterior ao último rebuild): materializa a partir das matrículas já gravadas.
+        # False se o curso não existe
+        if self._row_exists(course_id):
+            return True
+        try:
+            # Savepoint: se outra transação materializar o mesmo curso ao mesmo tempo, só esta inserção é desfeita
+            with self.db.begin_nested():
+                self._insert_aggregates(Course.id == course_id)
+        except IntegrityError:
+            pass
+        return self._row_exists(course_id)
+
+    def _row_exists(self, course_id: int) -> bool:
+        return self.db.query(CourseEnrollmentStats.course_id).filter(CourseEnrollmentStats.course_id == course_id).first() is not None
+
+    def recompute(self, course_ids: Iterable[int]) -> None:
+        course_ids = sorted(set(course_id for course_id in course_ids if course_id is not None))
+        if not course_ids:
+            return
+        self.db.execute(delete(CourseEnrollmentStats).where(CourseEnrollmentStats.course_id.in_(course_ids)))
+        self._insert_aggregates(Course.id.in_(course_ids))
+        self.versions.bump(CourseEnrollmentStats.__tablename__)
+
+    def rebuild(self) -> int:
+        # Reconstrução completa (reparo): um INSERT ... SELECT agregando todas as matrículas
+        self.db.execute(delete(CourseEnrollmentStats))
+        self._insert_aggregates()
+        self.versions.bump(CourseEnrollmentStats.__tablename__)
+        return self.db.query(func.count(CourseEnrollmentStats.course_id)).scalar()
+
+    def _insert_aggregates(self, *criteria) -> None:
+        aggregates = (
+            select(
+                Course.id,
+                func.count(Enrollment.id),
+                func.count(Enrollment.completion_date),
+                func.count(Enrollment.grade),
+                func.coalesce(func.sum(Enrollment.grade), 0.0),
+            )
+            .select_from(Course)
+            .outerjoin(Enrollment, Enrollment.course_id == Course.id)
+            .where(*criteria)
+            .group_by(Course.id)
+        )
+        self.db.execute(
+            insert(CourseEnrollmentStats).from_select(
+                ["course_id", "enrolled_count", "completed_count", "graded_count", "grade_sum"],
+                aggregates,
+            )
+        )
@@ -1,6 +1,9 @@
 from app.db.models.course import Course
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.db.bulk import bulk_create
+from app.db.unit_of_work import on_commit
+from app.utils.cache import entity_cache
 
 class CourseRepository:
     def __init__(self, db: Session):
@@ -15,24 +18,32 @@ class CourseRepository:
     def create(self, course_data: dict) -> Course:
         course = Course(**course_data)
         self.db.add(course)
-        self.db.commit()
-        self.db.refresh(course)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "courses", course.id)
         return course
 
+    def create_many(self, courses_data: List[dict]) -> Tuple[List[Course], List[dict]]:
+        return bulk_create(self.db, Course, courses_data)
+
     def update(self, course_id: int, course_data: dict) -> Optional[Course]:
         course = self.get_by_id(course_id)
         if not course:
             return None
         for key, value in course_data.items():
             setattr(course, key, value)
-        self.db.commit()
-        self.db.refresh(course)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "courses", course.id)
         return course
 
     def delete(self, course_id: int) -> bool:
         course = self.get_by_id(course_id)
         if not course:
             return False
+        # O ORM anula as chaves estrangeiras dos filhos carregados; os registros em cache também mudam
+        dependents = [("enrollments", enr.id) for enr in course.enrollments]
         self.db.delete(course)
-        self.db.commit()
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "courses", course_id)
+        for namespace, key in dependents:
+            on_commit(self.db, entity_cache.invalidate, namespace, key)
         return True
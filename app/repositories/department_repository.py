@@ -1,6 +1,9 @@
 from app.db.models.department import Department
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.db.bulk import bulk_create
+from app.db.unit_of_work import on_commit
+from app.utils.cache import entity_cache
 
 class DepartmentRepository:
     def __init__(self, db: Session):
@@ -15,24 +18,34 @@ class DepartmentRepository:
     def create(self, department_data: dict) -> Department:
         department = Department(**department_data)
         self.db.add(department)
-        self.db.commit()
-        self.db.refresh(department)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "departments", department.id)
         return department
 
+    def create_many(self, departments_data: List[dict]) -> Tuple[List[Department], List[dict]]:
+        return bulk_create(self.db, Department, departments_data)
+
     def update(self, department_id: int, department_data: dict) -> Optional[Department]:
         department = self.get_by_id(department_id)
         if not department:
             return None
         for key, value in department_data.items():
             setattr(department, key, value)
-        self.db.commit()
-        self.db.refresh(department)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "departments", department.id)
         return department
 
     def delete(self, department_id: int) -> bool:
         department = self.get_by_id(department_id)
         if not department:
             return False
+        # O ORM anula as chaves estrangeiras dos filhos carregados; os registros em cache também mudam
+        dependents = [("courses", course.id) for course in department.courses] + [
+            ("professors", prof.id) for prof in department.professors
+        ]
         self.db.delete(department)
-        self.db.commit()
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "departments", department_id)
+        for namespace, key in dependents:
+            on_commit(self.db, entity_cache.invalidate, namespace, key)
         return True
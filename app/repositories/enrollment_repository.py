@@ -1,6 +1,9 @@
 from app.db.models.enrollment import Enrollment
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.db.bulk import bulk_create
+from app.db.unit_of_work import on_commit
+from app.utils.cache import entity_cache
 
 class EnrollmentRepository:
     def __init__(self, db: Session):
@@ -15,18 +18,21 @@ class EnrollmentRepository:
     def create(self, enrollment_data: dict) -> Enrollment:
         enrollment = Enrollment(**enrollment_data)
         self.db.add(enrollment)
-        self.db.commit()
-        self.db.refresh(enrollment)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "enrollments", enrollment.id)
         return enrollment
 
+    def create_many(self, enrollments_data: List[dict]) -> Tuple[List[Enrollment], List[dict]]:
+        return bulk_create(self.db, Enrollment, enrollments_data)
+
     def update(self, enrollment_id: int, enrollment_data: dict) -> Optional[Enrollment]:
         enrollment = self.get_by_id(enrollment_id)
         if not enrollment:
             return None
         for key, value in enrollment_data.items():
             setattr(enrollment, key, value)
-        self.db.commit()
-        self.db.refresh(enrollment)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "enrollments", enrollment.id)
         return enrollment
 
     def delete(self, enrollment_id: int) -> bool:
@@ -34,5 +40,6 @@ class EnrollmentRepository:
         if not enrollment:
             return False
         self.db.delete(enrollment)
-        self.db.commit()
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "enrollments", enrollment_id)
         return True
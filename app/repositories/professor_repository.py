@@ -1,6 +1,9 @@
 from app.db.models.professor import Professor
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.db.bulk import bulk_create
+from app.db.unit_of_work import on_commit
+from app.utils.cache import entity_cache
 
 class ProfessorRepository:
     def __init__(self, db: Session):
@@ -15,18 +18,21 @@ class ProfessorRepository:
     def create(self, professor_data: dict) -> Professor:
         professor = Professor(**professor_data)
         self.db.add(professor)
-        self.db.commit()
-        self.db.refresh(professor)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "professors", professor.id)
         return professor
 
+    def create_many(self, professors_data: List[dict]) -> Tuple[List[Professor], List[dict]]:
+        return bulk_create(self.db, Professor, professors_data)
+
     def update(self, professor_id: int, professor_data: dict) -> Optional[Professor]:
         professor = self.get_by_id(professor_id)
         if not professor:
             return None
         for key, value in professor_data.items():
             setattr(professor, key, value)
-        self.db.commit()
-        self.db.refresh(professor)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "professors", professor.id)
         return professor
 
     def delete(self, professor_id: int) -> bool:
@@ -34,5 +40,6 @@ class ProfessorRepository:
         if not professor:
             return False
         self.db.delete(professor)
-        self.db.commit()
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "professors", professor_id)
         return True
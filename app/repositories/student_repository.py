@@ -1,6 +1,9 @@
 from app.db.models.student import Student
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.db.bulk import bulk_create
+from app.db.unit_of_work import on_commit
+from app.utils.cache import entity_cache
 
 class StudentRepository:
     def __init__(self, db: Session):
@@ -15,24 +18,32 @@ class StudentRepository:
     def create(self, student_data: dict) -> Student:
         student = Student(**student_data)
         self.db.add(student)
-        self.db.commit()
-        self.db.refresh(student)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "students", student.id)
         return student
 
+    def create_many(self, students_data: List[dict]) -> Tuple[List[Student], List[dict]]:
+        return bulk_create(self.db, Student, students_data)
+
     def update(self, student_id: int, student_data: dict) -> Optional[Student]:
         student = self.get_by_id(student_id)
         if not student:
             return None
         for key, value in student_data.items():
             setattr(student, key, value)
-        self.db.commit()
-        self.db.refresh(student)
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "students", student.id)
         return student
 
     def delete(self, student_id: int) -> bool:
         student = self.get_by_id(student_id)
         if not student:
             return False
+        # O ORM anula as chaves estrangeiras dos filhos carregados; os registros em cache também mudam
+        dependents = [("enrollments", enr.id) for enr in student.enrollments]
         self.db.delete(student)
-        self.db.commit()
+        self.db.flush()
+        on_commit(self.db, entity_cache.invalidate, "students", student_id)
+        for namespace, key in dependents:
+            on_commit(self.db, entity_cache.invalidate, namespace, key)
         return True
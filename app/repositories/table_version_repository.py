@@ -0,0 +1,52 @@
+from app.db.models.table_version import TableVersion
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import ScalarSelect
+from typing import Dict, Iterable, Optional
+
+class TableVersionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_versions(self, table_names: Iterable[str]) -> Dict[str, int]:
+        rows = self.db.query(TableVersion.table_name, TableVersion.version).filter(
+            TableVersion.table_name.in_(list(table_names))
+        ).all()
+        return {name: version for name, version in rows}
+
+    def get_row_count(self, table_name: str) -> Optional[int]:
+        return self.db.query(TableVersion.row_count).filter(TableVersion.table_name == table_name).scalar()
+
+    def bump(self, table_name: str, row_delta: int = 0) -> None:
+        # Incremento atômico na transação corrente (confirmado junto com a escrita);
+        # a linha é criada na primeira escrita se ainda não existir
+        values = {"version": TableVersion.version + 1}
+        if row_delta:
+            # NULL + n continua NULL: contador ainda não inicializado permanece desconhecido
+            values["row_count"] = TableVersion.row_count + row_delta
+        result = self.db.execute(
+            update(TableVersion).where(TableVersion.table_name == table_name).values(**values)
+        )
+        if result.rowcount == 0:
+            try:
+                # Savepoint: a inserção concorrente desfaz só esta tentativa, não a transação da requisição
+                with self.db.begin_nested():
+                    self.db.add(TableVersion(table_name=table_name, version=1))
+            except IntegrityError:
+                # Outra requisição criou a linha ao mesmo tempo
+                return self.bump(table_name, row_delta)
+
+    def recount(self, table_name: str, count: ScalarSelect) -> int:
+        # A contagem e a gravação numa única instrução (UPDATE ... SET row_count = (SELECT COUNT ...)): com o
+        # lock da linha, nenhum bump(row_delta=...) confirmado entre o COUNT e a gravação é sobrescrito
+        result = self.db.execute(
+            update(TableVersion).where(TableVersion.table_name == table_name).values(row_count=count)
+        )
+        if result.rowcount == 0:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(TableVersion).values(table_name=table_name, version=0, row_count=count))
+            except IntegrityError:
+                return self.recount(table_name, count)
+        return self.get_row_count(table_name)
@@ -0,0 +1,94 @@
+import os
+from typing import List
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models.course import Course
+from app.db.models.enrollment import Enrollment
+from app.services.transcript_service import PASSING_GRADE
+
+# Limite superior da escala de notas, usado nas faixas do histograma
+GRADE_MAX = float(os.getenv("GRADE_MAX", "10"))
+PERCENTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+# Coluna de agrupamento e nome da chave na resposta
+GROUP_COLUMNS = {
+    "course": (Enrollment.course_id, "course_id"),
+    "department": (Course.department_id, "department_id"),
+    "year": (Course.year, "year"),
+}
+
+
+class GradeAnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_columns(self, group_by: str):
+        # Apenas duas colunas das matrículas com nota, convertidas direto em arrays (sem objetos ORM)
+        column, _ = GROUP_COLUMNS[group_by]
+        rows = self.db.execute(
+            select(Enrollment.grade, column)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Enrollment.grade.isnot(None))
+        ).all()
+        grades = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+        # Departamento é opcional: -1 representa "sem departamento"
+        keys = np.fromiter((-1 if row[1] is None else row[1] for row in rows), dtype=np.int64, count=len(rows))
+        return grades, keys
+
+    def grade_stats(self, group_by: str, bins: int = 10) -> dict:
+        grades, keys = self.load_columns(group_by)
+        edges = np.linspace(0.0, GRADE_MAX, bins + 1)
+        return {
+            "group_by": group_by,
+            "passing_grade": PASSING_GRADE,
+            "bin_edges": edges.round(4).tolist(),
+            "groups": grouped_stats(grades, keys, GROUP_COLUMNS[group_by][1], bins) if grades.size else [],
+        }
+
+
+def grouped_stats(grades: np.ndarray, keys: np.ndarray, key_name: str, bins: int) -> List[dict]:
+    # Todas as estatísticas por grupo em operações vetorizadas: somas com bincount e percentis
+    # por posição num único sort (grupo, nota), sem laço Python por matrícula
+    group_keys, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=grades)
+    squares = np.bincount(inverse, weights=grades * grades)
+    passed = np.bincount(inverse, weights=(grades >= PASSING_GRADE).astype(np.float64))
+    means = sums / counts
+    stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+
+    # Ordem (grupo, nota) por uma única chave grupo * amplitude + nota: o argsort de uma chave é bem mais
+    # rápido que o lexsort de duas, e só os valores ordenados importam (a ordem entre notas iguais é indiferente)
+    low = grades.min()
+    span = float(grades.max() - low) + 1.0
+    sorted_grades = grades[np.argsort(inverse * span + (grades - low))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    percentiles = {}
+    for name, q in PERCENTILES.items():
+        # Interpolação linear entre as posições vizinhas (mesmo critério de np.percentile)
+        position = starts + q * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        percentiles[name] = sorted_grades[lower] * (1 - fraction) + sorted_grades[upper] * fraction
+
+    bin_index = np.clip((grades / GRADE_MAX * bins).astype(np.int64), 0, bins - 1)
+    histograms = np.bincount(inverse * bins + bin_index, minlength=group_keys.size * bins).reshape(group_keys.size, bins)
+
+    return [
+        {
+            key_name: None if key == -1 else int(key),
+            "count": int(counts[i]),
+            "mean": round(float(means[i]), 4),
+            "std": round(float(stds[i]), 4),
+            "min": float(sorted_grades[starts[i]]),
+            "max": float(sorted_grades[starts[i] + counts[i] - 1]),
+            **{name: round(float(values[i]), 4) for name, values in percentiles.items()},
+            "pass_rate": round(float(passed[i] / counts[i]), 4),
+            "histogram": histograms[i].tolist(),
+        }
+        for i, key in enumerate(group_keys)
+    ]
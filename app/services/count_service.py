@@ -0,0 +1,76 @@
+from typing import Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repositories.async_table_version_repository import AsyncTableVersionRepository
+from app.repositories.table_version_repository import TableVersionRepository
+
+# Estimativa do InnoDB (não exata, mas sem varrer a tabela)
+ESTIMATE_SQL = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+)
+
+
+def exact_count(model):
+    # COUNT(id) direto na tabela, sem o subselect de Query.count(), gravado no contador na mesma instrução
+    return select(func.count(model.id)).scalar_subquery()
+
+
+class CountService:
+    """Contagens para os endpoints /count.
+
+    Por padrão usa o contador mantido em table_versions pelos services (create/delete), lido em O(1).
+    ``exact`` executa ``SELECT COUNT(id)`` e recalibra o contador; ``approximate`` usa as estatísticas
+    da tabela no information_schema do MySQL (nos demais bancos cai no contador mantido).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.versions = TableVersionRepository(db)
+
+    def count(self, model, exact: bool = False, approximate: bool = False) -> dict:
+        table_name = model.__tablename__
+        if approximate and not exact:
+            estimate = self._estimate(table_name)
+            if estimate is not None:
+                return {"quantidade": estimate, "origem": "estimativa"}
+        if not exact:
+            maintained = self.versions.get_row_count(table_name)
+            if maintained is not None:
+                return {"quantidade": maintained, "origem": "contador"}
+        quantidade = self.versions.recount(table_name, exact_count(model))
+        return {"quantidade": quantidade, "origem": "exato"}
+
+    def _estimate(self, table_name: str) -> Optional[int]:
+        if self.db.get_bind().dialect.name != "mysql":
+            return None
+        return self.db.execute(ESTIMATE_SQL, {"table_name": table_name}).scalar()
+
+
+class AsyncCountService:
+    # CountService para as rotas do modo async (DB_MODE=async): mesmas regras, consultas pela AsyncSession
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.versions = AsyncTableVersionRepository(db)
+
+    async def count(self, model, exact: bool = False, approximate: bool = False) -> dict:
+        table_name = model.__tablename__
+        if approximate and not exact:
+            estimate = await self._estimate(table_name)
+            if estimate is not None:
+                return {"quantidade": estimate, "origem": "estimativa"}
+        if not exact:
+            maintained = await self.versions.get_row_count(table_name)
+            if maintained is not None:
+                return {"quantidade": maintained, "origem": "contador"}
+        quantidade = await self.versions.recount(table_name, exact_count(model))
+        return {"quantidade": quantidade, "origem": "exato"}
+
+    async def _estimate(self, table_name: str) -> Optional[int]:
+        if self.db.get_bind().dialect.name != "mysql":
+            return None
+        return await self.db.scalar(ESTIMATE_SQL, {"table_name": table_name})
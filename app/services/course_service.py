@@ -1,65 +1,88 @@
 from app.repositories.course_repository import CourseRepository
 from app.db.models.course import Course
+from app.services.search_service import index_document, remove_document
+from app.db.unit_of_work import on_commit
+from app.services.prerequisite_service import PrerequisiteService
+from app.repositories.table_version_repository import TableVersionRepository
+from app.repositories.course_enrollment_stats_repository import CourseEnrollmentStatsRepository
+from app.utils.cache import entity_cache
 from app.utils.logger import logger
 from typing import List
 
 class CourseService:
     def __init__(self, repository: CourseRepository):
         self.repository = repository
+        self.versions = TableVersionRepository(repository.db)
+        self.stats = CourseEnrollmentStatsRepository(repository.db)
 
     def list_all(self) -> List[dict]:
         logger.info("Listando todos os cursos")
         return [self._to_dict(course) for course in self.repository.list_all()]
 
     def get_by_id(self, course_id: int) -> dict:
-        logger.info(f"Buscando curso por id: {course_id}")
+        logger.info("Buscando curso por id: %s", course_id)
+        cached = entity_cache.get("courses", course_id)
+        if cached is not None:
+            return cached
         course = self.repository.get_by_id(course_id)
         if not course:
-            logger.warning(f"Curso não encontrado: {course_id}")
+            logger.warning("Curso não encontrado: %s", course_id)
             raise Exception("Course not found")
-        return self._to_dict(course)
+        data = self._to_dict(course)
+        entity_cache.set("courses", course_id, data)
+        return data
 
     def create(self, course_data: dict) -> dict:
         try:
+            self.versions.bump(Course.__tablename__, row_delta=1)
             course = self.repository.create(course_data)
-            logger.info(f"Curso criado: {course.id} - {course.title}")
+            self.stats.create_empty([course.id])
+            on_commit(self.repository.db, index_document, Course, course)
+            logger.info("Curso criado: %s - %s", course.id, course.title)
             return self._to_dict(course)
         except Exception as e:
-            logger.error(f"Erro ao criar curso: {e}")
+            logger.error("Erro ao criar curso: %s", e)
             raise
 
-    def create_many(self, courses_data: List[dict]) -> List[dict]:
-        created = []
-        for data in courses_data:
-            try:
-                course = self.repository.create(data)
-                logger.info(f"Curso criado (lote): {course.id} - {course.title}")
-                created.append(self._to_dict(course))
-            except Exception as e:
-                logger.error(f"Erro ao criar curso em lote: {e}")
-        logger.info(f"Lote de cursos criado. Total: {len(created)}")
-        return created
+    def create_many(self, courses_data: List[dict]) -> dict:
+        created, errors = self.repository.create_many(courses_data)
+        self.stats.create_empty(course.id for course in created)
+        for course in created:
+            on_commit(self.repository.db, index_document, Course, course)
+        for error in errors:
+            logger.error("Erro ao criar curso em lote (linha %s): %s", error['index'], error['error'])
+        if created:
+            self.versions.bump(Course.__tablename__, row_delta=len(created))
+        logger.info("Lote de cursos criado. Total: %s, falhas: %s", len(created), len(errors))
+        return {"created": [self._to_dict(course) for course in created], "errors": errors}
 
     def update(self, course_id: int, course_data: dict) -> dict:
         try:
+            # O bump trava a linha de courses em table_versions antes da verificação: PUTs concorrentes
+            # (A->B e B->A) se serializam e a CTE do segundo já enxerga o pré-requisito gravado pelo primeiro
+            self.versions.bump(Course.__tablename__)
+            PrerequisiteService(self.repository.db).ensure_acyclic(course_id, course_data.get("prerequisites"))
             course = self.repository.update(course_id, course_data)
             if not course:
-                logger.warning(f"Tentativa de atualizar curso inexistente: {course_id}")
+                logger.warning("Tentativa de atualizar curso inexistente: %s", course_id)
                 raise Exception("Course not found")
-            logger.info(f"Curso atualizado: {course.id} - {course.title}")
+            on_commit(self.repository.db, index_document, Course, course)
+            logger.info("Curso atualizado: %s - %s", course.id, course.title)
             return self._to_dict(course)
         except Exception as e:
-            logger.error(f"Erro ao atualizar curso {course_id}: {e}")
+            logger.error("Erro ao atualizar curso %s: %s", course_id, e)
             raise
 
     def delete(self, course_id: int) -> None:
         try:
+            self.versions.bump(Course.__tablename__, row_delta=-1)
             if not self.repository.delete(course_id):
-                logger.warning(f"Tentativa de deletar curso inexistente: {course_id}")
+                logger.warning("Tentativa de deletar curso inexistente: %s", course_id)
                 raise Exception("Course not found")
-            logger.info(f"Curso deletado: {course_id}")
+            on_commit(self.repository.db, remove_document, Course, course_id)
+            logger.info("Curso deletado: %s", course_id)
         except Exception as e:
-            logger.error(f"Erro ao deletar curso {course_id}: {e}")
+            logger.error("Erro ao deletar curso %s: %s", course_id, e)
             raise
 
     def _to_dict(self, course: Course) -> dict:
@@ -1,65 +1,80 @@
 from app.repositories.department_repository import DepartmentRepository
 from app.db.models.department import Department
+from app.services.search_service import index_document, remove_document
+from app.db.unit_of_work import on_commit
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.cache import entity_cache
 from app.utils.logger import logger
 from typing import List
 
 class DepartmentService:
     def __init__(self, repository: DepartmentRepository):
         self.repository = repository
+        self.versions = TableVersionRepository(repository.db)
 
     def list_all(self) -> List[dict]:
         logger.info("Listando todos os departamentos")
         return [self._to_dict(dep) for dep in self.repository.list_all()]
 
     def get_by_id(self, department_id: int) -> dict:
-        logger.info(f"Buscando departamento por id: {department_id}")
+        logger.info("Buscando departamento por id: %s", department_id)
+        cached = entity_cache.get("departments", department_id)
+        if cached is not None:
+            return cached
         dep = self.repository.get_by_id(department_id)
         if not dep:
-            logger.warning(f"Departamento não encontrado: {department_id}")
+            logger.warning("Departamento não encontrado: %s", department_id)
             raise Exception("Department not found")
-        return self._to_dict(dep)
+        data = self._to_dict(dep)
+        entity_cache.set("departments", department_id, data)
+        return data
 
     def create(self, department_data: dict) -> dict:
         try:
+            self.versions.bump(Department.__tablename__, row_delta=1)
             dep = self.repository.create(department_data)
-            logger.info(f"Departamento criado: {dep.id} - {dep.name}")
+            on_commit(self.repository.db, index_document, Department, dep)
+            logger.info("Departamento criado: %s - %s", dep.id, dep.name)
             return self._to_dict(dep)
         except Exception as e:
-            logger.error(f"Erro ao criar departamento: {e}")
+            logger.error("Erro ao criar departamento: %s", e)
             raise
 
-    def create_many(self, departments_data: List[dict]) -> List[dict]:
-        created = []
-        for data in departments_data:
-            try:
-                dep = self.repository.create(data)
-                logger.info(f"Departamento criado (lote): {dep.id} - {dep.name}")
-                created.append(self._to_dict(dep))
-            except Exception as e:
-                logger.error(f"Erro ao criar departamento em lote: {e}")
-        logger.info(f"Lote de departamentos criado. Total: {len(created)}")
-        return created
+    def create_many(self, departments_data: List[dict]) -> dict:
+        created, errors = self.repository.create_many(departments_data)
+        for dep in created:
+            on_commit(self.repository.db, index_document, Department, dep)
+        for error in errors:
+            logger.error("Erro ao criar departamento em lote (linha %s): %s", error['index'], error['error'])
+        if created:
+            self.versions.bump(Department.__tablename__, row_delta=len(created))
+        logger.info("Lote de departamentos criado. Total: %s, falhas: %s", len(created), len(errors))
+        return {"created": [self._to_dict(dep) for dep in created], "errors": errors}
 
     def update(self, department_id: int, department_data: dict) -> dict:
         try:
+            self.versions.bump(Department.__tablename__)
             dep = self.repository.update(department_id, department_data)
             if not dep:
-                logger.warning(f"Tentativa de atualizar departamento inexistente: {department_id}")
+                logger.warning("Tentativa de atualizar departamento inexistente: %s", department_id)
                 raise Exception("Department not found")
-            logger.info(f"Departamento atualizado: {dep.id} - {dep.name}")
+            on_commit(self.repository.db, index_document, Department, dep)
+            logger.info("Departamento atualizado: %s - %s", dep.id, dep.name)
             return self._to_dict(dep)
         except Exception as e:
-            logger.error(f"Erro ao atualizar departamento {department_id}: {e}")
+            logger.error("Erro ao atualizar departamento %s: %s", department_id, e)
             raise
 
     def delete(self, department_id: int) -> None:
         try:
+            self.versions.bump(Department.__tablename__, row_delta=-1)
             if not self.repository.delete(department_id):
-                logger.warning(f"Tentativa de deletar departamento inexistente: {department_id}")
+                logger.warning("Tentativa de deletar departamento inexistente: %s", department_id)
                 raise Exception("Department not found")
-            logger.info(f"Departamento deletado: {department_id}")
+            on_commit(self.repository.db, remove_document, Department, department_id)
+            logger.info("Departamento deletado: %s", department_id)
         except Exception as e:
-            logger.error(f"Erro ao deletar departamento {department_id}: {e}")
+            logger.error("Erro ao deletar departamento %s: %s", department_id, e)
             raise
 
     def _to_dict(self, dep: Department) -> dict:
@@ -1,73 +1,147 @@
 from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.course_enrollment_stats_repository import CourseEnrollmentStatsRepository
 from app.db.models.enrollment import Enrollment
+from app.repositories.table_version_repository import TableVersionRepository
+from app.db.retry import with_deadlock_retry
+from app.utils.cache import entity_cache
 from app.utils.logger import logger
-from typing import List
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+class CourseFullError(Exception):
+    pass
 
 class EnrollmentService:
     def __init__(self, repository: EnrollmentRepository):
         self.repository = repository
+        self.versions = TableVersionRepository(repository.db)
+        self.stats = CourseEnrollmentStatsRepository(repository.db)
 
     def list_all(self) -> List[dict]:
         logger.info("Listando todas as matrículas")
         return [self._to_dict(enr) for enr in self.repository.list_all()]
 
     def get_by_id(self, enrollment_id: int) -> dict:
-        logger.info(f"Buscando matrícula por id: {enrollment_id}")
+        logger.info("Buscando matrícula por id: %s", enrollment_id)
+        cached = entity_cache.get("enrollments", enrollment_id)
+        if cached is not None:
+            return cached
         enr = self.repository.get_by_id(enrollment_id)
         if not enr:
-            logger.warning(f"Matrícula não encontrada: {enrollment_id}")
+            logger.warning("Matrícula não encontrada: %s", enrollment_id)
             raise Exception("Enrollment not found")
-        return self._to_dict(enr)
+        data = self._to_dict(enr)
+        entity_cache.set("enrollments", enrollment_id, data)
+        return data
 
     def create(self, enrollment_data: dict) -> dict:
         try:
-            enr = self.repository.create(enrollment_data)
-            logger.info(f"Matrícula criada: {enr.id} - estudante {enr.student_id} no curso {enr.course_id}")
+            enr = with_deadlock_retry(self.repository.db, lambda: self._create(enrollment_data))
+            logger.info("Matrícula criada: %s - estudante %s no curso %s", enr.id, enr.student_id, enr.course_id)
             return self._to_dict(enr)
         except Exception as e:
-            logger.error(f"Erro ao criar matrícula: {e}")
+            logger.error("Erro ao criar matrícula: %s", e)
             raise
 
-    def create_many(self, enrollments_data: List[dict]) -> List[dict]:
-        created = []
-        for data in enrollments_data:
-            try:
-                enr = self.repository.create(data)
-                logger.info(f"Matrícula criada (lote): {enr.id} - estudante {enr.student_id} no curso {enr.course_id}")
-                created.append(self._to_dict(enr))
-            except Exception as e:
-                logger.error(f"Erro ao criar matrícula em lote: {e}")
-        logger.info(f"Lote de matrículas criado. Total: {len(created)}")
-        return created
+    def _create(self, enrollment_data: dict) -> Enrollment:
+        # Locks sempre na mesma ordem (resumo do curso, depois table_versions) para evitar deadlocks. A linha
+        # de enrollments em table_versions é compartilhada por todas as escritas: o bump vem por último, para
+        # que ela fique travada só entre a última instrução e o commit
+        if not self.stats.reserve(enrollment_data):
+            raise CourseFullError(f"Curso {enrollment_data['course_id']} sem vagas disponíveis")
+        enr = self.repository.create(enrollment_data)
+        self.versions.bump(Enrollment.__tablename__, row_delta=1)
+        return enr
+
+    def create_many(self, enrollments_data: List[dict]) -> dict:
+        # Reserva, inserção e acerto do resumo na mesma transação: um deadlock repete o lote inteiro
+        created, errors = with_deadlock_retry(self.repository.db, lambda: self._create_many(enrollments_data))
+        for error in errors:
+            logger.error("Erro ao criar matrícula em lote (linha %s): %s", error['index'], error['error'])
+        logger.info("Lote de matrículas criado. Total: %s, falhas: %s", len(created), len(errors))
+        return {"created": [self._to_dict(enr) for enr in created], "errors": errors}
+
+    def _create_many(self, enrollments_data: List[dict]) -> Tuple[List[Enrollment], List[dict]]:
+        accepted, rejected = self._reserve_seats(enrollments_data)
+        created, failed = self.repository.create_many([data for _, data in accepted])
+        failed = [{"index": accepted[error['index']][0], "error": error['error']} for error in failed]
+        self._settle_batch(created, [enrollments_data[error['index']] for error in failed])
+        return created, sorted(rejected + failed, key=lambda error: error['index'])
+
+    def _reserve_seats(self, enrollments_data: List[dict]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+        # Uma reserva por curso (em ordem de id) para o lote todo; as linhas além das vagas são rejeitadas
+        by_course = defaultdict(list)
+        for index, data in enumerate(enrollments_data):
+            by_course[data['course_id']].append(index)
+        accepted, rejected = [], []
+        for course_id in sorted(by_course):
+            indices = by_course[course_id]
+            granted = self.stats.reserve_many(course_id, len(indices))
+            accepted.extend((index, enrollments_data[index]) for index in indices[:granted])
+            rejected.extend({"index": index, "error": f"Curso {course_id} sem vagas disponíveis"} for index in indices[granted:])
+        accepted.sort(key=lambda item: item[0])
+        return accepted, rejected
+
+    def _settle_batch(self, created: List[Enrollment], failed_data: List[dict]) -> None:
+        # Vagas já reservadas: um acerto por curso com as conclusões/notas das criadas e as vagas devolvidas
+        self.stats.settle_reserved(created, failed_data)
+        if created:
+            self.versions.bump(Enrollment.__tablename__, row_delta=len(created))
 
     def update(self, enrollment_id: int, enrollment_data: dict) -> dict:
         try:
-            enr = self.repository.update(enrollment_id, enrollment_data)
+            enr = with_deadlock_retry(self.repository.db, lambda: self._update(enrollment_id, enrollment_data))
             if not enr:
-                logger.warning(f"Tentativa de atualizar matrícula inexistente: {enrollment_id}")
+                logger.warning("Tentativa de atualizar matrícula inexistente: %s", enrollment_id)
                 raise Exception("Enrollment not found")
-            logger.info(f"Matrícula atualizada: {enr.id}")
+            logger.info("Matrícula atualizada: %s", enr.id)
             return self._to_dict(enr)
         except Exception as e:
-            logger.error(f"Erro ao atualizar matrícula {enrollment_id}: {e}")
+            logger.error("Erro ao atualizar matrícula %s: %s", enrollment_id, e)
             raise
 
+    def _update(self, enrollment_id: int, enrollment_data: dict) -> Optional[Enrollment]:
+        current = self.repository.get_by_id(enrollment_id)
+        if current is None:
+            return None
+        updated = {**self._to_dict(current), **enrollment_data}
+        if updated['course_id'] != current.course_id:
+            # Troca de curso: precisa de vaga no curso novo
+            if not self.stats.reserve(updated):
+                raise CourseFullError(f"Curso {updated['course_id']} sem vagas disponíveis")
+            self.stats.remove(current)
+        else:
+            self.stats.remove(current)
+            self.stats.add(updated)
+        enr = self.repository.update(enrollment_id, enrollment_data)
+        self.versions.bump(Enrollment.__tablename__)
+        return enr
+
     def delete(self, enrollment_id: int) -> None:
         try:
-            if not self.repository.delete(enrollment_id):
-                logger.warning(f"Tentativa de deletar matrícula inexistente: {enrollment_id}")
+            if not with_deadlock_retry(self.repository.db, lambda: self._delete(enrollment_id)):
+                logger.warning("Tentativa de deletar matrícula inexistente: %s", enrollment_id)
                 raise Exception("Enrollment not found")
-            logger.info(f"Matrícula deletada: {enrollment_id}")
+            logger.info("Matrícula deletada: %s", enrollment_id)
         except Exception as e:
-            logger.error(f"Erro ao deletar matrícula {enrollment_id}: {e}")
+            logger.error("Erro ao deletar matrícula %s: %s", enrollment_id, e)
             raise
 
+    def _delete(self, enrollment_id: int) -> bool:
+        current = self.repository.get_by_id(enrollment_id)
+        if current is None:
+            return False
+        self.stats.remove(current)
+        deleted = self.repository.delete(enrollment_id)
+        self.versions.bump(Enrollment.__tablename__, row_delta=-1)
+        return deleted
+
     def _to_dict(self, enr: Enrollment) -> dict:
         return {
             "id": enr.id,
             "student_id": enr.student_id,
             "course_id": enr.course_id,
-            "enrollment_date": str(enr.enrollment_date),
+            "enrollment_date": enr.enrollment_date,
             "grade": enr.grade,
-            "completion_date": str(enr.completion_date) if enr.completion_date is not None else None,
+            "completion_date": enr.completion_date,
         }
@@ -0,0 +1,121 @@
+import csv
+import io
+import os
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models.course import Course
+from app.db.models.enrollment import Enrollment
+from app.db.models.student import Student
+from app.utils.pagination import keyset_batches
+
+# Linhas por bloco lido do banco e escrito no arquivo (um row group no Parquet)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+# Colunas da exportação de matrículas: (nome no arquivo, coluna, tipo no Parquet)
+ENROLLMENT_EXPORT_COLUMNS = [
+    ("id", Enrollment.id, "int64"),
+    ("student_id", Enrollment.student_id, "int64"),
+    ("course_id", Enrollment.course_id, "int64"),
+    ("enrollment_date", Enrollment.enrollment_date, "date32"),
+    ("grade", Enrollment.grade, "float64"),
+    ("completion_date", Enrollment.completion_date, "date32"),
+    ("student_first_name", Student.first_name, "string"),
+    ("student_last_name", Student.last_name, "string"),
+    ("student_email", Student.email, "string"),
+    ("student_enrollment_number", Student.enrollment_number, "int64"),
+    ("course_code", Course.code, "string"),
+    ("course_title", Course.title, "string"),
+    ("course_credits", Course.credits, "int64"),
+    ("course_semester", Course.semester, "string"),
+    ("course_year", Course.year, "int64"),
+]
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("A exportação em Parquet requer o pacote 'pyarrow' instalado")
+    return pyarrow
+
+
+class _ChunkSink(io.RawIOBase):
+    # Destino do ParquetWriter que acumula os bytes de cada row group até serem enviados
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+class ExportService:
+    def __init__(self, db: Session, chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def enrollment_chunks(self, student_id: Optional[int] = None, course_id: Optional[int] = None) -> Iterator[list]:
+        # SELECT com JOIN (sem objetos ORM nem lazy loads), lido em blocos por chave: cada bloco é um
+        # WHERE enrollments.id > :último ORDER BY id LIMIT n, com memória constante em qualquer driver
+        stmt = (
+            select(*(column for _, column, _ in ENROLLMENT_EXPORT_COLUMNS))
+            .outerjoin(Student, Student.id == Enrollment.student_id)
+            .outerjoin(Course, Course.id == Enrollment.course_id)
+        )
+        # Mesmos filtros de /enrollments/filter
+        if student_id:
+            stmt = stmt.where(Enrollment.student_id == student_id)
+        if course_id:
+            stmt = stmt.where(Enrollment.course_id == course_id)
+        yield from keyset_batches(lambda page: self.db.execute(page).all(), stmt, Enrollment.id, self.chunk_size)
+
+    def export_enrollments(self, file_format: str, **filters) -> Iterator[bytes]:
+        chunks = self.enrollment_chunks(**filters)
+        if file_format == "parquet":
+            return self._parquet(chunks)
+        return self._csv(chunks)
+
+    def _csv(self, chunks: Iterator[list]) -> Iterator[bytes]:
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(name for name, _, _ in ENROLLMENT_EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows(rows)
+            yield text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate()
+        if text.tell():
+            yield text.getvalue().encode("utf-8")
+
+    def _parquet(self, chunks: Iterator[list]) -> Iterator[bytes]:
+        pa = require_pyarrow()
+        schema = pa.schema([(name, getattr(pa, type_name)()) for name, _, type_name in ENROLLMENT_EXPORT_COLUMNS])
+        sink = _ChunkSink()
+        with pa.parquet.ParquetWriter(sink, schema) as writer:
+            for rows in chunks:
+                # Transpõe o bloco em colunas e grava como um row group
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+                ))
+                yield sink.drain()
+        yield sink.drain()
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import os
+import re
+import time
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.schemas.enrollment_schema import EnrollmentCreate
+from app.api.schemas.student_schema import StudentCreate
+from app.db.models.course import Course
+from app.db.models.student import Student
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.student_repository import StudentRepository
+from app.services.enrollment_service import EnrollmentService
+from app.services.student_service import StudentService
+from app.utils.logger import logger
+
+# Linhas validadas e inseridas por vez; a memória usada depende deste valor, não do tamanho do arquivo
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+# Erros detalhados no relatório (os demais só entram na contagem de falhas)
+MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+class ImportEntity:
+    def __init__(self, schema: type, build_service: Callable[[Session], object], foreign_keys: Dict[str, type]):
+        self.schema = schema
+        self.build_service = build_service
+        self.foreign_keys = foreign_keys
+
+
+IMPORT_ENTITIES = {
+    "students": ImportEntity(StudentCreate, lambda db: StudentService(StudentRepository(db)), {}),
+    "enrollments": ImportEntity(
+        EnrollmentCreate,
+        lambda db: EnrollmentService(EnrollmentRepository(db)),
+        {"student_id": Student, "course_id": Course},
+    ),
+}
+
+
+# Bytes que não são UTF-8 válido chegam como surrogates (ver text_lines)
+_UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+
+def text_lines(binary: BinaryIO) -> io.TextIOWrapper:
+    # Decodificação comum ao endpoint e ao import_data.py: UTF-8 com ou sem BOM, e bytes inválidos como
+    # surrogates para que iter_records reporte a linha como erro em vez de interromper a importação
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", errors="surrogateescape", newline="")
+
+
+def iter_records(lines: Iterable[str], file_format: str) -> Iterator[Tuple[int, object]]:
+    # (número da linha, registro); linhas malformadas (JSON, CSV ou UTF-8 inválidos) viram um ValueError
+    # com a mensagem do erro, tratado como erro da linha sem interromper a importação
+    if file_format == "csv":
+        yield from _iter_csv(lines)
+        return
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if _UNDECODABLE.search(line):
+            yield row_number, ValueError("UTF-8 inválido na linha")
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, ValueError(f"JSON inválido: {e}")
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    reader = csv.DictReader(lines)
+    row_number = 1
+    while True:
+        row_number += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # O leitor do csv continua na linha seguinte à malformada
+            yield row_number, ValueError(f"CSV inválido: {e}")
+            continue
+        if any(_UNDECODABLE.search(value) for value in row.values() if isinstance(value, str)):
+            yield row_number, ValueError("UTF-8 inválido na linha")
+            continue
+        # Colunas vazias no CSV equivalem a campos ausentes (ex.: grade ainda não lançada)
+        yield row_number, {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+
+class ImportService:
+    def __init__(self, db: Session, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def run(self, entity: str, records: Iterable[Tuple[int, object]]) -> dict:
+        spec = IMPORT_ENTITIES[entity]
+        service = spec.build_service(self.db)
+        # Ids existentes carregados uma vez: chaves estrangeiras inválidas são rejeitadas sem ir ao banco
+        known_ids = {field: self._ids(model) for field, model in spec.foreign_keys.items()}
+        report = {"entity": entity, "rows": 0, "created": 0, "failed": 0, "errors": []}
+        started = time.perf_counter()
+        chunk: List[Tuple[int, object]] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(spec, service, known_ids, chunk, report)
+                chunk = []
+        if chunk:
+            self._import_chunk(spec, service, known_ids, chunk, report)
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows"] / elapsed, 1) if elapsed else None
+        logger.info(
+            "Importação de %s concluída. Linhas: %s, criadas: %s, falhas: %s, %.3fs",
+            entity, report["rows"], report["created"], report["failed"], elapsed,
+        )
+        return report
+
+    def _ids(self, model) -> Set[int]:
+        return {id for (id,) in self.db.query(model.id)}
+
+    def _import_chunk(self, spec: ImportEntity, service, known_ids: Dict[str, Set[int]], chunk, report: dict) -> None:
+        report["rows"] += len(chunk)
+        valid_rows, valid_data, errors = [], [], []
+        for row_number, record in chunk:
+            error = None
+            if isinstance(record, ValueError):
+                error = str(record)
+            else:
+                try:
+                    data = spec.schema.model_validate(record).model_dump()
+                except ValidationError as e:
+                    error = _validation_message(e)
+                else:
+                    missing = [
+                        f"{field} {data[field]} não encontrado"
+                        for field, ids in known_ids.items() if data[field] not in ids
+                    ]
+                    error = "; ".join(missing) or None
+            if error:
+                errors.append((row_number, error))
+            else:
+                valid_rows.append(row_number)
+                valid_data.append(data)
+        if valid_data:
+            result = service.create_many(valid_data)
+            # Cada bloco é uma transação própria: arquivos grandes não mantêm uma transação (e seus locks) aberta
+            self.db.commit()
+            report["created"] += len(result["created"])
+            errors.extend((valid_rows[error["index"]], error["error"]) for error in result["errors"])
+        report["failed"] += len(errors)
+        for row_number, error in sorted(errors)[:MAX_REPORTED_ERRORS - len(report["errors"])]:
+            report["errors"].append({"row": row_number, "error": error})
@@ -0,0 +1,111 @@
+import threading
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session, aliased
+
+from app.db.models.course import Course
+from app.db.models.enrollment import Enrollment
+from app.repositories.table_version_repository import TableVersionRepository
+
+# Limite de profundidade da CTE recursiva: protege contra ciclos já gravados no banco
+MAX_CHAIN_DEPTH = 1000
+
+
+class PrerequisiteCycleError(Exception):
+    pass
+
+
+class PrerequisiteGraph:
+    """Grafo curso -> pré-requisito em memória, com o fecho transitivo calculado sob demanda."""
+
+    def __init__(self, version: int, parents: Dict[int, Optional[int]]):
+        self.version = version
+        self.parents = parents
+        self.chains: Dict[int, List[int]] = {}
+        self.lock = threading.Lock()
+
+    def chain(self, course_id: int) -> List[int]:
+        # Pré-requisitos do mais próximo ao mais distante; interrompe no primeiro curso repetido (ciclo)
+        with self.lock:
+            cached = self.chains.get(course_id)
+            if cached is not None:
+                return cached
+            chain, seen = [], {course_id}
+            current = self.parents.get(course_id)
+            while current is not None and current not in seen:
+                chain.append(current)
+                seen.add(current)
+                current = self.parents.get(current)
+            self.chains[course_id] = chain
+            return chain
+
+
+_graph: Optional[PrerequisiteGraph] = None
+_graph_lock = threading.Lock()
+
+
+def _current_graph(db: Session) -> PrerequisiteGraph:
+    # Validado pela versão da tabela courses: qualquer escrita em cursos (de qualquer worker) reconstrói o grafo
+    global _graph
+    version = TableVersionRepository(db).get_versions([Course.__tablename__]).get(Course.__tablename__, 0)
+    graph = _graph
+    if graph is None or graph.version != version:
+        with _graph_lock:
+            if _graph is None or _graph.version != version:
+                _graph = PrerequisiteGraph(version, dict(db.query(Course.id, Course.prerequisites).all()))
+            graph = _graph
+    return graph
+
+
+class PrerequisiteService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def chain(self, course_id: int) -> Optional[List[int]]:
+        graph = _current_graph(self.db)
+        if course_id not in graph.parents:
+            return None
+        return graph.chain(course_id)
+
+    def chain_from_db(self, course_id: int) -> List[int]:
+        # CTE recursiva: a cadeia inteira em uma única consulta, sem um lazy load por nível
+        chain = (
+            select(Course.id, Course.prerequisites, literal(0).label("depth"))
+            .where(Course.id == course_id)
+            .cte("prerequisite_chain", recursive=True)
+        )
+        parent = aliased(Course)
+        chain = chain.union_all(
+            select(parent.id, parent.prerequisites, chain.c.depth + 1)
+            .join(chain, parent.id == chain.c.prerequisites)
+            .where(chain.c.depth < MAX_CHAIN_DEPTH)
+        )
+        rows = self.db.execute(select(chain.c.id).where(chain.c.depth > 0).order_by(chain.c.depth)).scalars()
+        return list(rows)
+
+    def ensure_acyclic(self, course_id: int, prerequisite_id: Optional[int]) -> None:
+        # Consulta o banco (não o cache) dentro da transação da escrita
+        if prerequisite_id is None:
+            return
+        if prerequisite_id == course_id or course_id in self.chain_from_db(prerequisite_id):
+            raise PrerequisiteCycleError(
+                f"Definir o curso {prerequisite_id} como pré-requisito do curso {course_id} cria um ciclo"
+            )
+
+    def eligible_course_ids(self, student_id: int) -> List[int]:
+        # Uma passada sobre as matrículas do estudante: concluídas liberam cursos, as demais são excluídas
+        completed: Set[int] = set()
+        enrolled: Set[int] = set()
+        rows = self.db.query(Enrollment.course_id, Enrollment.completion_date).filter(
+            Enrollment.student_id == student_id
+        )
+        for course_id, completion_date in rows:
+            enrolled.add(course_id)
+            if completion_date is not None:
+                completed.add(course_id)
+        graph = _current_graph(self.db)
+        return [
+            course_id for course_id in sorted(graph.parents)
+            if course_id not in enrolled and all(prereq in completed for prereq in graph.chain(course_id))
+        ]
@@ -1,65 +1,80 @@
 from app.repositories.professor_repository import ProfessorRepository
 from app.db.models.professor import Professor
+from app.services.search_service import index_document, remove_document
+from app.db.unit_of_work import on_commit
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.cache import entity_cache
 from app.utils.logger import logger
 from typing import List, Optional
 
 class ProfessorService:
     def __init__(self, repository: ProfessorRepository):
         self.repository = repository
+        self.versions = TableVersionRepository(repository.db)
 
     def list_all(self) -> List[dict]:
         logger.info("Listando todos os professores")
         return [self._to_dict(prof) for prof in self.repository.list_all()]
 
     def get_by_id(self, professor_id: int) -> dict:
-        logger.info(f"Buscando professor por id: {professor_id}")
+        logger.info("Buscando professor por id: %s", professor_id)
+        cached = entity_cache.get("professors", professor_id)
+        if cached is not None:
+            return cached
         prof = self.repository.get_by_id(professor_id)
         if not prof:
-            logger.warning(f"Professor não encontrado: {professor_id}")
+            logger.warning("Professor não encontrado: %s", professor_id)
             raise Exception("Professor not found")
-        return self._to_dict(prof)
+        data = self._to_dict(prof)
+        entity_cache.set("professors", professor_id, data)
+        return data
 
     def create(self, professor_data: dict) -> dict:
         try:
+            self.versions.bump(Professor.__tablename__, row_delta=1)
             prof = self.repository.create(professor_data)
-            logger.info(f"Professor criado: {prof.id} - {prof.first_name} {prof.last_name}")
+            on_commit(self.repository.db, index_document, Professor, prof)
+            logger.info("Professor criado: %s - %s %s", prof.id, prof.first_name, prof.last_name)
             return self._to_dict(prof)
         except Exception as e:
-            logger.error(f"Erro ao criar professor: {e}")
+            logger.error("Erro ao criar professor: %s", e)
             raise
 
-    def create_many(self, professors_data: List[dict]) -> List[dict]:
-        created = []
-        for data in professors_data:
-            try:
-                prof = self.repository.create(data)
-                logger.info(f"Professor criado (lote): {prof.id} - {prof.first_name} {prof.last_name}")
-                created.append(self._to_dict(prof))
-            except Exception as e:
-                logger.error(f"Erro ao criar professor em lote: {e}")
-        logger.info(f"Lote de professores criado. Total: {len(created)}")
-        return created
+    def create_many(self, professors_data: List[dict]) -> dict:
+        created, errors = self.repository.create_many(professors_data)
+        for prof in created:
+            on_commit(self.repository.db, index_document, Professor, prof)
+        for error in errors:
+            logger.error("Erro ao criar professor em lote (linha %s): %s", error['index'], error['error'])
+        if created:
+            self.versions.bump(Professor.__tablename__, row_delta=len(created))
+        logger.info("Lote de professores criado. Total: %s, falhas: %s", len(created), len(errors))
+        return {"created": [self._to_dict(prof) for prof in created], "errors": errors}
 
     def update(self, professor_id: int, professor_data: dict) -> dict:
         try:
+            self.versions.bump(Professor.__tablename__)
             prof = self.repository.update(professor_id, professor_data)
             if not prof:
-                logger.warning(f"Tentativa de atualizar professor inexistente: {professor_id}")
+                logger.warning("Tentativa de atualizar professor inexistente: %s", professor_id)
                 raise Exception("Professor not found")
-            logger.info(f"Professor atualizado: {prof.id} - {prof.first_name} {prof.last_name}")
+            on_commit(self.repository.db, index_document, Professor, prof)
+            logger.info("Professor atualizado: %s - %s %s", prof.id, prof.first_name, prof.last_name)
             return self._to_dict(prof)
         except Exception as e:
-            logger.error(f"Erro ao atualizar professor {professor_id}: {e}")
+            logger.error("Erro ao atualizar professor %s: %s", professor_id, e)
             raise
 
     def delete(self, professor_id: int) -> None:
         try:
+            self.versions.bump(Professor.__tablename__, row_delta=-1)
             if not self.repository.delete(professor_id):
-                logger.warning(f"Tentativa de deletar professor inexistente: {professor_id}")
+                logger.warning("Tentativa de deletar professor inexistente: %s", professor_id)
                 raise Exception("Professor not found")
-            logger.info(f"Professor deletado: {professor_id}")
+            on_commit(self.repository.db, remove_document, Professor, professor_id)
+            logger.info("Professor deletado: %s", professor_id)
         except Exception as e:
-            logger.error(f"Erro ao deletar professor {professor_id}: {e}")
+            logger.error("Erro ao deletar professor %s: %s", professor_id, e)
             raise
 
     def _to_dict(self, prof: Professor) -> dict:
@@ -68,7 +83,7 @@ class ProfessorService:
             "first_name": prof.first_name,
             "last_name": prof.last_name,
             "email": prof.email,
-            "hire_date": str(prof.hire_date),
+            "hire_date": prof.hire_date,
             "department_id": prof.department_id,
             "title": prof.title,
         }
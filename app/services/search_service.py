@@ -0,0 +1,210 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.db.models.course import Course
+from app.db.models.department import Department
+from app.db.models.professor import Professor
+from app.db.models.student import Student
+
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 200
+
+# Colunas pesquisáveis por entidade (mesma ordem dos índices FULLTEXT da migração)
+SEARCH_FIELDS = {
+    Student: ("first_name", "last_name", "email", "major"),
+    Professor: ("first_name", "last_name", "title"),
+    Course: ("title", "description"),
+    Department: ("name", "description"),
+}
+
+
+def _trigrams(value: str) -> Set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def _terms(q: str) -> List[str]:
+    # Mesma divisão em palavras da busca FULLTEXT; sem nenhuma palavra, o texto inteiro é o termo
+    q = q.lower().strip()
+    return re.findall(r"\w+", q) or [q]
+
+
+class TrigramIndex:
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.documents: Dict[int, Tuple[str, ...]] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.lock = threading.Lock()
+        # Carga inicial: ids gravados (index_document/remove_document) enquanto a tabela é lida
+        self.touched: Optional[Set[int]] = set()
+        self.loaded = False
+        self.ready = threading.Event()
+
+    def load(self, objects: Iterable) -> None:
+        # As escritas confirmadas durante a carga já estão no índice e são mais novas que as linhas lidas
+        for obj in objects:
+            with self.lock:
+                if obj.id not in self.touched:
+                    self._upsert(obj)
+        with self.lock:
+            self.touched = None
+            self.loaded = True
+
+    def upsert(self, obj) -> None:
+        with self.lock:
+            self._touch(obj.id)
+            self._upsert(obj)
+
+    def remove(self, doc_id: int) -> None:
+        with self.lock:
+            self._touch(doc_id)
+            self._remove(doc_id)
+
+    def _touch(self, doc_id: int) -> None:
+        if self.touched is not None:
+            self.touched.add(doc_id)
+
+    def _upsert(self, obj) -> None:
+        values = tuple((getattr(obj, field) or "").lower() for field in self.fields)
+        self._remove(obj.id)
+        self.documents[obj.id] = values
+        for value in values:
+            for gram in _trigrams(value):
+                self.postings[gram].add(obj.id)
+
+    def _remove(self, doc_id: int) -> None:
+        values = self.documents.pop(doc_id, None)
+        if values is None:
+            return
+        for value in values:
+            for gram in _trigrams(value):
+                self.postings[gram].discard(doc_id)
+
+    def search(self, q: str, limit: int) -> List[Tuple[int, float]]:
+        terms = _terms(q)
+        with self.lock:
+            # Todo termo precisa aparecer em algum campo: interseção das listas de postagem dos trigramas
+            # de todos os termos, começando pela menor (termos com menos de 3 letras só entram no _score)
+            grams = set().union(*(_trigrams(term) for term in terms))
+            if grams:
+                posting_lists = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+                candidates = set(posting_lists[0]).intersection(*posting_lists[1:])
+            else:
+                candidates = set(self.documents)
+            scored = []
+            for doc_id in candidates:
+                score = self._score(terms, self.documents[doc_id])
+                if score > 0:
+                    scored.append((doc_id, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    @staticmethod
+    def _score(terms: List[str], values: Tuple[str, ...]) -> float:
+        # Soma da relevância de cada termo; zero se algum termo não aparece em nenhum campo
+        total = 0.0
+        for term in terms:
+            score = TrigramIndex._term_score(term, values)
+            if not score:
+                return 0.0
+            total += score
+        return round(total, 4)
+
+    @staticmethod
+    def _term_score(term: str, values: Tuple[str, ...]) -> float:
+        # Relevância: campo igual ao termo > começa com o termo > contém o termo; campos curtos pesam mais
+        best, matches = 0.0, 0
+        for value in values:
+            if term not in value:
+                continue
+            matches += 1
+            score = len(term) / len(value)
+            if value.startswith(term):
+                score += 1.0
+            best = max(best, score)
+        return best + 0.1 * (matches - 1) if matches else 0.0
+
+
+_indexes: Dict[type, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(db: Session, model) -> TrigramIndex:
+    with _indexes_lock:
+        index = _indexes.get(model)
+        building = index is None
+        if building:
+            # Registrado antes da leitura da tabela: escritas confirmadas durante a carga chegam ao índice
+            # por index_document/remove_document em vez de se perderem
+            index = _indexes[model] = TrigramIndex(SEARCH_FIELDS[model])
+    if building:
+        try:
+            index.load(db.query(model).yield_per(1000))
+        finally:
+            if not index.loaded:
+                with _indexes_lock:
+                    _indexes.pop(model, None)
+            index.ready.set()
+    # Buscas concorrentes esperam a carga terminar; se ela falhou em outra requisição, esta tenta de novo
+    index.ready.wait()
+    if not index.loaded:
+        return _get_index(db, model)
+    return index
+
+
+def index_document(model, obj) -> None:
+    # O índice em memória só existe depois da primeira busca (bancos sem FULLTEXT); os services chamam
+    # via on_commit, para que escritas desfeitas no rollback nunca apareçam nas buscas
+    index = _indexes.get(model)
+    if index is not None:
+        index.upsert(obj)
+
+
+def remove_document(model, doc_id: int) -> None:
+    index = _indexes.get(model)
+    if index is not None:
+        index.remove(doc_id)
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(self, model, q: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Tuple[object, float]]:
+        if self.db.get_bind().dialect.name == "mysql":
+            return self._fulltext_search(model, q, limit)
+        return self._trigram_search(model, q, limit)
+
+    def _fulltext_search(self, model, q: str, limit: int) -> List[Tuple[object, float]]:
+        terms = [term for term in re.findall(r"\w+", q) if len(term) >= 3]
+        if not terms:
+            # Termos menores que innodb_ft_min_token_size não entram no índice FULLTEXT
+            return self._like_search(model, q, limit)
+        columns = [getattr(model, field) for field in SEARCH_FIELDS[model]]
+        score = match(*columns, against=" ".join(f"+{term}*" for term in terms)).in_boolean_mode()
+        rows = (
+            self.db.query(model, score.label("score"))
+            .filter(score > 0)
+            .order_by(score.desc(), model.id)
+            .limit(limit)
+            .all()
+        )
+        return [(obj, float(row_score)) for obj, row_score in rows]
+
+    def _like_search(self, model, q: str, limit: int) -> List[Tuple[object, float]]:
+        columns = [getattr(model, field) for field in SEARCH_FIELDS[model]]
+        condition = columns[0].ilike(f"%{q}%")
+        for column in columns[1:]:
+            condition = condition | column.ilike(f"%{q}%")
+        return [(obj, 1.0) for obj in self.db.query(model).filter(condition).order_by(model.id).limit(limit).all()]
+
+    def _trigram_search(self, model, q: str, limit: int) -> List[Tuple[object, float]]:
+        hits = _get_index(self.db, model).search(q, limit)
+        if not hits:
+            return []
+        objects = {obj.id: obj for obj in self.db.query(model).filter(model.id.in_([doc_id for doc_id, _ in hits]))}
+        return [(objects[doc_id], score) for doc_id, score in hits if doc_id in objects]
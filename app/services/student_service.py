@@ -1,66 +1,80 @@
 from app.repositories.student_repository import StudentRepository
 from app.db.models.student import Student
+from app.services.search_service import index_document, remove_document
+from app.db.unit_of_work import on_commit
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.cache import entity_cache
 from app.utils.logger import logger
 from typing import List
 
 class StudentService:
     def __init__(self, repository: StudentRepository):
         self.repository = repository
+        self.versions = TableVersionRepository(repository.db)
 
     def list_all(self) -> List[dict]:
         logger.info("Listando todos os estudantes")
         return [self._to_dict(stu) for stu in self.repository.list_all()]
 
     def get_by_id(self, student_id: int) -> dict:
-        logger.info(f"Buscando estudante por id: {student_id}")
+        logger.info("Buscando estudante por id: %s", student_id)
+        cached = entity_cache.get("students", student_id)
+        if cached is not None:
+            return cached
         stu = self.repository.get_by_id(student_id)
         if not stu:
-            logger.warning(f"Estudante não encontrado: {student_id}")
+            logger.warning("Estudante não encontrado: %s", student_id)
             raise Exception("Student not found")
-        return self._to_dict(stu)
+        data = self._to_dict(stu)
+        entity_cache.set("students", student_id, data)
+        return data
 
     def create(self, student_data: dict) -> dict:
         try:
+            self.versions.bump(Student.__tablename__, row_delta=1)
             stu = self.repository.create(student_data)
-            logger.info(f"Estudante criado: {stu.id} - {stu.first_name} {stu.last_name}")
+            on_commit(self.repository.db, index_document, Student, stu)
+            logger.info("Estudante criado: %s - %s %s", stu.id, stu.first_name, stu.last_name)
             return self._to_dict(stu)
         except Exception as e:
-            logger.error(f"Erro ao criar estudante: {e}")
+            logger.error("Erro ao criar estudante: %s", e)
             raise
 
-    def create_many(self, students_data: List[dict]) -> List[dict]:
-        created = []
-        for data in students_data:
-            try:
-                stu = self.repository.create(data)
-                logger.info(f"Estudante criado (lote): {stu.id} - {stu.first_name} {stu.last_name}")
-                created.append(self._to_dict(stu))
-            except Exception as e:
-                logger.error(f"Erro ao criar estudante em lote: {e}")
-                # Continua para o próximo registro
-        logger.info(f"Lote de estudantes criado. Total: {len(created)}")
-        return created
+    def create_many(self, students_data: List[dict]) -> dict:
+        created, errors = self.repository.create_many(students_data)
+        for stu in created:
+            on_commit(self.repository.db, index_document, Student, stu)
+        for error in errors:
+            logger.error("Erro ao criar estudante em lote (linha %s): %s", error['index'], error['error'])
+        if created:
+            self.versions.bump(Student.__tablename__, row_delta=len(created))
+        logger.info("Lote de estudantes criado. Total: %s, falhas: %s", len(created), len(errors))
+        return {"created": [self._to_dict(stu) for stu in created], "errors": errors}
 
     def update(self, student_id: int, student_data: dict) -> dict:
         try:
+            self.versions.bump(Student.__tablename__)
             stu = self.repository.update(student_id, student_data)
             if not stu:
-                logger.warning(f"Tentativa de atualizar estudante inexistente: {student_id}")
+                logger.warning("Tentativa de atualizar estudante inexistente: %s", student_id)
                 raise Exception("Student not found")
-            logger.info(f"Estudante atualizado: {stu.id} - {stu.first_name} {stu.last_name}")
+            on_commit(self.repository.db, index_document, Student, stu)
+            logger.info("Estudante atualizado: %s - %s %s", stu.id, stu.first_name, stu.last_name)
             return self._to_dict(stu)
         except Exception as e:
-            logger.error(f"Erro ao atualizar estudante {student_id}: {e}")
+            logger.error("Erro ao atualizar estudante %s: %s", student_id, e)
             raise
 
     def delete(self, student_id: int) -> None:
         try:
+            self.versions.bump(Student.__tablename__, row_delta=-1)
             if not self.repository.delete(student_id):
-                logger.warning(f"Tentativa de deletar estudante inexistente: {student_id}")
+                logger.warning("Tentativa de deletar estudante inexistente: %s", student_id)
                 raise Exception("Student not found")
-            logger.info(f"Estudante deletado: {student_id}")
+            on_commit(self.repository.db, remove_document, Student, student_id)
+            logger.info("Estudante deletado: %s", student_id)
         except Exception as e:
-            logger.error(f"Erro ao deletar estudante {student_id}: {e}")
+            logger.error("Erro ao deletar estudante %s: %s", student_id, e)
             raise
 
     def _to_dict(self, stu: Student) -> dict:
@@ -69,8 +83,8 @@ class StudentService:
             "first_name": stu.first_name,
             "last_name": stu.last_name,
             "email": stu.email,
-            "birth_date": str(stu.birth_date),
-            "enrollment_date": str(stu.enrollment_date),
+            "birth_date": stu.birth_date,
+            "enrollment_date": stu.enrollment_date,
             "major": stu.major,
             "enrollment_number": stu.enrollment_number,
         }
@@ -0,0 +1,144 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.db.models.course import Course
+from app.db.models.enrollment import Enrollment
+from app.db.models.student import Student
+from app.repositories.table_version_repository import TableVersionRepository
+from app.utils.batch_loader import BATCH_LOAD_CHUNK_SIZE
+from app.utils.cache import CACHE_MAX_ENTRIES
+
+# Nota mínima para que os créditos da disciplina contem como obtidos
+PASSING_GRADE = float(os.getenv("PASSING_GRADE", "6.0"))
+
+# Históricos dependem das notas (enrollments) e dos créditos/semestre dos cursos (courses)
+TRANSCRIPT_TABLES = (Enrollment.__tablename__, Course.__tablename__)
+
+
+class TranscriptMemo:
+    """Históricos já calculados, válidos enquanto as versões de enrollments e courses não mudarem."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.version: Optional[Tuple[int, ...]] = None
+        self.entries: "OrderedDict[int, dict]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, version: Tuple[int, ...], student_ids: Iterable[int]) -> Dict[int, dict]:
+        with self.lock:
+            if version != self.version:
+                # Qualquer escrita em matrículas ou cursos (de qualquer worker) descarta o memo inteiro
+                self.version = version
+                self.entries.clear()
+                return {}
+            found = {}
+            for student_id in student_ids:
+                transcript = self.entries.get(student_id)
+                if transcript is not None:
+                    self.entries.move_to_end(student_id)
+                    found[student_id] = transcript
+            return found
+
+    def set_many(self, version: Tuple[int, ...], transcripts: Dict[int, dict]) -> None:
+        with self.lock:
+            if version != self.version:
+                return
+            self.entries.update(transcripts)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+_memo = TranscriptMemo(CACHE_MAX_ENTRIES)
+
+
+def _empty_transcript(student_id: int) -> dict:
+    return {
+        "student_id": student_id,
+        "gpa": None,
+        "credits_attempted": 0,
+        "credits_earned": 0,
+        "courses": 0,
+        "courses_graded": 0,
+        "terms": [],
+    }
+
+
+def _gpa(weighted_sum: float, credits: int) -> Optional[float]:
+    return round(weighted_sum / credits, 2) if credits else None
+
+
+class TranscriptService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def transcript(self, student_id: int) -> dict:
+        return self.transcripts([student_id])[student_id]
+
+    def cohort(self, year: int) -> List[dict]:
+        student_ids = [
+            student_id for (student_id,) in self.db.query(Student.id)
+            .filter(Student.enrollment_date.between(f"{year}-01-01", f"{year}-12-31"))
+            .order_by(Student.id)
+        ]
+        transcripts = self.transcripts(student_ids)
+        return [transcripts[student_id] for student_id in student_ids]
+
+    def transcripts(self, student_ids: List[int]) -> Dict[int, dict]:
+        versions = TableVersionRepository(self.db).get_versions(TRANSCRIPT_TABLES)
+        version = tuple(versions.get(table, 0) for table in TRANSCRIPT_TABLES)
+        transcripts = _memo.get_many(version, student_ids)
+        missing = [student_id for student_id in dict.fromkeys(student_ids) if student_id not in transcripts]
+        computed = {}
+        for start in range(0, len(missing), BATCH_LOAD_CHUNK_SIZE):
+            computed.update(self._compute(missing[start:start + BATCH_LOAD_CHUNK_SIZE]))
+        _memo.set_many(version, computed)
+        transcripts.update(computed)
+        return transcripts
+
+    def _compute(self, student_ids: List[int]) -> Dict[int, dict]:
+        # Uma agregação por (estudante, ano, semestre) com JOIN em courses; os totais somam os períodos.
+        # Créditos cursados e a média ponderada consideram apenas disciplinas com nota lançada
+        graded_credits = case((Enrollment.grade.isnot(None), Course.credits), else_=0)
+        earned_credits = case((Enrollment.grade >= PASSING_GRADE, Course.credits), else_=0)
+        rows = (
+            self.db.query(
+                Enrollment.student_id,
+                Course.year,
+                Course.semester,
+                func.count(Enrollment.id).label("courses"),
+                func.count(Enrollment.grade).label("courses_graded"),
+                func.coalesce(func.sum(Enrollment.grade * Course.credits), 0.0).label("weighted_sum"),
+                func.coalesce(func.sum(graded_credits), 0).label("credits_attempted"),
+                func.coalesce(func.sum(earned_credits), 0).label("credits_earned"),
+            )
+            .join(Course, Course.id == Enrollment.course_id)
+            .filter(Enrollment.student_id.in_(student_ids))
+            .group_by(Enrollment.student_id, Course.year, Course.semester)
+            .order_by(Enrollment.student_id, Course.year, Course.semester)
+        )
+        transcripts = {student_id: _empty_transcript(student_id) for student_id in student_ids}
+        weighted = dict.fromkeys(student_ids, 0.0)
+        for row in rows:
+            transcript = transcripts[row.student_id]
+            transcript["terms"].append({
+                "year": row.year,
+                "semester": row.semester,
+                "gpa": _gpa(row.weighted_sum, row.credits_attempted),
+                "credits_attempted": row.credits_attempted,
+                "credits_earned": row.credits_earned,
+                "courses": row.courses,
+                "courses_graded": row.courses_graded,
+            })
+            weighted[row.student_id] += row.weighted_sum
+            transcript["credits_attempted"] += row.credits_attempted
+            transcript["credits_earned"] += row.credits_earned
+            transcript["courses"] += row.courses
+            transcript["courses_graded"] += row.courses_graded
+        for student_id, transcript in transcripts.items():
+            transcript["gpa"] = _gpa(weighted[student_id], transcript["credits_attempted"])
+        return transcripts
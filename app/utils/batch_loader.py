@@ -0,0 +1,84 @@
+import os
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Depends, HTTPException
+from http import HTTPStatus
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+
+# Ids por consulta WHERE id IN (...); listas maiores são divididas em várias consultas
+BATCH_LOAD_CHUNK_SIZE = int(os.getenv("BATCH_LOAD_CHUNK_SIZE", "500"))
+# Limite de ids aceitos em ?ids= numa única requisição
+MAX_IDS_PER_REQUEST = int(os.getenv("MAX_IDS_PER_REQUEST", "5000"))
+
+
+def parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    if not ids:
+        return None
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Lista de ids inválida: {ids}. Informe inteiros separados por vírgula (ex.: 1,2,3)."
+        )
+    if len(parsed) > MAX_IDS_PER_REQUEST:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Máximo de {MAX_IDS_PER_REQUEST} ids por requisição (recebidos {len(parsed)})."
+        )
+    return parsed
+
+
+class BatchLoader:
+    # Busca por id com escopo de requisição: os ids pendentes são resolvidos juntos em consultas IN
+    # e cada id é lido do banco no máximo uma vez (ids inexistentes também ficam registrados)
+    def __init__(self, db: Session, model, chunk_size: int = BATCH_LOAD_CHUNK_SIZE):
+        self.db = db
+        self.model = model
+        self.chunk_size = chunk_size
+        self.loaded: Dict[int, object] = {}
+        self.pending: Dict[int, None] = {}
+
+    def prime(self, ids: Iterable[int]) -> None:
+        for id in ids:
+            if id not in self.loaded:
+                self.pending[id] = None
+
+    def dispatch(self) -> None:
+        pending, self.pending = list(self.pending), {}
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            for obj in self.db.query(self.model).filter(self.model.id.in_(chunk)):
+                self.loaded[obj.id] = obj
+            for id in chunk:
+                self.loaded.setdefault(id, None)
+
+    def load_many(self, ids: List[int]) -> List[Optional[object]]:
+        # Mesma ordem (e repetições) dos ids pedidos; None para ids sem registro
+        self.prime(ids)
+        if self.pending:
+            self.dispatch()
+        return [self.loaded[id] for id in ids]
+
+    def load(self, id: int) -> Optional[object]:
+        return self.load_many([id])[0]
+
+
+class BatchLoaders:
+    def __init__(self, db: Session):
+        self.db = db
+        self.loaders: Dict[type, BatchLoader] = {}
+
+    def __getitem__(self, model) -> BatchLoader:
+        loader = self.loaders.get(model)
+        if loader is None:
+            loader = self.loaders[model] = BatchLoader(self.db, model)
+        return loader
+
+
+def get_loaders(db: Session = Depends(get_db)) -> BatchLoaders:
+    # O FastAPI resolve cada dependência uma vez por requisição: todas as rotas e dependências
+    # da mesma requisição compartilham os mesmos loaders (e a mesma sessão)
+    return BatchLoaders(db)
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()  # local, redis, shared-memory ou none
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def incr(self, counter: str) -> None:
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class LocalCache:
+    # LRU em memória do processo, com TTL por entrada e limite de tamanho
+    def __init__(self, max_entries: int, ttl: float, stats: CacheStats):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = stats
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                self.stats.incr("expirations")
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def size(self) -> int:
+        return len(self.entries)
+
+
+class InMemorySharedClient:
+    # Substituto local de um cliente Redis (get/set com expiração/delete) para desenvolvimento e testes
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.values.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ex: int = None) -> None:
+        with self.lock:
+            self.values[key] = (time.monotonic() + (ex or float("inf")), value)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.values.pop(key, None)
+
+    def dbsize(self) -> int:
+        return len(self.values)
+
+
+class SharedCache:
+    # Backend compartilhado entre workers; valores serializados em JSON
+    def __init__(self, client, ttl: float, prefix: str = "acad_sys:"):
+        self.client = client
+        self.ttl = max(int(ttl), 1)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def size(self) -> int:
+        return self.client.dbsize()
+
+
+class EntityCache:
+    def __init__(self, backend, stats: CacheStats):
+        self.backend = backend
+        self.stats = stats
+
+    def get(self, namespace: str, key) -> Optional[Any]:
+        if self.backend is None:
+            return None
+        value = self.backend.get(f"{namespace}:{key}")
+        self.stats.incr("hits" if value is not None else "misses")
+        return value
+
+    def set(self, namespace: str, key, value: Any) -> None:
+        if self.backend is not None:
+            self.backend.set(f"{namespace}:{key}", value)
+
+    def invalidate(self, namespace: str, key) -> None:
+        if self.backend is not None:
+            self.backend.delete(f"{namespace}:{key}")
+            self.stats.incr("invalidations")
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": CACHE_BACKEND,
+            "ttl_seconds": CACHE_TTL_SECONDS,
+            "max_entries": CACHE_MAX_ENTRIES,
+            "size": self.backend.size() if self.backend is not None else 0,
+            **self.stats.snapshot(),
+        }
+
+
+def build_entity_cache() -> EntityCache:
+    stats = CacheStats()
+    if CACHE_BACKEND == "none":
+        return EntityCache(None, stats)
+    if CACHE_BACKEND == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote 'redis' instalado")
+        return EntityCache(SharedCache(redis.Redis.from_url(REDIS_URL), CACHE_TTL_SECONDS), stats)
+    if CACHE_BACKEND == "shared-memory":
+        return EntityCache(SharedCache(InMemorySharedClient(), CACHE_TTL_SECONDS), stats)
+    return EntityCache(LocalCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, stats), stats)
+
+
+entity_cache = build_entity_cache()
+
+
+async def cached_entity(namespace: str, key, load: Callable[[], Awaitable[Any]], schema) -> Optional[dict]:
+    # GET /{id} do modo async: a mesma entrada que os services síncronos leem, gravam e invalidam nas escritas.
+    # O valor guardado é o dict do schema de leitura, com os mesmos campos do _to_dict dos services
+    cached = entity_cache.get(namespace, key)
+    if cached is not None:
+        return cached
+    obj = await load()
+    if obj is None:
+        return None
+    data = schema.model_validate(obj).model_dump()
+    entity_cache.set(namespace, key, data)
+    return data
@@ -0,0 +1,73 @@
+import hashlib
+import os
+from typing import Callable, Dict
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.repositories.async_table_version_repository import AsyncTableVersionRepository
+from app.repositories.table_version_repository import TableVersionRepository
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+def cache_control() -> str:
+    # Sem max-age o cliente revalida a cada requisição, o que com o ETag custa apenas um 304
+    if HTTP_CACHE_MAX_AGE > 0:
+        return f"private, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+    return "no-cache"
+
+
+def compute_etag(request: Request, versions: Dict[str, int]) -> str:
+    digest = hashlib.sha1()
+    digest.update(request.url.path.encode())
+    digest.update(repr(sorted(request.query_params.multi_items())).encode())
+    # /, /ordered e /with-* respondem JSON ou NDJSON conforme o Accept; o corpo gzip é outra representação
+    digest.update(request.headers.get("accept", "").encode())
+    digest.update(request.headers.get("accept-encoding", "").encode())
+    digest.update(repr(sorted(versions.items())).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: W/"x" equivale a "x"
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def conditional_get(*table_names: str) -> Callable:
+    """Dependência de router: ETag a partir das versões das tabelas lidas pelas rotas.
+
+    Quando o If-None-Match coincide, responde 304 antes de o endpoint consultar ou serializar linhas.
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+        if request.method not in CONDITIONAL_METHODS:
+            return
+        apply_etag(request, response, TableVersionRepository(db).get_versions(table_names))
+    return dependency
+
+
+def async_conditional_get(*table_names: str) -> Callable:
+    # Mesma dependência para os routers do modo async (DB_MODE=async), com a AsyncSession da requisição;
+    # importado aqui para que o modo sync não crie o engine assíncrono
+    from app.db.async_database import get_async_db
+
+    async def dependency(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)) -> None:
+        if request.method not in CONDITIONAL_METHODS:
+            return
+        apply_etag(request, response, await AsyncTableVersionRepository(db).get_versions(table_names))
+    return dependency
+
+
+def apply_etag(request: Request, response: Response, versions: Dict[str, int]) -> None:
+    headers = {"ETag": compute_etag(request, versions), "Cache-Control": cache_control()}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
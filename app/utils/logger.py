@@ -1,5 +1,11 @@
+import atexit
+import contextvars
+import json
 import logging
 import os
+import queue
+import uuid
+from logging.handlers import QueueHandler, QueueListener
 
 # Cria diretório de logs se não existir
 def ensure_log_dir():
@@ -10,17 +16,74 @@ def ensure_log_dir():
 log_dir = ensure_log_dir()
 
 LOG_FILE = os.path.join(log_dir, 'api.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()  # json ou text
+
+# Id da requisição corrente, propagado para as threads do threadpool via contextvars
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        return json.dumps(payload, ensure_ascii=False)
+
+def build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == 'text':
+        return logging.Formatter('%(asctime)s [%(levelname)s] [%(request_id)s] %(message)s')
+    return JsonFormatter()
 
 # Configuração explícita do logger nomeado
 logger = logging.getLogger('acad_sys_api')
-logger.setLevel(logging.INFO)
+logger.setLevel(LOG_LEVEL)
+logger.propagate = False
 
 # Evita adicionar múltiplos handlers em reloads
 if not logger.handlers:
+    # A thread da requisição só enfileira o registro; escrita em arquivo e console fica com o QueueListener
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+
     file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
     stream_handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    formatter = build_formatter()
     file_handler.setFormatter(formatter)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+class RequestIdMiddleware:
+    # Middleware ASGI: usa o X-Request-ID recebido (ou gera um) e o devolve na resposta
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get('headers') or [])
+        request_id = headers.get(b'x-request-id', b'').decode('latin-1') or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + [(b'x-request-id', request_id.encode('latin-1'))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,99 @@
+import base64
+import json
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from http import HTTPStatus
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Cursor de paginação inválido."
+        )
+
+
+def apply_page(query, id_column, limit: int, page: int = 1, after: Optional[str] = None):
+    # Aceita tanto Query (ORM síncrono) quanto select() (AsyncSession)
+    query = query.order_by(id_column)
+    if after:
+        # Busca por chave (WHERE id > último id) em vez de OFFSET: o custo da página não cresce com a profundidade
+        query = query.filter(id_column > decode_cursor(after))
+    else:
+        query = query.offset((page - 1) * limit)
+    return query.limit(limit)
+
+
+def next_cursor_for(rows: List, limit: int) -> Optional[str]:
+    return encode_cursor(rows[-1].id) if len(rows) == limit else None
+
+
+def paginate(query: Query, id_column, limit: int, page: int = 1, after: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    rows = apply_page(query, id_column, limit, page, after).all()
+    return rows, next_cursor_for(rows, limit)
+
+
+def keyset_batches(fetch: Callable, query, id_column, batch_size: int) -> Iterator[List]:
+    # Percorre a consulta inteira em páginas por chave (WHERE id > último id ORDER BY id LIMIT n):
+    # cada lote é uma consulta curta e independente, sem depender de cursor no servidor, que o
+    # mysqlconnector não oferece (o driver bufferiza o resultado inteiro)
+    after = None
+    while True:
+        rows = fetch(apply_page(query, id_column, batch_size, after=after))
+        if rows:
+            yield rows
+        after = next_cursor_for(rows, batch_size)
+        if after is None:
+            return
+
+
+def _after_key(order_column, id_column, last_key, last_id: int, descending: bool):
+    # Próximas linhas depois de (last_key, last_id) na ordem (coluna, id), com o id no mesmo sentido da coluna
+    # (o índice da coluna atende a ordenação sem sort). NULLs vêm primeiro em ordem crescente e por último em
+    # ordem decrescente, como no MySQL e no SQLite
+    next_id = id_column < last_id if descending else id_column > last_id
+    if last_key is None:
+        null_tail = and_(order_column.is_(None), next_id)
+        return null_tail if descending else or_(null_tail, order_column.isnot(None))
+    same_key = and_(order_column == last_key, next_id)
+    if descending:
+        return or_(order_column < last_key, same_key, order_column.is_(None))
+    return or_(order_column > last_key, same_key)
+
+
+def keyset_id_batches(
+    query: Query, id_column, batch_size: int, order_column=None, descending: bool = False
+) -> Iterator[List[int]]:
+    # query seleciona apenas o id (ex.: session.query(Model.id)); devolve os ids em lotes na ordem
+    # (order_column, id), cada lote buscado por chave a partir do último id do lote anterior
+    if order_column is None:
+        for rows in keyset_batches(lambda page: page.all(), query, id_column, batch_size):
+            yield [row.id for row in rows]
+        return
+    keys = query.add_columns(order_column.label("order_key"))
+    ordering = (order_column.desc(), id_column.desc()) if descending else (order_column, id_column)
+    last = None
+    while True:
+        page = keys if last is None else keys.filter(
+            _after_key(order_column, id_column, last.order_key, last.id, descending)
+        )
+        rows = page.order_by(*ordering).limit(batch_size).all()
+        if rows:
+            yield [row.id for row in rows]
+        if len(rows) < batch_size:
+            return
+        last = rows[-1]
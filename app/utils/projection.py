@@ -0,0 +1,36 @@
+from typing import List, Optional, Type
+
+from fastapi import HTTPException, Response
+from http import HTTPStatus
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.orm import Query
+
+from app.utils.serialization import JSON_MEDIA_TYPE
+
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Campos inválidos em fields: {', '.join(unknown) or fields}. Disponíveis: {', '.join(schema.model_fields)}."
+        )
+    return names
+
+
+def project(query: Query, model, names: List[str]) -> Query:
+    # SELECT apenas das colunas pedidas; o resultado são Rows, sem entidades no identity map
+    return query.with_entities(*(getattr(model, name) for name in names))
+
+
+def row_to_dict(row) -> dict:
+    return row._asdict()
+
+
+def projection_response(query: Query, response: Response) -> Response:
+    body = to_json([row._asdict() for row in query])
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
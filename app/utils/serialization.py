@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def model_list_response(schema: Type[BaseModel], rows: Iterable, response: Response) -> Response:
+    # Valida direto dos atributos ORM e gera o JSON no pydantic-core, sem dicts intermediários nem
+    # a segunda validação do response_model; os cabeçalhos já definidos (ETag, X-Next-Cursor) são mantidos
+    adapter = list_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
+
+
+def multi_get_response(
+    schema: Type[BaseModel], ids: List[int], rows: List[Optional[object]], response: Response,
+    names: Optional[List[str]] = None,
+) -> Response:
+    # Um item por id pedido, na mesma ordem; ids sem registro viram {"id": x, "not_found": true}
+    include = set(names) if names else None
+    items = [
+        schema.model_validate(row, from_attributes=True).model_dump(mode="json", include=include)
+        if row is not None else {"id": id, "not_found": True}
+        for id, row in zip(ids, rows)
+    ]
+    return Response(to_json(items), media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
@@ -0,0 +1,47 @@
+import json
+from typing import Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from app.db.database import SessionLocal
+from app.utils.pagination import keyset_id_batches
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    build_query: Callable[[Session], Query],
+    serialize: Callable[[object], dict],
+    id_column,
+    order_column=None,
+    descending: bool = False,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    # Lotes por chave em vez de yield_per: o mysqlconnector não tem cursor no servidor e bufferizaria
+    # a tabela inteira antes do primeiro byte. Cada lote busca os próximos ids (mesmos filtros e ordem
+    # de build_query) e depois as linhas desses ids, na mesma ordem (coluna de ordenação, id)
+    def generate():
+        # Sessão própria: a sessão da requisição (get_db) é fechada antes do corpo ser enviado
+        db = SessionLocal()
+        try:
+            keys = db.query(id_column)
+            criteria = build_query(db).whereclause
+            if criteria is not None:
+                keys = keys.filter(criteria)
+            tiebreak = id_column.desc() if order_column is not None and descending else id_column
+            for ids in keyset_id_batches(keys, id_column, batch_size, order_column, descending):
+                rows = build_query(db).filter(id_column.in_(ids)).order_by(tiebreak)
+                yield "\n".join(json.dumps(serialize(row), default=str) for row in rows) + "\n"
+                # O lote já enviado sai do identity map: a memória não cresce com a tabela
+                db.expunge_all()
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import datetime
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+import warnings
+
+# Rotas atendidas pelo modo async (/count, /paged e GET /{id}) com DB_MODE=sync (sessão síncrona no threadpool)
+# e DB_MODE=async (AsyncSession no event loop), sob --concurrency requisições simultâneas em processo (ASGI, sem rede).
+# Recria o schema do banco: roda só contra TEST_DATABASE_URL (MySQL para números representativos)
+# Uso: TEST_DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_db_mode [--requests 2000] [--concurrency 50]
+parser = argparse.ArgumentParser(description='Benchmark das rotas de leitura com DB_MODE=sync e DB_MODE=async')
+parser.add_argument('--students', type=int, default=10000)
+parser.add_argument('--requests', type=int, default=2000, help='requisições por rota e modo')
+parser.add_argument('--concurrency', type=int, default=50)
+parser.add_argument('--cache', action='store_true', help='mantém o cache de entidades (padrão: desligado, toda leitura vai ao banco)')
+args = parser.parse_args()
+
+if not os.getenv('TEST_DATABASE_URL'):
+    sys.exit('TEST_DATABASE_URL não informada: o benchmark apaga e recria as tabelas do banco')
+# O app lê as variáveis na importação: uma conexão por requisição simultânea em cada pool (síncrono e assíncrono)
+os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+os.environ.setdefault('DB_POOL_SIZE', str(args.concurrency))
+os.environ.setdefault('DB_MAX_OVERFLOW', '0')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('COMPRESSION', 'none')
+if not args.cache:
+    os.environ['CACHE_BACKEND'] = 'none'
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.exc import SAWarning
+
+import app.db.models as models
+from app.db.async_database import async_engine
+from app.db.database import SessionLocal, engine
+from app.db.models.base import Base
+from app.services.count_service import CountService
+
+
+def reset_database() -> None:
+    with warnings.catch_warnings():
+        # departments <-> professors formam um ciclo de chaves estrangeiras
+        warnings.simplefilter('ignore', SAWarning)
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.Student), [
+            {
+                'first_name': f'Estudante{i}', 'last_name': 'Souza', 'email': f'estudante{i}@example.com',
+                'birth_date': datetime.date(2000, 1, 1), 'enrollment_date': datetime.date(2020 + i % 4, 2, 1),
+                'major': 'Computação', 'enrollment_number': i,
+            }
+            for i in range(1, args.students + 1)
+        ])
+        # Contador inicializado: /count lê table_versions nos dois modos
+        CountService(db).count(models.Student, exact=True)
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app(mode: str):
+    os.environ['DB_MODE'] = mode
+    import app.main
+    return importlib.reload(app.main).app
+
+
+ROUTES = [
+    ('/students/count', lambda rnd: '/students/count'),
+    ('/students/paged', lambda rnd: f'/students/paged?limit=50&page={rnd.randint(1, args.students // 50)}'),
+    ('/students/{id}', lambda rnd: f'/students/{rnd.randint(1, args.students)}'),
+]
+
+
+async def run(asgi_app, make_path) -> tuple:
+    rnd = random.Random(42)
+    paths = [make_path(rnd) for _ in range(args.requests)]
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def request(client, path: str) -> None:
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, (path, response.status_code)
+
+    transport = httpx.ASGITransport(app=asgi_app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(request(client, path) for path in paths))
+            elapsed = time.perf_counter() - started
+    finally:
+        # As conexões assíncronas do pool ficam presas ao event loop desta execução
+        await async_engine.dispose()
+    latencies.sort()
+    return args.requests / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+reset_database()
+apps = {mode: build_app(mode) for mode in ('sync', 'async')}
+print(f'{engine.dialect.name}: {args.students} estudantes, {args.requests} requisições por rota, {args.concurrency} simultâneas, '
+      f"cache {'ligado' if args.cache else 'desligado'}")
+print(f"{'rota':<18} {'modo':<6} {'req/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+for name, make_path in ROUTES:
+    for mode, asgi_app in apps.items():
+        throughput, p50, p95 = asyncio.run(run(asgi_app, make_path))
+        print(f'{name:<18} {mode:<6} {throughput:>9.1f} {p50 * 1000:>9.1f} {p95 * 1000:>9.1f}')
@@ -0,0 +1,74 @@
+import argparse
+import math
+import time
+from collections import defaultdict
+from typing import List
+
+import numpy as np
+
+from app.services.analytics_service import GRADE_MAX, PERCENTILES, grouped_stats
+from app.services.transcript_service import PASSING_GRADE
+
+# Estatísticas de notas por grupo (/analytics/grades): grouped_stats vetorizado contra um laço Python por
+# matrícula com as mesmas fórmulas, sobre dados sintéticos (sem banco)
+# Uso: python -m benchmarks.bench_grade_analytics [--rows 1000000] [--groups 500] [--bins 10]
+parser = argparse.ArgumentParser(description='Benchmark das estatísticas de notas: NumPy vs laço Python')
+parser.add_argument('--rows', type=int, default=1_000_000)
+parser.add_argument('--groups', type=int, default=500)
+parser.add_argument('--bins', type=int, default=10)
+args = parser.parse_args()
+
+
+def naive_stats(grades: List[float], keys: List[int], bins: int) -> List[dict]:
+    by_group = defaultdict(list)
+    for grade, key in zip(grades, keys):
+        by_group[key].append(grade)
+    result = []
+    for key in sorted(by_group):
+        values = sorted(by_group[key])
+        count = len(values)
+        mean = sum(values) / count
+        histogram = [0] * bins
+        for grade in values:
+            histogram[min(max(int(grade / GRADE_MAX * bins), 0), bins - 1)] += 1
+        stats = {
+            'course_id': key,
+            'count': count,
+            'mean': round(mean, 4),
+            'std': round(math.sqrt(max(sum(grade * grade for grade in values) / count - mean * mean, 0.0)), 4),
+            'min': values[0],
+            'max': values[-1],
+        }
+        for name, q in PERCENTILES.items():
+            position = q * (count - 1)
+            lower, fraction = int(position), position - int(position)
+            upper = min(lower + 1, count - 1)
+            stats[name] = round(values[lower] * (1 - fraction) + values[upper] * fraction, 4)
+        stats['pass_rate'] = round(sum(1 for grade in values if grade >= PASSING_GRADE) / count, 4)
+        stats['histogram'] = histogram
+        result.append(stats)
+    return result
+
+
+rng = np.random.default_rng(42)
+grades = np.round(rng.uniform(0.0, GRADE_MAX, args.rows), 1)
+keys = rng.integers(1, args.groups + 1, args.rows)
+
+started = time.perf_counter()
+vectorized = grouped_stats(grades, keys, 'course_id', args.bins)
+vectorized_seconds = time.perf_counter() - started
+
+# O laço recebe listas Python, como as linhas vindas do banco sem NumPy
+grade_list, key_list = grades.tolist(), keys.tolist()
+started = time.perf_counter()
+naive = naive_stats(grade_list, key_list, args.bins)
+naive_seconds = time.perf_counter() - started
+
+for fast, slow in zip(vectorized, naive):
+    assert fast.keys() == slow.keys()
+    for name, value in fast.items():
+        assert math.isclose(value, slow[name], abs_tol=1e-3) if isinstance(value, float) else value == slow[name], (name, fast, slow)
+
+print(f'{args.rows} matrículas, {len(vectorized)} grupos, {args.bins} faixas')
+print(f'laço Python:  {naive_seconds:8.3f}s')
+print(f'NumPy:        {vectorized_seconds:8.3f}s  ({naive_seconds / vectorized_seconds:.1f}x mais rápido)')
@@ -0,0 +1,91 @@
+import argparse
+import datetime
+import json
+import time
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.schemas.course_schema import CourseRead
+from app.api.schemas.department_schema import DepartmentRead
+from app.api.schemas.enrollment_schema import EnrollmentRead
+from app.api.schemas.professor_schema import ProfessorRead
+from app.api.schemas.student_schema import StudentRead
+from app.db.models import Course, Department, Enrollment, Professor, Student
+from app.repositories.course_repository import CourseRepository
+from app.repositories.department_repository import DepartmentRepository
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.professor_repository import ProfessorRepository
+from app.repositories.student_repository import StudentRepository
+from app.services.course_service import CourseService
+from app.services.department_service import DepartmentService
+from app.services.enrollment_service import EnrollmentService
+from app.services.professor_service import ProfessorService
+from app.services.student_service import StudentService
+from app.utils.serialization import model_list_response
+
+# Custo por linha das listagens, por entidade: antes (_to_dict do service + validação do response_model +
+# json.dumps do JSONResponse) e depois (model_list_response: validação direto do ORM e JSON no pydantic-core).
+# As linhas são objetos ORM em memória: mede só a serialização, sem banco
+# Uso: python -m benchmarks.bench_row_serialization [--rows 10000] [--repeat 5]
+parser = argparse.ArgumentParser(description='Micro-benchmark do custo de serialização por linha')
+parser.add_argument('--rows', type=int, default=10000)
+parser.add_argument('--repeat', type=int, default=5)
+args = parser.parse_args()
+
+DAY = datetime.timedelta(days=1)
+
+ENTITIES = [
+    ('students', StudentRead, StudentService(StudentRepository(None)), lambda i: Student(
+        id=i, first_name=f'Estudante{i}', last_name='Souza', email=f'estudante{i}@example.com',
+        birth_date=datetime.date(2000, 1, 1) + i % 3000 * DAY, enrollment_date=datetime.date(2020, 2, 1) + i % 900 * DAY,
+        major='Computação', enrollment_number=100000 + i,
+    )),
+    ('courses', CourseRead, CourseService(CourseRepository(None)), lambda i: Course(
+        id=i, code=f'C{i}', title=f'Curso {i}', credits=4, department_id=i % 20 + 1, semester='1', year=2024,
+        description='Curso de teste', prerequisites=i - 1 if i > 1 else None, max_enrollment=60,
+    )),
+    ('departments', DepartmentRead, DepartmentService(DepartmentRepository(None)), lambda i: Department(
+        id=i, name=f'Departamento {i}', head_id=None, established_year=1950 + i % 70, description='Departamento de teste',
+        contact_email=f'departamento{i}@example.com', phone_number='(11) 5555-0000',
+    )),
+    ('professors', ProfessorRead, ProfessorService(ProfessorRepository(None)), lambda i: Professor(
+        id=i, first_name=f'Professor{i}', last_name='Silva', email=f'professor{i}@example.com',
+        hire_date=datetime.date(2010, 1, 1) + i % 4000 * DAY, department_id=i % 20 + 1, title='Doutor',
+    )),
+    ('enrollments', EnrollmentRead, EnrollmentService(EnrollmentRepository(None)), lambda i: Enrollment(
+        id=i, student_id=i % 5000 + 1, course_id=i % 300 + 1, enrollment_date=datetime.date(2024, 3, 1) + i % 120 * DAY,
+        grade=(i % 101) / 10 if i % 4 else None, completion_date=datetime.date(2024, 7, 1) if i % 3 else None,
+    )),
+]
+
+
+def before(schema, service, rows: List) -> bytes:
+    # Caminho antigo da rota: dicts do service, validação/serialização do response_model e json.dumps
+    adapter = TypeAdapter(List[schema])
+    content = adapter.dump_python(adapter.validate_python([service._to_dict(row) for row in rows]), mode='json')
+    return JSONResponse(content).body
+
+
+def after(schema, service, rows: List) -> bytes:
+    return model_list_response(schema, rows, Response()).body
+
+
+def per_row_microseconds(serialize, schema, service, rows: List) -> float:
+    best = float('inf')
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        serialize(schema, service, rows)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1e6
+
+
+print(f"{'entidade':<12} {'antes (µs/linha)':>17} {'depois (µs/linha)':>18} {'ganho':>7}")
+for name, schema, service, build in ENTITIES:
+    rows = [build(i) for i in range(1, args.rows + 1)]
+    # Os dois caminhos produzem o mesmo JSON
+    assert json.loads(before(schema, service, rows)) == json.loads(after(schema, service, rows))
+    old, new = (per_row_microseconds(serialize, schema, service, rows) for serialize in (before, after))
+    print(f'{name:<12} {old:>17.2f} {new:>18.2f} {old / new:>6.1f}x')
@@ -0,0 +1,137 @@
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Teste de carga da reserva de vagas: --attempts matrículas concorrentes num único curso com --max-enrollment vagas.
+# Confere que não há vagas a mais (enrolled_count igual às linhas de enrollments e <= max_enrollment) e mede a vazão.
+# Recria o schema do banco: roda só contra TEST_DATABASE_URL (MySQL para números representativos; o SQLite
+# serializa todas as escritas no arquivo)
+# Uso: TEST_DATABASE_URL=mysql+mysqlconnector://... python -m benchmarks.bench_seat_reservation [--attempts 500] [--workers 100]
+parser = argparse.ArgumentParser(description='Teste de carga da reserva de vagas de um curso')
+parser.add_argument('--attempts', type=int, default=500, help='matrículas concorrentes no mesmo curso')
+parser.add_argument('--workers', type=int, default=100, help='requisições simultâneas (uma sessão e conexão cada)')
+parser.add_argument('--max-enrollment', type=int, default=100)
+args = parser.parse_args()
+
+if not os.getenv('TEST_DATABASE_URL'):
+    sys.exit('TEST_DATABASE_URL não informada: o benchmark apaga e recria as tabelas do banco')
+# O app lê as variáveis na importação: pool com uma conexão por worker e sem o log de cada matrícula recusada
+os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+os.environ.setdefault('DB_POOL_SIZE', str(args.workers))
+os.environ.setdefault('DB_MAX_OVERFLOW', '0')
+os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+os.environ.setdefault('CACHE_BACKEND', 'none')
+
+from sqlalchemy import func
+from sqlalchemy.exc import SAWarning
+
+import app.db.models as models
+from app.db.database import SessionLocal, engine
+from app.db.models.base import Base
+from app.repositories.course_repository import CourseRepository
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.services.course_service import CourseService
+from app.services.enrollment_service import CourseFullError, EnrollmentService
+
+
+def reset_database() -> int:
+    with warnings.catch_warnings():
+        # departments <-> professors formam um ciclo de chaves estrangeiras
+        warnings.simplefilter('ignore', SAWarning)
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        department = models.Department(name='Departamento de carga', established_year=2000)
+        db.add(department)
+        db.flush()
+        # Pelo service: o curso nasce com a linha de resumo (course_enrollment_stats) que a reserva trava
+        course = CourseService(CourseRepository(db)).create({
+            'code': 'CARGA', 'title': 'Curso disputado', 'credits': 4, 'department_id': department.id,
+            'semester': '1', 'year': 2024, 'max_enrollment': args.max_enrollment,
+        })
+        db.add_all(
+            models.Student(
+                first_name=f'Estudante{i}', last_name='Carga', email=f'carga{i}@example.com',
+                birth_date=datetime.date(2000, 1, 1), enrollment_date=datetime.date(2024, 2, 1), enrollment_number=i,
+            )
+            for i in range(1, args.attempts + 1)
+        )
+        db.commit()
+        return course['id']
+    finally:
+        db.close()
+
+
+def enrollments_version(db) -> int:
+    row = db.get(models.TableVersion, 'enrollments')
+    return row.version if row is not None else 0
+
+
+course_id = reset_database()
+start_gate = threading.Barrier(min(args.workers, args.attempts))
+
+
+def enroll(student_id: int) -> tuple:
+    # Mesma unidade de trabalho de POST /enrollments/ (get_db): uma sessão, uma transação, commit ao fim
+    if student_id <= start_gate.parties:
+        start_gate.wait()
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        EnrollmentService(EnrollmentRepository(db)).create({
+            'student_id': student_id, 'course_id': course_id, 'enrollment_date': datetime.date(2024, 8, 1),
+        })
+        db.commit()
+        outcome = 'matriculado'
+    except CourseFullError:
+        db.rollback()
+        outcome = 'curso cheio'
+    except Exception as e:
+        db.rollback()
+        outcome = f'erro: {type(e).__name__}'
+    finally:
+        db.close()
+    return outcome, time.perf_counter() - started
+
+
+db = SessionLocal()
+version_before = enrollments_version(db)
+db.close()
+
+started = time.perf_counter()
+with ThreadPoolExecutor(args.workers) as executor:
+    results = list(executor.map(enroll, range(1, args.attempts + 1)))
+elapsed = time.perf_counter() - started
+
+outcomes = Counter(outcome for outcome, _ in results)
+latencies = sorted(latency for _, latency in results)
+db = SessionLocal()
+try:
+    stats = db.get(models.CourseEnrollmentStats, course_id)
+    stored = db.query(func.count(models.Enrollment.id)).filter(models.Enrollment.course_id == course_id).scalar()
+    version_bumps = enrollments_version(db) - version_before
+finally:
+    db.close()
+
+print(f'{engine.dialect.name}: {args.attempts} tentativas, {args.workers} simultâneas, {args.max_enrollment} vagas')
+for outcome, total in sorted(outcomes.items()):
+    print(f'  {outcome:<24} {total:>6}')
+print(f'vazão:     {args.attempts / elapsed:8.1f} req/s ({elapsed:.2f}s)')
+print(f'latência:  p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms')
+print(f'resumo:    enrolled_count={stats.enrolled_count}, linhas em enrollments={stored}')
+# Além da linha do curso em course_enrollment_stats, toda matrícula confirmada incrementa a linha 'enrollments'
+# de table_versions (versions.bump: ETag e contador de /count), travada até o commit. As escritas de todos os
+# cursos se enfileiram nela: é esse lock, não a reserva por curso, que limita a vazão total de matrículas
+print(f"table_versions['enrollments']: +{version_bumps} (um bump serializado por matrícula confirmada)")
+
+assert stats.enrolled_count == stored, 'resumo do curso diverge das matrículas gravadas'
+assert stats.enrolled_count <= args.max_enrollment, 'curso com mais matrículas que vagas'
+assert outcomes['matriculado'] == stored == version_bumps
@@ -0,0 +1,77 @@
+import argparse
+import datetime
+import random
+import statistics
+import time
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+# Tempo de serialização e tamanho do corpo de uma listagem grande (formato de /enrollments/with-student-course)
+# pela pilha do FastAPI: antes (JSONResponse, sem compressão) e depois (ORJSONResponse e/ou gzip)
+# Uso: python -m benchmarks.bench_serialization [--rows 10000 100000] [--repeat 3]
+parser = argparse.ArgumentParser(description='Benchmark de serialização e compressão das respostas')
+parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+parser.add_argument('--repeat', type=int, default=3)
+parser.add_argument('--gzip-level', type=int, default=5, help='mesmo padrão de GZIP_COMPRESS_LEVEL')
+args = parser.parse_args()
+
+VARIANTS = [
+    ('JSONResponse (antes)', JSONResponse, False),
+    ('JSONResponse + gzip', JSONResponse, True),
+    ('ORJSONResponse', ORJSONResponse, False),
+    ('ORJSONResponse + gzip', ORJSONResponse, True),
+]
+
+
+def enrollment_rows(count: int) -> List[dict]:
+    rnd = random.Random(42)
+    return [
+        {
+            'id': i,
+            'student_id': i % 5000 + 1,
+            'course_id': i % 300 + 1,
+            'enrollment_date': datetime.date(2024, 3, 1) + datetime.timedelta(days=i % 120),
+            'grade': round(rnd.uniform(0, 10), 1) if i % 4 else None,
+            'completion_date': datetime.date(2024, 7, 1) if i % 3 else None,
+            'student': {'id': i % 5000 + 1, 'first_name': f'Estudante{i % 5000}', 'last_name': 'Souza'},
+            'course': {'id': i % 300 + 1, 'title': f'Curso {i % 300} de Computação'},
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def build_client(rows: List[dict], response_class, compress: bool) -> TestClient:
+    app = FastAPI(default_response_class=response_class)
+    if compress:
+        app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=args.gzip_level)
+
+    @app.get('/rows', response_model=List[dict])
+    def list_rows():
+        return rows
+
+    return TestClient(app)
+
+
+print(f"{'linhas':>8}  {'variante':<24} {'tempo (s)':>10} {'corpo (bytes)':>14}")
+for count in args.rows:
+    rows = enrollment_rows(count)
+    baseline = None
+    for name, response_class, compress in VARIANTS:
+        client = build_client(rows, response_class, compress)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            response = client.get('/rows', headers={'Accept-Encoding': 'gzip' if compress else 'identity'})
+            timings.append(time.perf_counter() - started)
+        # Content-Length é o tamanho enviado (já comprimido); o cliente descomprime o corpo
+        size = int(response.headers['content-length'])
+        elapsed = statistics.median(timings)
+        baseline = baseline or (elapsed, size)
+        print(
+            f'{count:>8}  {name:<24} {elapsed:>10.3f} {size:>14}'
+            f'  ({baseline[0] / elapsed:.1f}x tempo, {size / baseline[1]:.0%} do tamanho)'
+        )
@@ -5,6 +5,8 @@ import app.db.models.professor
 import app.db.models.course
 import app.db.models.student
 import app.db.models.enrollment
+import app.db.models.table_version
+import app.db.models.course_enrollment_stats
 
 print('Database URL:', engine.url)
 Base.metadata.create_all(bind=engine)
@@ -0,0 +1,25 @@
+import argparse
+import time
+from app.db.database import SessionLocal
+from app.services.export_service import ExportService, EXPORT_FORMATS
+import app.db.models  # Garante que todos os models são importados
+
+# Exporta as matrículas (com estudante e curso) para CSV ou Parquet, em blocos e com memória constante
+# Uso: python export_data.py matriculas.csv [--course-id 3]
+parser = argparse.ArgumentParser(description='Exportação das matrículas com estudante e curso')
+parser.add_argument('path')
+parser.add_argument('--format', choices=EXPORT_FORMATS, help='padrão: pela extensão do arquivo')
+parser.add_argument('--student-id', type=int)
+parser.add_argument('--course-id', type=int)
+args = parser.parse_args()
+file_format = args.format or ('parquet' if args.path.lower().endswith('.parquet') else 'csv')
+
+db = SessionLocal()
+started = time.perf_counter()
+try:
+    with open(args.path, 'wb') as output:
+        for data in ExportService(db).export_enrollments(file_format, student_id=args.student_id, course_id=args.course_id):
+            output.write(data)
+    print(f'Matrículas exportadas para {args.path} em {time.perf_counter() - started:.1f}s')
+finally:
+    db.close()
@@ -0,0 +1,23 @@
+import argparse
+import json
+from app.db.database import SessionLocal
+from app.services.import_service import ImportService, IMPORT_ENTITIES, IMPORT_FORMATS, iter_records, text_lines
+import app.db.models  # Garante que todos os models são importados
+
+# Importa estudantes ou matrículas de um arquivo CSV/NDJSON em blocos, com memória constante
+# Uso: python import_data.py students alunos.csv
+parser = argparse.ArgumentParser(description='Importação em lote de registros a partir de CSV ou NDJSON')
+parser.add_argument('entity', choices=list(IMPORT_ENTITIES))
+parser.add_argument('path')
+parser.add_argument('--format', choices=IMPORT_FORMATS, help='padrão: pela extensão do arquivo')
+args = parser.parse_args()
+file_format = args.format or ('csv' if args.path.lower().endswith('.csv') else 'ndjson')
+
+db = SessionLocal()
+try:
+    with open(args.path, 'rb') as raw, text_lines(raw) as lines:
+        report = ImportService(db).run(args.entity, iter_records(lines, file_format))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"{report['created']} de {report['rows']} linhas importadas ({report['rows_per_second']} linhas/s)")
+finally:
+    db.close()
@@ -0,0 +1,47 @@
+"""cria tabela course_enrollment_stats
+
+Revision ID: 0b6d3e9f7a25
+Revises: f2a7c5e8b1d4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d3e9f7a25'
+down_revision: Union[str, None] = 'f2a7c5e8b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_enrollment_stats',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('enrolled_count', sa.Integer(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False),
+        sa.Column('graded_count', sa.Integer(), nullable=False),
+        sa.Column('grade_sum', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('course_id'),
+    )
+    # Popula o resumo com as matrículas existentes
+    op.execute(
+        "INSERT INTO course_enrollment_stats (course_id, enrolled_count, completed_count, graded_count, grade_sum) "
+        "SELECT courses.id, COUNT(enrollments.id), COUNT(enrollments.completion_date), COUNT(enrollments.grade), "
+        "COALESCE(SUM(enrollments.grade), 0) "
+        "FROM courses LEFT OUTER JOIN enrollments ON enrollments.course_id = courses.id "
+        "GROUP BY courses.id"
+    )
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('course_enrollment_stats', 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM table_versions WHERE table_name = 'course_enrollment_stats'")
+    op.drop_table('course_enrollment_stats')
@@ -0,0 +1,42 @@
+"""adiciona indices fulltext para busca
+
+Revision ID: a3f1c9d2e7b4
+Revises: 5dc09a969795
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d2e7b4'
+down_revision: Union[str, None] = '5dc09a969795'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FULLTEXT_INDEXES = [
+    ('ix_students_fulltext', 'students', ['first_name', 'last_name', 'email', 'major']),
+    ('ix_professors_fulltext', 'professors', ['first_name', 'last_name', 'title']),
+    ('ix_courses_fulltext', 'courses', ['title', 'description']),
+    ('ix_departments_fulltext', 'departments', ['name', 'description']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índices FULLTEXT existem apenas no MySQL; nos demais bancos a busca usa o índice em memória
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table, columns in FULLTEXT_INDEXES:
+        op.create_index(name, table, columns, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table, _ in FULLTEXT_INDEXES:
+        op.drop_index(name, table_name=table)
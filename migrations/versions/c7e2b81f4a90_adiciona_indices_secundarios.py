@@ -0,0 +1,51 @@
+"""adiciona indices secundarios
+
+Revision ID: c7e2b81f4a90
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b81f4a90'
+down_revision: Union[str, None] = 'a3f1c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_students_last_name', 'students', ['last_name']),
+    ('ix_students_enrollment_date', 'students', ['enrollment_date']),
+    ('ix_students_major', 'students', ['major']),
+    ('ix_courses_title', 'courses', ['title']),
+    ('ix_courses_year', 'courses', ['year']),
+    ('ix_courses_department_id_year', 'courses', ['department_id', 'year']),
+    ('ix_departments_established_year', 'departments', ['established_year']),
+    ('ix_professors_last_name', 'professors', ['last_name']),
+    ('ix_professors_hire_date', 'professors', ['hire_date']),
+    ('ix_enrollments_enrollment_date', 'enrollments', ['enrollment_date']),
+    ('ix_enrollments_course_id_enrollment_date', 'enrollments', ['course_id', 'enrollment_date']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    op.create_unique_constraint('uq_enrollments_student_course', 'enrollments', ['student_id', 'course_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # O MySQL pode ter descartado os índices automáticos das FKs ao criar os índices compostos
+    # (que também as atendem); recria índices próprios antes de removê-los
+    op.create_index('ix_enrollments_student_id', 'enrollments', ['student_id'])
+    op.create_index('ix_enrollments_course_id', 'enrollments', ['course_id'])
+    op.create_index('ix_courses_department_id', 'courses', ['department_id'])
+    op.drop_constraint('uq_enrollments_student_course', 'enrollments', type_='unique')
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
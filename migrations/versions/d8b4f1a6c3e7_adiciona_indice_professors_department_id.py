@@ -0,0 +1,32 @@
+"""adiciona indice professors.department_id
+
+Revision ID: d8b4f1a6c3e7
+Revises: 0b6d3e9f7a25
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b4f1a6c3e7'
+down_revision: Union[str, None] = '0b6d3e9f7a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /professors/by-department, /count-by-department e /stats/by-department; no MySQL substitui o índice
+    # automático da FK, nos demais bancos (ex.: SQLite) a FK não tinha índice
+    op.create_index('ix_professors_department_id', 'professors', ['department_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # No MySQL o índice passou a ser o da FK e não pode ser removido enquanto ela existir
+    if op.get_bind().dialect.name != 'mysql':
+        op.drop_index('ix_professors_department_id', table_name='professors')
@@ -0,0 +1,36 @@
+"""adiciona row_count em table_versions
+
+Revision ID: f2a7c5e8b1d4
+Revises: e4b9d0a6c213
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c5e8b1d4'
+down_revision: Union[str, None] = 'e4b9d0a6c213'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = ['students', 'professors', 'courses', 'departments', 'enrollments']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('table_versions', sa.Column('row_count', sa.BigInteger(), nullable=True))
+    # Inicializa os contadores com a contagem atual de cada tabela
+    for table in COUNTED_TABLES:
+        op.execute(
+            f"UPDATE table_versions SET row_count = (SELECT COUNT(id) FROM {table}) "
+            f"WHERE table_name = '{table}'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('table_versions', 'row_count')
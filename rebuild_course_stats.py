@@ -0,0 +1,12 @@
+from app.db.database import SessionLocal
+from app.repositories.course_enrollment_stats_repository import CourseEnrollmentStatsRepository
+import app.db.models  # Garante que todos os models são importados
+
+# Reconstrói course_enrollment_stats a partir das matrículas (reparo após cargas fora da API)
+db = SessionLocal()
+try:
+    total = CourseEnrollmentStatsRepository(db).rebuild()
+    db.commit()
+    print(f'Resumo de matrículas reconstruído para {total} cursos!')
+finally:
+    db.close()
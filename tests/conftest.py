@@ -0,0 +1,150 @@
+import datetime
+import os
+from contextlib import contextmanager
+import tempfile
+import warnings
+
+# O app lê as variáveis na importação: banco de teste em SQLite num arquivo temporário (ou TEST_DATABASE_URL),
+# cache de entidades desligado e mais tentativas para os conflitos de lock das escritas concorrentes
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='acad_sys_tests_'), 'test.db')}"
+)
+os.environ.setdefault("CACHE_BACKEND", "none")
+os.environ.setdefault("DB_DEADLOCK_RETRIES", "10")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import SAWarning
+
+import app.db.models as models
+from app.db.async_database import async_engine
+from app.db.database import SessionLocal, engine
+from app.db.models.base import Base
+from app.main import app
+from app.services import prerequisite_service, search_service, transcript_service
+
+
+def _reset_schema() -> None:
+    with warnings.catch_warnings():
+        # departments <-> professors formam um ciclo de chaves estrangeiras; o SQLite apaga em qualquer ordem
+        warnings.simplefilter("ignore", SAWarning)
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Estado do processo derivado do banco: as versões das tabelas recomeçam do zero a cada teste
+    prerequisite_service._graph = None
+    transcript_service._memo = transcript_service.TranscriptMemo(transcript_service.CACHE_MAX_ENTRIES)
+    search_service._indexes.clear()
+
+
+def populate(
+    n_students: int, n_courses: int = 4, n_departments: int = 2, enrollments_per_student: int = 2, max_enrollment: int = 1000
+) -> None:
+    db = SessionLocal()
+    try:
+        departments = [models.Department(name=f"Departamento {i}", established_year=1990 + i) for i in range(n_departments)]
+        db.add_all(departments)
+        db.flush()
+        courses = [
+            models.Course(
+                code=f"C{i}", title=f"Curso {i}", credits=4, department_id=departments[i % n_departments].id,
+                semester="1", year=2024, description="Curso de teste", max_enrollment=max_enrollment,
+            )
+            for i in range(n_courses)
+        ]
+        db.add_all(courses)
+        db.flush()
+        db.add_all(
+            models.Professor(
+                first_name=f"Professor{i}", last_name="Silva", email=f"professor{i}@example.com",
+                hire_date=datetime.date(2010, 1, 1), department_id=departments[i % n_departments].id,
+                courses_taught=[courses[i % n_courses]],
+            )
+            for i in range(max(2, n_students // 5))
+        )
+        students = [
+            models.Student(
+                first_name=f"Estudante{i}", last_name="Souza", email=f"estudante{i}@example.com",
+                birth_date=datetime.date(2000, 1, 1), enrollment_date=datetime.date(2020 + i % 3, 2, 1),
+                major="Computação", enrollment_number=1000 + i,
+            )
+            for i in range(n_students)
+        ]
+        db.add_all(students)
+        db.flush()
+        db.add_all(
+            models.Enrollment(
+                student_id=student.id, course_id=courses[(i + offset) % n_courses].id,
+                enrollment_date=datetime.date(2024, 3, 1), grade=float((i + offset) % 11),
+                completion_date=datetime.date(2024, 7, 1) if (i + offset) % 2 else None,
+            )
+            for i, student in enumerate(students)
+            for offset in range(min(enrollments_per_student, n_courses))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@contextmanager
+def _capture_sql(*engines):
+    # (instrução, parâmetros) de cada consulta enviada ao banco dentro do bloco
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def database():
+    _reset_schema()
+    yield engine
+
+
+@pytest.fixture
+def client(database):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def async_client(database):
+    # Rotas do modo DB_MODE=async (AsyncSession), montadas à parte: app.main escolhe o modo na importação
+    from fastapi import FastAPI
+    from app.api.routers import async_course, async_department, async_enrollment, async_professor, async_student
+
+    async_app = FastAPI()
+    for module in (async_course, async_department, async_enrollment, async_professor, async_student):
+        async_app.include_router(module.router)
+    with TestClient(async_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def seed(database):
+    # Cada carga parte de um banco vazio (o mesmo teste pode comparar tamanhos diferentes)
+    def load(*args, **kwargs) -> None:
+        _reset_schema()
+        populate(*args, **kwargs)
+    return load
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def capture_sql(database):
+    # Inclui o engine assíncrono usado pelas rotas do modo async
+    return lambda: _capture_sql(database, async_engine.sync_engine)
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import update
+
+from app.db import models
+from app.db.models.table_version import TableVersion
+from app.utils.cache import LocalCache, entity_cache
+
+ENTITIES = ["/students", "/courses", "/departments", "/professors", "/enrollments"]
+
+
+@pytest.mark.parametrize("prefix", ENTITIES)
+def test_async_count_matches_sync(client, async_client, seed, prefix):
+    seed(20)
+    # Contador já inicializado: a primeira contagem de cada lado não vira "exato"
+    client.get(f"{prefix}/count", params={"exact": "true"})
+    for params in ({}, {"exact": "true"}, {"approximate": "true"}):
+        assert async_client.get(f"{prefix}/count", params=params).json() == client.get(f"{prefix}/count", params=params).json()
+
+
+def test_async_exact_count_recalibrates_counter(async_client, seed, db):
+    seed(20)
+    async_client.get("/students/count", params={"exact": "true"})
+    db.execute(update(TableVersion).where(TableVersion.table_name == models.Student.__tablename__).values(row_count=999))
+    db.commit()
+    assert async_client.get("/students/count").json() == {"quantidade": 999, "origem": "contador"}
+    assert async_client.get("/students/count", params={"exact": "true"}).json() == {"quantidade": 20, "origem": "exato"}
+    assert async_client.get("/students/count").json() == {"quantidade": 20, "origem": "contador"}
+
+
+@pytest.mark.parametrize("path", ["/students/count", "/courses/paged?limit=3", "/professors/1", "/enrollments/1"])
+def test_async_routes_answer_conditional_get(client, async_client, seed, path):
+    seed(20)
+    # A primeira contagem inicializa o contador em table_versions
+    client.get(path)
+    response = async_client.get(path)
+    assert response.status_code == 200
+    # Mesmo ETag da rota síncrona e 304 enquanto as tabelas não mudam
+    assert response.headers["etag"] == client.get(path).headers["etag"]
+    assert async_client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    client.post("/departments/", json={"name": "Novo", "established_year": 2000})
+    client.post("/students/", json={
+        "first_name": "Nova", "last_name": "Estudante", "email": "nova@example.com",
+        "birth_date": "2000-01-01", "enrollment_date": "2024-01-01", "enrollment_number": 99999,
+    })
+    assert async_client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+
+def test_async_get_by_id_uses_entity_cache(client, async_client, seed, capture_sql, monkeypatch):
+    seed(5)
+    monkeypatch.setattr(entity_cache, "backend", LocalCache(100, 60, entity_cache.stats))
+    first = async_client.get("/students/1").json()
+    with capture_sql() as statements:
+        assert async_client.get("/students/1").json() == first
+    assert not [statement for statement, _ in statements if "FROM students" in statement]
+    # Escrita pela rota síncrona invalida a entrada lida pela rota assíncrona
+    client.put("/students/1", json={**first, "first_name": "Renomeada"})
+    assert async_client.get("/students/1").json()["first_name"] == "Renomeada"
+    assert async_client.get("/students/999").status_code == 404
@@ -0,0 +1,62 @@
+import datetime
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db import models
+from app.db.database import SessionLocal
+from app.repositories.student_repository import StudentRepository
+from app.services.count_service import CountService
+from app.services.student_service import StudentService
+
+
+def _create_student(errors: list) -> None:
+    db = SessionLocal()
+    try:
+        StudentService(StudentRepository(db)).create({
+            "first_name": "Concorrente", "last_name": "Souza", "email": "concorrente@example.com",
+            "birth_date": datetime.date(2000, 1, 1), "enrollment_date": datetime.date(2024, 1, 1),
+            "major": "Computação", "enrollment_number": 99999,
+        })
+        db.commit()
+    except Exception as e:
+        errors.append(e)
+    finally:
+        db.close()
+
+
+@contextmanager
+def _write_after_count(db):
+    # Assim que a instrução com o COUNT roda, outra sessão cria um estudante (bump com row_delta=1) e confirma
+    errors = []
+    writer = threading.Thread(target=_create_student, args=(errors,))
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "count(" in statement.lower() and writer.ident is None:
+            writer.start()
+            # Sem lock na linha do contador a escrita termina aqui, antes de a recalibração gravar
+            writer.join(timeout=1)
+
+    connection = db.connection()
+    event.listen(connection, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield
+        writer.join()
+        assert writer.ident is not None and not errors, errors
+    finally:
+        event.remove(connection, "after_cursor_execute", after_cursor_execute)
+
+
+def test_exact_recount_keeps_concurrent_bump(seed, db):
+    seed(20)
+    CountService(db).count(models.Student, exact=True)
+    db.commit()
+
+    with _write_after_count(db):
+        CountService(db).count(models.Student, exact=True)
+        db.commit()
+
+    assert CountService(db).count(models.Student) == {"quantidade": 21, "origem": "contador"}
+    db.commit()
+    assert CountService(db).count(models.Student, exact=True) == {"quantidade": 21, "origem": "exato"}
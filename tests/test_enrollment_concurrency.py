@@ -0,0 +1,55 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db.models import CourseEnrollmentStats, Enrollment
+
+MAX_ENROLLMENT = 5
+STUDENTS = 24
+WORKERS = 8
+
+
+def _enrollment(student_id: int, course_id: int = 1) -> dict:
+    return {"student_id": student_id, "course_id": course_id, "enrollment_date": "2024-08-01", "grade": 7.5}
+
+
+def _assert_within_capacity(db, course_id: int = 1) -> int:
+    stats = db.get(CourseEnrollmentStats, course_id)
+    enrolled = db.query(Enrollment).filter(Enrollment.course_id == course_id).count()
+    assert stats.enrolled_count == enrolled
+    assert stats.enrolled_count <= MAX_ENROLLMENT
+    return enrolled
+
+
+def test_concurrent_creates_never_exceed_max_enrollment(client, db, seed):
+    seed(STUDENTS, n_courses=2, enrollments_per_student=0, max_enrollment=MAX_ENROLLMENT)
+
+    def enroll(student_id: int) -> int:
+        return client.post("/enrollments/", json=_enrollment(student_id)).status_code
+
+    with ThreadPoolExecutor(WORKERS) as executor:
+        codes = Counter(executor.map(enroll, range(1, STUDENTS + 1)))
+
+    assert set(codes) <= {201, 409}
+    assert codes[201] == MAX_ENROLLMENT
+    assert _assert_within_capacity(db) == MAX_ENROLLMENT
+
+
+def test_concurrent_batches_never_exceed_max_enrollment(client, db, seed):
+    seed(STUDENTS, n_courses=2, enrollments_per_student=0, max_enrollment=MAX_ENROLLMENT)
+    batches = [[_enrollment(student_id) for student_id in range(start, start + 3)] for start in range(1, STUDENTS + 1, 3)]
+
+    def enroll_batch(batch: list) -> dict:
+        response = client.post("/enrollments/batch/report", json=batch)
+        assert response.status_code == 201
+        return response.json()
+
+    with ThreadPoolExecutor(WORKERS) as executor:
+        reports = list(executor.map(enroll_batch, batches))
+
+    created = sum(len(report["created"]) for report in reports)
+    assert created == MAX_ENROLLMENT
+    assert sum(len(report["errors"]) for report in reports) == STUDENTS - MAX_ENROLLMENT
+    assert _assert_within_capacity(db) == MAX_ENROLLMENT
+    stats = db.get(CourseEnrollmentStats, 1)
+    assert stats.graded_count == MAX_ENROLLMENT
+    assert stats.grade_sum == 7.5 * MAX_ENROLLMENT
@@ -0,0 +1,43 @@
+import csv
+import json
+import pathlib
+import subprocess
+import sys
+
+HEADER = "first_name,last_name,email,birth_date,enrollment_date,major,enrollment_number\n"
+
+
+def _student_csv(i: int, first_name: str = "Importada") -> str:
+    return f"{first_name},Souza,importada{i}@example.com,2000-01-01,2024-02-01,Computação,{5000 + i}\n"
+
+
+def test_invalid_utf8_is_a_row_error(client, database):
+    body = (HEADER + _student_csv(1)).encode() + _student_csv(2, "Jo\xe3o").encode("latin-1") + _student_csv(3).encode()
+    report = client.post("/import/students", content=body, headers={"Content-Type": "text/csv"}).json()
+    assert (report["rows"], report["created"], report["failed"]) == (3, 2, 1)
+    assert report["errors"] == [{"row": 3, "error": "UTF-8 inválido na linha"}]
+
+    ndjson = b'{"first_name": "Jo\xe3o"}\n{"first_name": "Ana", "last_name": "Lima", "email": "ana@example.com", ' \
+             b'"birth_date": "2000-01-01", "enrollment_date": "2024-02-01", "enrollment_number": 7000}\n'
+    report = client.post("/import/students", content=ndjson, params={"format": "ndjson"}).json()
+    assert (report["created"], report["errors"]) == (1, [{"row": 1, "error": "UTF-8 inválido na linha"}])
+
+
+def test_malformed_csv_row_is_a_row_error(client, database):
+    body = HEADER + _student_csv(1) + _student_csv(2, "x" * (csv.field_size_limit() + 1)) + _student_csv(3)
+    report = client.post("/import/students", content=body.encode(), headers={"Content-Type": "text/csv"}).json()
+    assert (report["rows"], report["created"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 3 and report["errors"][0]["error"].startswith("CSV inválido")
+
+
+def test_cli_reports_invalid_utf8_as_row_error(database, tmp_path):
+    path = tmp_path / "alunos.csv"
+    path.write_bytes((HEADER + _student_csv(1)).encode() + _student_csv(2, "Jo\xe3o").encode("latin-1") + _student_csv(3).encode())
+    # Mesmo banco dos testes (DATABASE_URL herdada do conftest); a saída começa pelo relatório em JSON
+    result = subprocess.run(
+        [sys.executable, "import_data.py", "students", str(path)],
+        cwd=pathlib.Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True,
+    )
+    report = json.loads(result.stdout[:result.stdout.rindex("}") + 1])
+    assert (report["rows"], report["created"], report["failed"]) == (3, 2, 1)
+    assert report["errors"] == [{"row": 3, "error": "UTF-8 inválido na linha"}]
@@ -0,0 +1,62 @@
+import re
+
+import pytest
+
+# Endpoints de /filter, /by-*, /ordered, /count-by-* e /stats/by-* e a tabela filtrada, ordenada ou agrupada.
+# Filtros ilike com curinga no início (ex.: /filter?last_name=, /by-major) não usam índice B-tree: ficam de fora
+INDEXED_ENDPOINTS = [
+    ("/students/by-enrollment-year/2021", "students"),
+    ("/students/ordered?order_by=last_name", "students"),
+    ("/students/ordered?order_by=enrollment_date&desc=true", "students"),
+    ("/students/stats/by-major", "students"),
+    ("/courses/filter?year=2024", "courses"),
+    ("/courses/filter?department_id=1&year=2024", "courses"),
+    ("/courses/by-department/1", "courses"),
+    ("/courses/count-by-department/1", "courses"),
+    ("/courses/stats/by-department", "courses"),
+    ("/courses/ordered?order_by=title", "courses"),
+    ("/courses/ordered?order_by=year&desc=true", "courses"),
+    ("/departments/by-year?year=1990", "departments"),
+    ("/departments/count-by-year?year=1990", "departments"),
+    ("/departments/stats/by-year", "departments"),
+    ("/departments/ordered?order_by=established_year", "departments"),
+    ("/professors/by-department/1", "professors"),
+    ("/professors/count-by-department/1", "professors"),
+    ("/professors/stats/by-department", "professors"),
+    ("/professors/ordered?order_by=last_name", "professors"),
+    ("/professors/ordered?order_by=hire_date&desc=true", "professors"),
+    ("/enrollments/filter?student_id=1", "enrollments"),
+    ("/enrollments/filter?course_id=1", "enrollments"),
+    ("/enrollments/by-student/1", "enrollments"),
+    ("/enrollments/by-course/1", "enrollments"),
+    ("/enrollments/count-by-course/1", "enrollments"),
+    ("/enrollments/stats/by-course", "enrollments"),
+    ("/enrollments/ordered?order_by=enrollment_date", "enrollments"),
+]
+
+
+def _plan(connection, statement: str, parameters) -> list:
+    return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+
+@pytest.mark.parametrize("path,table", INDEXED_ENDPOINTS)
+def test_endpoint_queries_use_an_index(client, database, seed, capture_sql, path, table):
+    if database.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN é específico do SQLite")
+    seed(50, n_courses=10, n_departments=5)
+    with capture_sql() as statements:
+        assert client.get(path).status_code == 200
+
+    table_reference = re.compile(rf"\b{table}\b")
+    with database.connect() as connection:
+        plans = [
+            _plan(connection, statement, parameters)
+            for statement, parameters in statements
+            if statement.lstrip().upper().startswith("SELECT") and table_reference.search(statement)
+        ]
+    assert plans, f"{path} não consultou {table}"
+    for plan in plans:
+        # Varredura completa (SCAN sem índice) ou ordenação/agrupamento em B-tree temporária (filesort)
+        full_scans = [step for step in plan if re.fullmatch(rf"SCAN {table}", step)]
+        sorts = [step for step in plan if step.startswith("USE TEMP B-TREE")]
+        assert not full_scans and not sorts, f"{path}: {plan}"
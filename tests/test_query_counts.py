@@ -0,0 +1,27 @@
+import pytest
+
+WITH_ENDPOINTS = [
+    "/courses/with-department",
+    "/departments/with-professors",
+    "/enrollments/with-student-course",
+    "/professors/with-department",
+    "/students/with-department",
+]
+# Abaixo de STREAM_BATCH_SIZE matrículas: o streaming lê tudo num único lote nos dois tamanhos
+SIZES = (10, 200)
+
+
+@pytest.mark.parametrize("params", [{}, {"stream": "true"}], ids=["json", "stream"])
+@pytest.mark.parametrize("path", WITH_ENDPOINTS)
+def test_with_endpoints_issue_constant_queries(client, seed, capture_sql, path, params):
+    # Sem N+1: a mesma quantidade de consultas com 10 ou 200 estudantes (e departamentos, cursos, professores e matrículas)
+    counts = []
+    for n_students in SIZES:
+        # Departamentos também crescem: lazy loads muitos-para-um repetidos cairiam no identity map
+        seed(n_students, n_courses=n_students // 5, n_departments=n_students // 5)
+        with capture_sql() as statements:
+            response = client.get(path, params=params)
+            assert response.status_code == 200
+        assert len(response.json() if not params else response.text.splitlines()) > 0
+        counts.append(len(statements))
+    assert counts[0] == counts[1], f"{path}: {counts[0]} consultas com {SIZES[0]} estudantes, {counts[1]} com {SIZES[1]}"
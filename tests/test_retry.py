@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db import models
+from app.db.retry import with_deadlock_retry
+
+
+def _flaky(failures: int):
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise OperationalError("INSERT ...", {}, Exception("database is locked"))
+        return len(calls)
+    return operation, calls
+
+
+def test_retries_a_transaction_without_earlier_writes(database, db):
+    db.query(models.Student).all()
+    operation, calls = _flaky(failures=2)
+    assert with_deadlock_retry(db, operation, retries=3) == 3
+
+
+def test_does_not_retry_over_earlier_writes(database, db):
+    # Uma nova tentativa começaria com o rollback do departamento, e a operação seria confirmada sozinha
+    db.add(models.Department(name="Escrito antes", established_year=2000))
+    db.flush()
+    operation, calls = _flaky(failures=1)
+    with pytest.raises(OperationalError):
+        with_deadlock_retry(db, operation, retries=3)
+    assert len(calls) == 1
+    assert db.query(models.Department).filter_by(name="Escrito antes").count() == 1
+
+    # Depois do rollback da unidade de trabalho inteira as tentativas voltam a valer
+    db.rollback()
+    operation, calls = _flaky(failures=1)
+    assert with_deadlock_retry(db, operation, retries=3) == 2
@@ -0,0 +1,43 @@
+from app.db import models
+from app.services import search_service
+
+
+def test_search_requires_every_term(client, seed):
+    seed(30)
+    # Os termos podem estar em campos diferentes e em qualquer ordem
+    response = client.get("/students/search", params={"q": "souza estudante1"})
+    assert response.status_code == 200
+    names = {row["first_name"] for row in response.json()}
+    assert names == {"Estudante1"} | {f"Estudante{i}" for i in range(10, 20)}
+
+    assert client.get("/students/search", params={"q": "estudante1 silva"}).json() == []
+
+
+def test_writes_during_index_build_are_kept(seed, db):
+    seed(10)
+    students = db.query(models.Student).order_by(models.Student.id).all()
+    created = models.Student(id=10_000, first_name="Zebulon", last_name="Quaresma", email="zq@example.com", major="Física")
+    removed_id = students[-1].id
+    renamed = students[-2]
+
+    def rows_with_concurrent_writes():
+        # Escritas confirmadas por outras requisições (via on_commit) enquanto a tabela ainda está sendo lida
+        for position, student in enumerate(db.query(models.Student).order_by(models.Student.id).yield_per(2)):
+            if position == 0:
+                search_service.index_document(models.Student, created)
+                search_service.remove_document(models.Student, removed_id)
+                search_service.index_document(models.Student, models.Student(
+                    id=renamed.id, first_name="Renomeado", last_name=renamed.last_name, email=renamed.email, major=renamed.major,
+                ))
+            yield student
+
+    search_service._indexes.pop(models.Student, None)
+    index = search_service.TrigramIndex(search_service.SEARCH_FIELDS[models.Student])
+    search_service._indexes[models.Student] = index
+    index.load(rows_with_concurrent_writes())
+
+    assert index.loaded and index.touched is None
+    assert created.id in index.documents
+    assert removed_id not in index.documents
+    assert index.documents[renamed.id][0] == "renomeado"
+    assert [doc_id for doc_id, _ in index.search("zebulon", 10)] == [created.id]